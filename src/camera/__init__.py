@@ -1,5 +1,6 @@
 # src/camera/__init__.py
-from .camera import Camera
+from .camera import Camera, PreprocessedFrame
 from .camera_config import CameraConfig
+from .frame_buffer import FrameRing, FrameSlot, LatestFrameSlot
 
-__all__ = ['Camera', 'CameraConfig']
\ No newline at end of file
+__all__ = ['Camera', 'PreprocessedFrame', 'CameraConfig', 'FrameRing', 'FrameSlot', 'LatestFrameSlot']
\ No newline at end of file
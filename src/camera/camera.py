@@ -1,10 +1,18 @@
 # src/camera/camera.py
 import cv2
 import threading
-from queue import Queue
+import time
+from collections import namedtuple
+from queue import Queue, Empty
+import numpy as np
 from .camera_config import CameraConfig
+from .frame_buffer import LatestFrameSlot
 from src.utils.logger import setup_logger
 
+# 预处理结果：全分辨率帧（供OCR裁剪）、模型输入尺寸帧（供YOLO）及其相对全分辨率的缩放比例
+PreprocessedFrame = namedtuple('PreprocessedFrame', ['full', 'model', 'scale'])
+
+
 class Camera:
     """相机类，负责视频捕获和预处理"""
 
@@ -12,16 +20,37 @@ class Camera:
         """初始化相机"""
         self.config = CameraConfig()
         self.logger = setup_logger('camera')
+        self.low_latency = self.config.LOW_LATENCY_MODE
         self.frame_queue = Queue(maxsize=self.config.BUFFER_SIZE)
+        # 低延迟模式下使用"最新帧优先"的单槽位缓存代替队列
+        self.latest_frame = LatestFrameSlot(age_window=self.config.METRICS_WINDOW)
         self.running = False
         self.cap = None
         self.capture_thread = None
 
+        # 亮度/对比度查找表，只需计算一次
+        self.brightness_lut = self._build_brightness_lut(
+            self.config.BRIGHTNESS_ALPHA, self.config.BRIGHTNESS_BETA
+        )
+        # 预处理输出缓冲区池，按首帧尺寸延迟分配；缓冲区在被丢弃或被消费者释放后才复用
+        self._pool_lock = threading.Lock()
+        self._pool = []
+        self._free_entries = []  # 空闲缓冲区的索引
+        self._entry_owners = {}  # id(预处理结果) -> 缓冲区索引（排队中或被消费者持有）
+        self._held_frames = None  # 消费者当前持有的预处理结果
+        self._pool_source_shape = None
+        self._model_size = None
+        self._model_scale = 1.0
+
     def _initialize_device(self):
         """初始化相机设备"""
         try:
             self.cap = cv2.VideoCapture(self.config.DEVICE_ID)
 
+            # 低延迟模式：先协商像素格式（部分驱动要求在设置分辨率之前设置）
+            if self.low_latency:
+                self._configure_low_latency()
+
             # 设置相机参数
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.config.FRAME_WIDTH)
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.config.FRAME_HEIGHT)
@@ -36,27 +65,152 @@ class Camera:
             self.logger.error(f"相机设备初始化失败: {str(e)}")
             raise
 
-    def _preprocess_frame(self, frame):
+    def _configure_low_latency(self):
+        """配置低延迟采集参数：MJPG像素格式和最小驱动缓冲"""
+        if self.config.FOURCC:
+            requested = cv2.VideoWriter_fourcc(*self.config.FOURCC)
+            self.cap.set(cv2.CAP_PROP_FOURCC, requested)
+            negotiated = int(self.cap.get(cv2.CAP_PROP_FOURCC))
+            negotiated_str = "".join(chr((negotiated >> (8 * i)) & 0xFF) for i in range(4))
+            if negotiated == requested:
+                self.logger.info(f"像素格式协商成功: {negotiated_str}")
+            else:
+                self.logger.warning(f"像素格式协商失败，请求 {self.config.FOURCC}，实际 {negotiated_str!r}")
+
+        # 并非所有后端都支持 CAP_PROP_BUFFERSIZE，set() 返回 False 时仅记录
+        if self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.config.DRIVER_BUFFER_SIZE):
+            self.logger.info(f"驱动缓冲区大小设置为: {self.config.DRIVER_BUFFER_SIZE}")
+        else:
+            self.logger.warning("当前相机后端不支持设置驱动缓冲区大小")
+
+    @staticmethod
+    def _build_brightness_lut(alpha, beta):
         """
-        预处理捕获的帧
+        构建与 cv2.convertScaleAbs 等价的256项查找表
+
+        Args:
+            alpha (float): 亮度调整系数
+            beta (float): 亮度调整偏移量
+
+        Returns:
+            numpy.ndarray: 形状为 (256,) 的 uint8 查找表
+        """
+        values = np.abs(np.arange(256, dtype=np.float32) * alpha + beta)
+        return np.clip(np.rint(values), 0, 255).astype(np.uint8)
+
+    def _new_pool_entry(self, frame):
+        """按帧尺寸分配一组预处理输出缓冲区 (全分辨率, 模型输入)"""
+        full = np.empty_like(frame) if self.config.PREPROCESS_FULL_FRAME else None
+        model = (np.empty((self._model_size[1], self._model_size[0]) + frame.shape[2:], dtype=frame.dtype)
+                 if self.config.FUSE_MODEL_RESIZE else None)
+        return full, model
+
+    def _allocate_pool(self, frame):
+        """
+        按帧尺寸分配预处理输出缓冲区池
+
+        仍在排队或被消费者持有的旧缓冲区不再回收，由其持有者自然释放。
+
+        Args:
+            frame: 原始帧
+        """
+        height, width = frame.shape[:2]
+        scale = min(self.config.MODEL_INPUT_WIDTH / width, self.config.MODEL_INPUT_HEIGHT / height, 1.0)
+        self._model_size = (max(1, int(round(width * scale))), max(1, int(round(height * scale))))
+        self._model_scale = scale
+        self._pool_source_shape = frame.shape
+
+        with self._pool_lock:
+            self._pool = [self._new_pool_entry(frame) for _ in range(max(1, self.config.PREPROCESS_POOL_SIZE))]
+            self._free_entries = list(range(len(self._pool)))
+            self._entry_owners = {}
+        self.logger.info(f"预处理缓冲区已分配: 全分辨率 {width}x{height}, "
+                         f"模型输入 {self._model_size[0]}x{self._model_size[1]}")
+
+    def _acquire_pool_entry(self, frame):
+        """
+        取出一组空闲的预处理输出缓冲区，全部在用时扩容
 
         Args:
             frame: 原始帧
 
         Returns:
-            处理后的帧
+            int: 缓冲区索引
+        """
+        with self._pool_lock:
+            if self._free_entries:
+                return self._free_entries.pop()
+            self._pool.append(self._new_pool_entry(frame))
+            size = len(self._pool)
+        self.logger.info(f"预处理缓冲区均在使用中，缓冲区池扩容至 {size}")
+        return size - 1
+
+    def _release_processed(self, processed):
         """
+        回收预处理结果占用的缓冲区（不是来自缓冲区池或已回收时忽略）
+
+        Args:
+            processed (PreprocessedFrame): 预处理结果
+        """
+        if processed is None:
+            return
+        with self._pool_lock:
+            index = self._entry_owners.pop(id(processed), None)
+            if index is not None:
+                self._free_entries.append(index)
+
+    def _preprocess_frames(self, frame):
+        """
+        预处理捕获的帧，同时生成全分辨率帧和模型输入尺寸的帧
+
+        亮度/对比度调整通过查找表完成；模型输入帧先缩放再查表，只处理缩放后的像素。
+        输出写入缓冲区池中的空闲缓冲区，该缓冲区在结果被丢弃（队列已满或被新帧覆盖）
+        或被消费者释放（见 get_frames()）之前不会被覆盖。
+
+        Args:
+            frame: 原始帧
+
+        Returns:
+            PreprocessedFrame: 预处理结果
+        """
+        index = None
         try:
+            if frame.shape != self._pool_source_shape:
+                self._allocate_pool(frame)
+            index = self._acquire_pool_entry(frame)
+            full_buf, model_buf = self._pool[index]
+
             # 调整亮度和对比度以改善文字识别
-            processed = cv2.convertScaleAbs(
-                frame,
-                alpha=self.config.BRIGHTNESS_ALPHA,
-                beta=self.config.BRIGHTNESS_BETA
-            )
+            full = cv2.LUT(frame, self.brightness_lut, dst=full_buf) if full_buf is not None else frame
+
+            model = None
+            if model_buf is not None:
+                cv2.resize(frame, (model_buf.shape[1], model_buf.shape[0]),
+                           dst=model_buf, interpolation=cv2.INTER_AREA)
+                model = cv2.LUT(model_buf, self.brightness_lut, dst=model_buf)
+
+            processed = PreprocessedFrame(full, model, self._model_scale)
+            with self._pool_lock:
+                self._entry_owners[id(processed)] = index
             return processed
         except Exception as e:
             self.logger.error(f"帧预处理失败: {str(e)}")
-            return frame
+            if index is not None:
+                with self._pool_lock:
+                    self._free_entries.append(index)
+            return PreprocessedFrame(frame, None, 1.0)
+
+    def _preprocess_frame(self, frame):
+        """
+        预处理捕获的帧
+
+        Args:
+            frame: 原始帧
+
+        Returns:
+            处理后的帧
+        """
+        return self._preprocess_frames(frame).full
 
     def _capture_loop(self):
         """相机捕获循环"""
@@ -65,14 +219,24 @@ class Camera:
             try:
                 ret, frame = self.cap.read()
                 if ret:
+                    capture_time = time.time()
+
                     # 预处理帧
-                    processed_frame = self._preprocess_frame(frame)
+                    processed = self._preprocess_frames(frame)
+
+                    if self.low_latency:
+                        # 最新帧覆盖未被取走的旧帧（回收其缓冲区），并唤醒等待的消费者
+                        self._release_processed(self.latest_frame.put(processed, capture_time))
+                        continue
 
-                    # 如果队列已满，移除最旧的帧
+                    # 如果队列已满，移除最旧的帧并回收其缓冲区
                     if self.frame_queue.full():
-                        self.frame_queue.get()
+                        try:
+                            self._release_processed(self.frame_queue.get_nowait())
+                        except Empty:
+                            pass
 
-                    self.frame_queue.put(processed_frame)
+                    self.frame_queue.put(processed)
                 else:
                     self.logger.warning("帧捕获失败")
 
@@ -83,6 +247,9 @@ class Camera:
         """启动相机"""
         try:
             self._initialize_device()
+            self.latest_frame.reset()
+            # 重新启动时按首帧重新分配缓冲区池
+            self._pool_source_shape = None
             self.running = True
             self.capture_thread = threading.Thread(target=self._capture_loop)
             self.capture_thread.start()
@@ -97,6 +264,9 @@ class Camera:
         self.logger.info("正在停止相机...")
         self.running = False
 
+        # 唤醒仍在等待新帧的消费者
+        self.latest_frame.close()
+
         # 等待捕获线程结束
         if self.capture_thread and self.capture_thread.is_alive():
             self.capture_thread.join()
@@ -107,19 +277,70 @@ class Camera:
 
         # 清空帧队列
         while not self.frame_queue.empty():
-            self.frame_queue.get()
+            self._release_processed(self.frame_queue.get())
+
+        if self.low_latency:
+            self.logger.info(f"低延迟采集统计: {self.get_metrics()}")
 
         self.logger.info("相机已停止")
 
-    def get_frame(self):
+    def get_frame(self, timeout=None):
         """
         获取最新的帧
 
+        低延迟模式下阻塞等待尚未取走的最新帧，无需调用方轮询。
+
+        Args:
+            timeout (float, optional): 低延迟模式下等待新帧的最长时间（秒），
+                默认使用配置中的 FRAME_WAIT_TIMEOUT
+
+        Returns:
+            最新的全分辨率帧，如果没有可用的帧则返回None
+        """
+        processed = self.get_frames(timeout=timeout)
+        return processed.full if processed is not None else None
+
+    def get_frames(self, timeout=None):
+        """
+        获取最新帧的预处理结果（全分辨率帧和模型输入尺寸帧）
+
+        返回结果的缓冲区归调用方持有，直到下一次调用 get_frames()/get_frame() 或
+        release_frames() 时才交还给采集线程复用，期间不会被覆盖。
+
+        Args:
+            timeout (float, optional): 低延迟模式下等待新帧的最长时间（秒），
+                默认使用配置中的 FRAME_WAIT_TIMEOUT
+
         Returns:
-            最新的帧，如果没有可用的帧则返回None
+            PreprocessedFrame: 预处理结果，如果没有可用的帧则返回None
         """
         try:
-            return None if self.frame_queue.empty() else self.frame_queue.get()
+            if self.low_latency:
+                if timeout is None:
+                    timeout = self.config.FRAME_WAIT_TIMEOUT
+                processed, _ = self.latest_frame.get(timeout=timeout)
+            else:
+                processed = None if self.frame_queue.empty() else self.frame_queue.get()
         except Exception as e:
             self.logger.error(f"获取帧失败: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+        if processed is not None:
+            # 取到新帧后交还上一次持有的缓冲区
+            self.release_frames()
+            self._held_frames = processed
+        return processed
+
+    def release_frames(self):
+        """交还最近一次 get_frames()/get_frame() 返回的缓冲区，之后不应再访问该结果"""
+        held, self._held_frames = self._held_frames, None
+        self._release_processed(held)
+
+    def get_metrics(self):
+        """
+        获取低延迟模式下的采集指标
+
+        Returns:
+            dict: 捕获帧数、丢帧数、丢帧率以及帧龄（毫秒）统计
+        """
+        return self.latest_frame.metrics()
@@ -12,7 +12,27 @@ class CameraConfig:
 
     # 缓冲配置
     BUFFER_SIZE = 2  # 帧缓冲大小
+    USE_FRAME_RING = True  # 线程化捕获是否使用预分配的环形帧缓冲区（零拷贝读取）
+    FRAME_RING_SLOTS = 4  # 环形缓冲区槽位数量（至少为3）
+
+    # 视频捕获后端配置
+    CAPTURE_BACKEND = 'thread'  # 'thread': 进程内线程捕获; 'process': 独立进程捕获并通过共享内存传递帧
+    SHM_SLOTS = 4  # 共享内存环形槽位数量（至少为3）
+    SHM_STARTUP_TIMEOUT = 10.0  # 等待捕获进程打开视频源的超时时间（秒）
+    SHM_POLL_INTERVAL = 0.002  # 读取者等待新帧时的轮询间隔（秒）
+
+    # 低延迟模式配置
+    LOW_LATENCY_MODE = True  # 是否启用低延迟模式（最新帧优先，不排队）
+    DRIVER_BUFFER_SIZE = 1  # 驱动层缓冲帧数（CAP_PROP_BUFFERSIZE）
+    FOURCC = 'MJPG'  # 优先协商的像素格式，MJPG可降低USB带宽占用，None表示使用驱动默认值
+    FRAME_WAIT_TIMEOUT = 1.0  # get_frame() 默认等待新帧的超时时间（秒）
+    METRICS_WINDOW = 100  # 帧龄统计的滑动窗口大小
 
     # 图像预处理配置
     BRIGHTNESS_ALPHA = 1.2  # 亮度调整系数
-    BRIGHTNESS_BETA = 10  # 亮度调整偏移量
\ No newline at end of file
+    BRIGHTNESS_BETA = 10  # 亮度调整偏移量
+    PREPROCESS_FULL_FRAME = True  # 是否对全分辨率帧做亮度调整（供OCR裁剪使用）
+    FUSE_MODEL_RESIZE = True  # 是否在捕获线程中同时生成模型输入尺寸的帧（先缩放再查表）
+    MODEL_INPUT_WIDTH = 640  # 模型输入宽度，与 DetectorConfig.INPUT_WIDTH 保持一致
+    MODEL_INPUT_HEIGHT = 640  # 模型输入高度，与 DetectorConfig.INPUT_HEIGHT 保持一致
+    PREPROCESS_POOL_SIZE = 3  # 预处理输出缓冲区初始数量（排队、最新帧槽位和消费者持有的缓冲区都不会被复用，不够时自动扩容）
\ No newline at end of file
@@ -0,0 +1,24 @@
+# src/camera/capture_factory.py
+from .camera_config import CameraConfig
+from .threaded_camera import ThreadedVideoCapture
+from .shm_capture import SharedMemoryVideoCapture
+
+
+def create_video_capture(source, sampler=None, backend=None):
+    """
+    根据配置创建视频捕获对象
+
+    Args:
+        source: 视频源路径或摄像头ID
+        sampler (optional): 帧采样策略，不会被处理的帧只grab不解码
+        backend (str, optional): 'thread' 或 'process'，默认使用 CameraConfig.CAPTURE_BACKEND
+
+    Returns:
+        ThreadedVideoCapture 或 SharedMemoryVideoCapture 实例，二者接口一致
+    """
+    backend = backend or CameraConfig.CAPTURE_BACKEND
+    if backend == 'process':
+        return SharedMemoryVideoCapture(source, sampler=sampler)
+    if backend != 'thread':
+        raise ValueError(f"未知的视频捕获后端: {backend}")
+    return ThreadedVideoCapture(source, sampler=sampler)
\ No newline at end of file
@@ -0,0 +1,262 @@
+# src/camera/frame_buffer.py
+import threading
+import time
+from collections import deque
+import numpy as np
+
+
+class FrameSlot:
+    """
+    环形缓冲区中的一个帧槽位的只读视图
+
+    持有期间对应的缓冲区不会被采集线程覆盖，使用完毕后需调用 release()
+    或通过 with 语句自动释放。
+    """
+
+    __slots__ = ('frame', 'seq', 'timestamp', '_release_callback', '_released')
+
+    def __init__(self, frame, seq, timestamp, release_callback=None):
+        """
+        初始化帧槽位视图
+
+        Args:
+            frame (numpy.ndarray): 只读的帧视图
+            seq (int): 帧序号（单调递增）
+            timestamp (float): 帧捕获时间戳（time.time()）
+            release_callback (callable, optional): 释放槽位时调用的回调
+        """
+        self.frame = frame
+        self.seq = seq
+        self.timestamp = timestamp
+        self._release_callback = release_callback
+        self._released = False
+
+    def release(self):
+        """释放槽位，允许采集线程复用该缓冲区（重复调用无副作用）"""
+        if self._released:
+            return
+        self._released = True
+        if self._release_callback is not None:
+            self._release_callback()
+        self.frame = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+        return False
+
+
+class FrameRing:
+    """
+    预分配的帧环形缓冲区
+
+    采集线程通过 acquire_write()/publish() 直接把解码结果写入预分配的缓冲区，
+    消费者通过 acquire_latest() 获得带序号和时间戳的只读视图。
+    每个槽位维护引用计数，被消费者持有的槽位和最新发布的槽位不会被覆盖。
+    """
+
+    def __init__(self, num_slots, shape, dtype=np.uint8):
+        """
+        初始化环形缓冲区
+
+        Args:
+            num_slots (int): 槽位数量（至少为3：写入中、最新发布、消费者持有）
+            shape (tuple): 单帧形状，例如 (720, 1280, 3)
+            dtype: 帧数据类型
+        """
+        if num_slots < 3:
+            raise ValueError(f"环形缓冲区槽位数量至少为3，当前为: {num_slots}")
+
+        self.num_slots = num_slots
+        self.shape = tuple(shape)
+        self.dtype = dtype
+        self.buffers = [np.empty(self.shape, dtype=dtype) for _ in range(num_slots)]
+        # 预先创建只读视图，避免每帧创建新的视图对象
+        self._views = []
+        for buf in self.buffers:
+            view = buf.view()
+            view.flags.writeable = False
+            self._views.append(view)
+
+        self._refcounts = [0] * num_slots
+        self._seqs = [0] * num_slots
+        self._timestamps = [0.0] * num_slots
+        self._latest = -1  # 最新发布的槽位索引
+        self._writing = -1  # 正在写入的槽位索引
+        self._next = 0  # 下一次开始查找空闲槽位的位置
+        self.lock = threading.Lock()
+
+    def acquire_write(self):
+        """
+        获取一个可写入的空闲槽位
+
+        Returns:
+            tuple: (index, buffer)，没有空闲槽位时返回 (-1, None)
+        """
+        with self.lock:
+            for offset in range(self.num_slots):
+                index = (self._next + offset) % self.num_slots
+                if index != self._latest and self._refcounts[index] == 0:
+                    self._writing = index
+                    self._next = (index + 1) % self.num_slots
+                    return index, self.buffers[index]
+        return -1, None
+
+    def publish(self, index, seq, timestamp):
+        """
+        发布写入完成的槽位，使其成为最新帧
+
+        Args:
+            index (int): acquire_write() 返回的槽位索引
+            seq (int): 帧序号
+            timestamp (float): 帧捕获时间戳
+        """
+        with self.lock:
+            self._seqs[index] = seq
+            self._timestamps[index] = timestamp
+            self._latest = index
+            self._writing = -1
+
+    def abort_write(self, index):
+        """放弃写入中的槽位（例如读取失败时）"""
+        with self.lock:
+            if self._writing == index:
+                self._writing = -1
+
+    def acquire_latest(self):
+        """
+        获取最新发布帧的只读视图，调用方负责释放
+
+        Returns:
+            FrameSlot: 最新帧槽位，尚无已发布帧时返回None
+        """
+        with self.lock:
+            index = self._latest
+            if index < 0:
+                return None
+            self._refcounts[index] += 1
+            return FrameSlot(
+                self._views[index],
+                self._seqs[index],
+                self._timestamps[index],
+                release_callback=lambda: self._release(index)
+            )
+
+    def latest_seq(self):
+        """返回最新发布帧的序号，尚无帧时返回0"""
+        with self.lock:
+            return self._seqs[self._latest] if self._latest >= 0 else 0
+
+    def _release(self, index):
+        """减少槽位引用计数"""
+        with self.lock:
+            if self._refcounts[index] > 0:
+                self._refcounts[index] -= 1
+
+
+class LatestFrameSlot:
+    """
+    "最新帧优先"的单槽位帧缓存
+
+    生产者每次写入都会覆盖尚未被取走的旧帧（记为丢帧），消费者通过条件变量
+    阻塞等待新帧，无需轮询。同时统计丢帧数和帧龄（从捕获到被取走的时间）。
+    """
+
+    def __init__(self, age_window=100):
+        """
+        初始化最新帧槽位
+
+        Args:
+            age_window (int): 帧龄统计的滑动窗口大小
+        """
+        self.cond = threading.Condition()
+        self._frame = None
+        self._timestamp = 0.0
+        self._seq = 0
+        self._consumed_seq = 0
+        self._closed = False
+
+        # 指标统计
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.frames_consumed = 0
+        self._ages = deque(maxlen=age_window)
+
+    def put(self, frame, timestamp):
+        """
+        写入新帧，覆盖未被取走的旧帧
+
+        Args:
+            frame (numpy.ndarray): 新帧
+            timestamp (float): 帧捕获时间戳（time.time()）
+
+        Returns:
+            被覆盖且从未被取走的旧帧，没有时返回 None（生产者可据此回收其缓冲区）
+        """
+        with self.cond:
+            dropped = None
+            if self._frame is not None and self._seq > self._consumed_seq:
+                self.frames_dropped += 1
+                dropped = self._frame
+            self._seq += 1
+            self._frame = frame
+            self._timestamp = timestamp
+            self.frames_captured += 1
+            self.cond.notify_all()
+            return dropped
+
+    def get(self, timeout=None):
+        """
+        取走最新帧，没有新帧时阻塞等待
+
+        Args:
+            timeout (float, optional): 最长等待时间（秒），None表示一直等待，0表示不等待
+
+        Returns:
+            tuple: (frame, timestamp)，超时或槽位关闭时返回 (None, 0.0)
+        """
+        with self.cond:
+            self.cond.wait_for(lambda: self._seq > self._consumed_seq or self._closed, timeout=timeout)
+            if self._seq <= self._consumed_seq:
+                return None, 0.0
+            self._consumed_seq = self._seq
+            self.frames_consumed += 1
+            self._ages.append(time.time() - self._timestamp)
+            return self._frame, self._timestamp
+
+    def close(self):
+        """关闭槽位并唤醒所有等待者"""
+        with self.cond:
+            self._closed = True
+            self.cond.notify_all()
+
+    def reset(self):
+        """清空槽位和统计数据，用于重新启动"""
+        with self.cond:
+            self._frame = None
+            self._consumed_seq = self._seq
+            self._closed = False
+            self.frames_captured = 0
+            self.frames_dropped = 0
+            self.frames_consumed = 0
+            self._ages.clear()
+
+    def metrics(self):
+        """
+        获取丢帧和帧龄统计
+
+        Returns:
+            dict: 包含捕获帧数、丢帧数、消费帧数以及帧龄（毫秒）的平均值和最大值
+        """
+        with self.cond:
+            ages = list(self._ages)
+            return {
+                'frames_captured': self.frames_captured,
+                'frames_dropped': self.frames_dropped,
+                'frames_consumed': self.frames_consumed,
+                'drop_rate': self.frames_dropped / self.frames_captured if self.frames_captured else 0.0,
+                'frame_age_avg_ms': 1000.0 * sum(ages) / len(ages) if ages else 0.0,
+                'frame_age_max_ms': 1000.0 * max(ages) if ages else 0.0
+            }
@@ -0,0 +1,82 @@
+# src/camera/multi_capture.py
+import time
+from .capture_factory import create_video_capture
+from src.utils.logger import setup_logger
+
+
+class MultiStreamCapture:
+    """
+    多路视频捕获管理器
+
+    为每个视频源创建一个捕获对象（线程或独立进程），并收集各路自上次读取以来的最新帧，
+    供检测器一次批量推理。
+    """
+
+    def __init__(self, sources, samplers=None, backend=None):
+        """
+        初始化多路视频捕获
+
+        Args:
+            sources (list): 视频源路径或摄像头ID列表
+            samplers (list, optional): 与视频源一一对应的帧采样策略
+            backend (str, optional): 捕获后端，默认使用 CameraConfig.CAPTURE_BACKEND
+        """
+        self.logger = setup_logger('MultiStreamCapture')
+        self.sources = list(sources)
+        samplers = samplers or [None] * len(self.sources)
+        self.captures = []
+        try:
+            for source, sampler in zip(self.sources, samplers):
+                self.captures.append(create_video_capture(source, sampler=sampler, backend=backend))
+        except Exception:
+            # 部分视频源打开失败时释放已经打开的视频源
+            self.release()
+            raise
+        self.last_seqs = [0] * len(self.captures)
+        self.logger.info(f"已打开 {len(self.captures)} 路视频源")
+
+    @property
+    def fps(self):
+        """各路视频源中的最高帧率"""
+        return max(cap.fps for cap in self.captures)
+
+    @property
+    def running(self):
+        """是否仍有视频源在产生新帧"""
+        return any(cap.running for cap in self.captures)
+
+    def read_latest(self, timeout=None, poll_interval=0.002):
+        """
+        收集每路视频源自上次读取以来的最新帧
+
+        至少有一路出现新帧时立即返回，不等待其余视频源。调用方负责释放返回的槽位。
+
+        Args:
+            timeout (float, optional): 所有视频源都没有新帧时的最长等待时间（秒）
+            poll_interval (float): 等待新帧时的轮询间隔（秒）
+
+        Returns:
+            List[Tuple[int, FrameSlot]]: (视频流索引, 帧槽位) 列表，超时或全部结束时为空列表
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            slots = []
+            for index, cap in enumerate(self.captures):
+                slot = cap.read_slot(newer_than=self.last_seqs[index], timeout=0)
+                if slot is not None:
+                    self.last_seqs[index] = slot.seq
+                    slots.append((index, slot))
+
+            if slots or not self.running:
+                return slots
+            if deadline is not None and time.time() >= deadline:
+                return []
+            time.sleep(poll_interval)
+
+    def release(self):
+        """释放所有视频源"""
+        for cap in self.captures:
+            try:
+                cap.release()
+            except Exception as e:
+                self.logger.error(f"释放视频源时发生错误: {str(e)}")
\ No newline at end of file
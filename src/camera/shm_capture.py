@@ -0,0 +1,328 @@
+# src/camera/shm_capture.py
+import queue
+import time
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from .camera_config import CameraConfig
+from .frame_buffer import FrameSlot
+from src.utils.logger import setup_logger
+
+# 控制块字段（int64）
+CTRL_LATEST = 0  # 最新发布的槽位索引，-1表示尚无帧
+CTRL_PINNED = 1  # 读取者正在持有的槽位索引，-1表示未持有
+CTRL_STATE = 2  # 捕获进程状态
+CTRL_STOP = 3  # 主进程请求停止时置1
+CTRL_SKIPPED = 4  # 只grab未解码的帧数
+CTRL_FIELDS = 5
+
+STATE_RUNNING = 0
+STATE_ENDED = 1
+STATE_ERROR = 2
+
+# 槽位头字段（int64）：序号为0表示槽位正在写入或从未写入
+HDR_SEQ = 0
+HDR_TIMESTAMP_NS = 1
+HDR_HEIGHT = 2
+HDR_WIDTH = 3
+HDR_CHANNELS = 4
+HDR_FIELDS = 5
+
+
+def _meta_arrays(buf, num_slots):
+    """在共享内存上构建控制块和槽位头数组视图"""
+    ctrl = np.ndarray((CTRL_FIELDS,), dtype=np.int64, buffer=buf)
+    headers = np.ndarray((num_slots, HDR_FIELDS), dtype=np.int64, buffer=buf,
+                         offset=CTRL_FIELDS * 8)
+    return ctrl, headers
+
+
+def _capture_process_main(source, num_slots, every_n_frames, handshake_queue):
+    """
+    捕获进程入口：读取视频帧并写入共享内存环形槽位
+
+    写入协议（单写者、单读者，无锁）：
+      1. 选择既不是最新帧也未被读取者持有的槽位，先将其序号置0；
+      2. 再次确认读取者没有在此期间持有该槽位，否则换一个槽位；
+      3. 直接解码到槽位缓冲区，写入时间戳和形状，最后写入序号；
+      4. 更新控制块中的最新槽位索引。
+
+    Args:
+        source: 视频源路径或摄像头ID
+        num_slots (int): 槽位数量
+        every_n_frames (int): 每N帧解码1帧，其余帧只grab；为1时解码所有帧
+        handshake_queue: 用于回传共享内存名称和帧信息的队列
+    """
+    import cv2
+
+    logger = setup_logger('SharedMemoryCapture')
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        handshake_queue.put(('error', f"无法打开视频源: {source}"))
+        return
+
+    ret, first = cap.read()
+    if not ret:
+        cap.release()
+        handshake_queue.put(('error', f"无法从视频源读取帧: {source}"))
+        return
+
+    original_fps = cap.get(cv2.CAP_PROP_FPS)
+    fps = original_fps if original_fps > 0 else 30.0
+    frame_time = 1.0 / fps
+    shape = first.shape
+
+    meta_shm = shared_memory.SharedMemory(create=True, size=(CTRL_FIELDS + num_slots * HDR_FIELDS) * 8)
+    frames_shm = shared_memory.SharedMemory(create=True, size=num_slots * first.nbytes)
+    ctrl, headers = _meta_arrays(meta_shm.buf, num_slots)
+    frames = np.ndarray((num_slots,) + shape, dtype=first.dtype, buffer=frames_shm.buf)
+
+    ctrl[:] = 0
+    ctrl[CTRL_LATEST] = -1
+    ctrl[CTRL_PINNED] = -1
+    headers[:] = 0
+
+    def publish(index, seq, timestamp_ns):
+        headers[index, HDR_TIMESTAMP_NS] = timestamp_ns
+        headers[index, HDR_HEIGHT] = shape[0]
+        headers[index, HDR_WIDTH] = shape[1]
+        headers[index, HDR_CHANNELS] = shape[2] if len(shape) > 2 else 1
+        headers[index, HDR_SEQ] = seq
+        ctrl[CTRL_LATEST] = index
+
+    np.copyto(frames[0], first)
+    publish(0, 1, time.time_ns())
+    handshake_queue.put(('ok', meta_shm.name, frames_shm.name, shape, first.dtype.str, fps))
+    logger.info(f"捕获进程已启动: {source}, 帧尺寸 {shape}, 帧率 {fps}")
+
+    frame_index = 1
+    next_slot = 1
+    last_frame_time = time.time()
+    try:
+        while not ctrl[CTRL_STOP]:
+            # 尊重原始帧率
+            sleep_time = frame_time - (time.time() - last_frame_time)
+            if sleep_time > 0:
+                time.sleep(sleep_time)
+
+            frame_index += 1
+            if frame_index % every_n_frames != 0:
+                ret = cap.grab()
+                last_frame_time = time.time()
+                if not ret:
+                    break
+                ctrl[CTRL_SKIPPED] += 1
+                continue
+
+            # 选择可写入的槽位
+            index = -1
+            for offset in range(num_slots):
+                candidate = (next_slot + offset) % num_slots
+                if candidate == ctrl[CTRL_LATEST] or candidate == ctrl[CTRL_PINNED]:
+                    continue
+                headers[candidate, HDR_SEQ] = 0
+                if candidate == ctrl[CTRL_PINNED]:
+                    continue
+                index = candidate
+                break
+
+            if index < 0:
+                # 所有槽位都不可用，丢弃该帧但保持解码进度
+                ret = cap.grab()
+                last_frame_time = time.time()
+                if not ret:
+                    break
+                continue
+
+            buf = frames[index]
+            ret, frame = cap.read(image=buf)
+            last_frame_time = time.time()
+            if not ret:
+                break
+            if frame is not buf:
+                # 尺寸与首帧不一致时缩放到槽位尺寸
+                if frame.shape == buf.shape:
+                    np.copyto(buf, frame)
+                else:
+                    cv2.resize(frame, (shape[1], shape[0]), dst=buf)
+
+            publish(index, frame_index, time.time_ns())
+            next_slot = (index + 1) % num_slots
+
+        ctrl[CTRL_STATE] = STATE_ENDED
+        logger.info("捕获进程：视频播放结束")
+    except Exception as e:
+        ctrl[CTRL_STATE] = STATE_ERROR
+        logger.error(f"捕获进程出错: {str(e)}")
+    finally:
+        cap.release()
+        # 等待主进程确认停止后再释放共享内存，避免主进程尚未映射时名称已失效
+        while not ctrl[CTRL_STOP]:
+            time.sleep(0.05)
+        # 先释放共享内存上的数组视图（publish 闭包共享同一变量），否则 close() 会报 BufferError
+        ctrl = headers = frames = buf = frame = None
+        meta_shm.close()
+        frames_shm.close()
+        meta_shm.unlink()
+        frames_shm.unlink()
+
+
+class SharedMemoryVideoCapture:
+    """
+    进程外视频捕获类
+
+    在独立进程中运行 cv2.VideoCapture，解码后的帧写入共享内存环形槽位，
+    主进程直接读取共享内存上的只读视图，不经过 pickle 也不复制帧数据。
+    接口与 ThreadedVideoCapture 保持一致。仅支持单个读取者，且读取者同一时间
+    只应持有一个槽位。
+    """
+
+    def __init__(self, source, sampler=None, num_slots=None):
+        """
+        初始化进程外视频捕获
+
+        Args:
+            source: 视频源路径或摄像头ID
+            sampler (optional): 帧采样策略（FrameSampler），不会被处理的帧只调用 grab() 而不解码
+            num_slots (int, optional): 共享内存槽位数量，默认使用配置中的值
+        """
+        self.logger = setup_logger('SharedMemoryVideoCapture')
+        self.logger.info(f"初始化进程外视频捕获: {source}")
+        self.num_slots = num_slots or CameraConfig.SHM_SLOTS
+        if self.num_slots < 3:
+            raise ValueError(f"共享内存槽位数量至少为3，当前为: {self.num_slots}")
+
+        # 只把采样间隔传给捕获进程，避免子进程导入控制器和检测器模块
+        every_n_frames = max(1, int(getattr(sampler, 'every_n_frames', 1))) if sampler is not None else 1
+
+        self._meta_shm = None
+        self._frames_shm = None
+        ctx = mp.get_context('spawn')
+        handshake_queue = ctx.Queue()
+        self.process = ctx.Process(
+            target=_capture_process_main,
+            args=(source, self.num_slots, every_n_frames, handshake_queue),
+            name="CaptureProcess",
+            daemon=True
+        )
+        self.process.start()
+
+        try:
+            message = handshake_queue.get(timeout=CameraConfig.SHM_STARTUP_TIMEOUT)
+        except queue.Empty:
+            self.process.terminate()
+            self.logger.error(f"捕获进程启动超时: {source}")
+            raise ValueError(f"无法打开视频源: {source}")
+
+        if message[0] != 'ok':
+            self.process.join(timeout=1.0)
+            self.logger.error(message[1])
+            raise ValueError(message[1])
+
+        _, meta_name, frames_name, shape, dtype, self.fps = message
+        self.frame_time = 1.0 / self.fps
+        self.shape = tuple(shape)
+
+        self._meta_shm = shared_memory.SharedMemory(name=meta_name)
+        self._frames_shm = shared_memory.SharedMemory(name=frames_name)
+        self.ctrl, self.headers = _meta_arrays(self._meta_shm.buf, self.num_slots)
+        frames = np.ndarray((self.num_slots,) + self.shape, dtype=np.dtype(dtype), buffer=self._frames_shm.buf)
+        self._views = []
+        for i in range(self.num_slots):
+            view = frames[i]
+            view.flags.writeable = False
+            self._views.append(view)
+        self._pinned = -1
+        self.logger.info(f"已连接捕获进程共享内存: {self.num_slots} 个槽位, 帧尺寸 {self.shape}")
+
+    @property
+    def running(self):
+        """捕获进程是否仍在产生新帧"""
+        return (self._meta_shm is not None and self.process.is_alive()
+                and self.ctrl[CTRL_STATE] == STATE_RUNNING)
+
+    @property
+    def skipped_frames(self):
+        """只grab未解码的帧数"""
+        return int(self.ctrl[CTRL_SKIPPED]) if self._meta_shm is not None else 0
+
+    def read_slot(self, newer_than=None, timeout=None):
+        """
+        读取最新帧的只读共享内存视图
+
+        Args:
+            newer_than (int, optional): 提供时等待序号大于该值的新帧
+            timeout (float, optional): 等待新帧的最长时间（秒），None表示一直等待
+
+        Returns:
+            FrameSlot: 帧槽位，视频结束或等待超时时返回None
+        """
+        if self._meta_shm is None:
+            return None
+
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            index = int(self.ctrl[CTRL_LATEST])
+            if index >= 0:
+                seq = int(self.headers[index, HDR_SEQ])
+                if seq > 0 and (newer_than is None or seq > newer_than):
+                    # 先持有槽位，再确认在此期间写者没有开始覆盖它
+                    self.ctrl[CTRL_PINNED] = index
+                    if int(self.headers[index, HDR_SEQ]) == seq:
+                        self._pinned = index
+                        timestamp = self.headers[index, HDR_TIMESTAMP_NS] / 1e9
+                        return FrameSlot(self._views[index], seq, timestamp, release_callback=self._unpin)
+                    self.ctrl[CTRL_PINNED] = -1
+                    continue
+
+            if not self.running:
+                return None
+            if deadline is not None and time.time() >= deadline:
+                return None
+            time.sleep(CameraConfig.SHM_POLL_INTERVAL)
+
+    def _unpin(self):
+        """释放读取者持有的槽位"""
+        if self._meta_shm is not None:
+            self.ctrl[CTRL_PINNED] = -1
+        self._pinned = -1
+
+    def read(self, newer_than=None, timeout=None):
+        """
+        读取当前帧的副本
+
+        Args:
+            newer_than (int, optional): 提供时等待序号大于该值的新帧
+            timeout (float, optional): 等待新帧的最长时间（秒）
+
+        Returns:
+            tuple: (ret, frame) 其中ret表示是否读取成功，frame是图像帧
+        """
+        slot = self.read_slot(newer_than=newer_than, timeout=timeout)
+        if slot is None:
+            return False, None
+        with slot:
+            return True, slot.frame.copy()
+
+    def release(self):
+        """停止捕获进程并释放共享内存映射"""
+        self.logger.info("正在释放进程外视频捕获资源...")
+        if self._meta_shm is not None:
+            self.ctrl[CTRL_STOP] = 1
+        if self.process.is_alive():
+            self.process.join(timeout=2.0)
+            if self.process.is_alive():
+                self.logger.warning("捕获进程未能按时退出，强制终止")
+                self.process.terminate()
+
+        if self._meta_shm is not None:
+            self._views = []
+            self.ctrl = self.headers = None
+            for shm in (self._meta_shm, self._frames_shm):
+                try:
+                    shm.close()
+                except BufferError:
+                    # 仍有外部持有的帧视图时无法立即关闭，由进程退出时回收
+                    self.logger.warning("共享内存仍被引用，延迟到进程退出时释放")
+            self._meta_shm = self._frames_shm = None
+        self.logger.info("进程外视频捕获资源已释放")
@@ -2,18 +2,25 @@
 import cv2
 import threading
 import time
+import numpy as np
+from .camera_config import CameraConfig
+from .frame_buffer import FrameRing, FrameSlot
 from src.utils.logger import setup_logger
 
 
 class ThreadedVideoCapture:
     """线程化视频捕获类，提高视频读取性能"""
 
-    def __init__(self, source):
+    def __init__(self, source, use_ring=None, ring_slots=None, sampler=None):
         """
         初始化线程化视频捕获
 
         Args:
             source: 视频源路径或摄像头ID
+            use_ring (bool, optional): 是否使用预分配的环形帧缓冲区，默认使用配置中的值
+            ring_slots (int, optional): 环形缓冲区槽位数量，默认使用配置中的值
+            sampler (optional): 帧采样策略（提供 should_process(frame_index) 方法），
+                不会被处理的帧只调用 grab() 而不解码
         """
         self.logger = setup_logger('ThreadedVideoCapture')
         self.logger.info(f"初始化视频捕获: {source}")
@@ -31,9 +38,30 @@ class ThreadedVideoCapture:
         self.fps = self.original_fps if self.original_fps > 0 else 30.0
         self.frame_time = 1.0 / self.fps
 
+        self.use_ring = CameraConfig.USE_FRAME_RING if use_ring is None else use_ring
+        self.ring_slots = ring_slots or CameraConfig.FRAME_RING_SLOTS
+        self.ring = None
+        self.sampler = sampler
+        self.skipped_frames = 0  # 只 grab 未解码的帧数
+
         self.ret, self.frame = self.cap.read()
+        self.frame_seq = 1 if self.ret else 0  # 源帧序号（包括只grab未解码的帧）
+        self.published_seq = self.frame_seq  # 最新可读帧的序号，单调递增
+        self.frame_timestamp = time.time()  # 帧捕获时间戳
+
+        if self.use_ring and self.ret:
+            # 以首帧尺寸预分配环形缓冲区，后续帧直接解码到缓冲区中
+            self.ring = FrameRing(self.ring_slots, self.frame.shape, self.frame.dtype)
+            index, buf = self.ring.acquire_write()
+            np.copyto(buf, self.frame)
+            self.ring.publish(index, self.frame_seq, self.frame_timestamp)
+            self.frame = None
+            self.logger.info(f"已启用环形帧缓冲区: {self.ring_slots} 个槽位, 帧尺寸 {self.ring.shape}")
+
         self.running = True
         self.lock = threading.Lock()
+        # 新帧发布或捕获结束时通知等待新帧的读取者
+        self.frame_cond = threading.Condition(self.lock)
 
         # 添加帧计时器，用于控制帧率
         self.last_frame_time = time.time()
@@ -60,27 +88,139 @@ class ThreadedVideoCapture:
             if sleep_time > 0:
                 time.sleep(sleep_time)
 
-            # 读取下一帧
-            ret, frame = self.cap.read()
-            self.last_frame_time = time.time()
-
-            with self.lock:
-                self.ret, self.frame = ret, frame
+            # 不会被处理的帧只抓取不解码
+            if self.sampler is not None and not self.sampler.should_process(self.frame_seq + 1):
+                ret = self._grab_only()
+            elif self.ring is not None:
+                ret = self._read_into_ring()
+            else:
+                ret, frame = self.cap.read()
+                self.last_frame_time = time.time()
+                with self.lock:
+                    self.ret, self.frame = ret, frame
+                    if ret:
+                        self.frame_seq += 1
+                        self.published_seq = self.frame_seq
+                        self.frame_timestamp = self.last_frame_time
+                        self.frame_cond.notify_all()
 
             if not ret:
                 self.logger.info("视频播放结束")
                 self.running = False
                 break
 
-    def read(self):
+        # 唤醒所有仍在等待新帧的读取者
+        with self.frame_cond:
+            self.frame_cond.notify_all()
+
+    def _grab_only(self):
+        """
+        抓取下一帧但不解码，用于采样策略会丢弃的帧
+
+        Returns:
+            bool: 是否抓取成功
+        """
+        ret = self.cap.grab()
+        self.last_frame_time = time.time()
+        with self.lock:
+            if ret:
+                self.frame_seq += 1
+                self.skipped_frames += 1
+            else:
+                self.ret = False
+        return ret
+
+    def _read_into_ring(self):
+        """
+        将下一帧直接解码到环形缓冲区的空闲槽位中
+
+        Returns:
+            bool: 是否读取成功
+        """
+        index, buf = self.ring.acquire_write()
+        if index < 0:
+            # 所有槽位都被消费者持有，丢弃该帧但保持解码进度
+            self.logger.debug("环形缓冲区无空闲槽位，丢弃当前帧")
+            return self._grab_only()
+
+        ret, frame = self.cap.read(image=buf)
+        self.last_frame_time = time.time()
+
+        if not ret:
+            self.ring.abort_write(index)
+            with self.lock:
+                self.ret = False
+            return False
+
+        if frame is not buf:
+            # OpenCV 在尺寸不匹配时会重新分配数组
+            if frame.shape == buf.shape:
+                np.copyto(buf, frame)
+            else:
+                self.logger.warning(f"视频帧尺寸变化: {buf.shape} -> {frame.shape}，重建环形缓冲区")
+                self.ring.abort_write(index)
+                self.ring = FrameRing(self.ring_slots, frame.shape, frame.dtype)
+                index, buf = self.ring.acquire_write()
+                np.copyto(buf, frame)
+
+        with self.lock:
+            self.ret = True
+            self.frame_seq += 1
+            self.published_seq = self.frame_seq
+            self.frame_timestamp = self.last_frame_time
+            self.ring.publish(index, self.frame_seq, self.frame_timestamp)
+            self.frame_cond.notify_all()
+        return True
+
+    def read(self, newer_than=None, timeout=None):
         """
         读取当前帧
 
+        需要帧序号和时间戳时请使用 read_slot()。
+
+        Args:
+            newer_than (int, optional): 提供时阻塞等待序号大于该值的新帧
+            timeout (float, optional): 等待新帧的最长时间（秒），None表示一直等待
+
         Returns:
             tuple: (ret, frame) 其中ret表示是否读取成功，frame是图像帧
         """
-        with self.lock:
-            return self.ret, self.frame.copy() if self.ret else None
+        slot = self.read_slot(newer_than=newer_than, timeout=timeout)
+        if slot is None:
+            return False, None
+        with slot:
+            # 非环形缓冲区模式下槽位中已经是副本
+            return True, slot.frame.copy() if self.ring is not None else slot.frame
+
+    def read_slot(self, newer_than=None, timeout=None):
+        """
+        读取当前帧的只读视图（环形缓冲区模式下不复制帧数据）
+
+        返回的槽位在释放前不会被采集线程覆盖，调用方应在使用完毕后调用
+        release()，或使用 ``with cap.read_slot() as slot:`` 自动释放。
+
+        Args:
+            newer_than (int, optional): 提供时阻塞等待序号大于该值的新帧，
+                避免对同一帧重复推理
+            timeout (float, optional): 等待新帧的最长时间（秒），None表示一直等待
+
+        Returns:
+            FrameSlot: 帧槽位（带序号 seq 和捕获时间戳 timestamp），
+                视频结束、读取失败或等待超时时返回None
+        """
+        with self.frame_cond:
+            if newer_than is not None:
+                self.frame_cond.wait_for(
+                    lambda: self.published_seq > newer_than or not self.ret or not self.running,
+                    timeout=timeout
+                )
+                if self.published_seq <= newer_than:
+                    return None
+            if not self.ret:
+                return None
+            if self.ring is not None:
+                return self.ring.acquire_latest()
+            return FrameSlot(self.frame.copy(), self.published_seq, self.frame_timestamp)
 
     def release(self):
         """释放视频资源"""
@@ -90,4 +230,4 @@ class ThreadedVideoCapture:
             self.thread.join(timeout=1.0)
         if self.cap is not None:
             self.cap.release()
-        self.logger.info("视频资源已释放")
\ No newline at end of file
+        self.logger.info("视频资源已释放")
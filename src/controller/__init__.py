@@ -1,4 +1,6 @@
 # src/controller/__init__.py
 from .detection_controller import DetectionController
+from .frame_sampler import FrameSampler
+from .multi_stream_controller import MultiStreamController
 
-__all__ = ['DetectionController']
\ No newline at end of file
+__all__ = ['DetectionController', 'FrameSampler', 'MultiStreamController']
\ No newline at end of file
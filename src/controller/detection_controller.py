@@ -4,54 +4,148 @@ import time
 from collections import deque
 from src.detector.detection_utils import prioritize_detections, format_detection_speech
 from src.detector.detection_config import DetectionConfig
+from src.detector.motion_gate import MotionGate
+from src.detector.tracker import IoUTracker
+from src.controller.frame_sampler import FrameSampler
+from src.ocr.ocr_config import OCRConfig
+from src.ocr.ocr_worker import crop_for_ocr
 from src.utils.logger import setup_logger
 
+# prepare_frame() 的处理决定
+FRAME_SKIP = 'skip'  # 不处理该帧
+FRAME_REUSE = 'reuse'  # 复用上一次的检测结果
+FRAME_TRACK = 'track'  # 用跟踪器外推上一个关键帧的检测结果
+FRAME_INFER = 'infer'  # 需要执行推理
+
 
 class DetectionController:
     """检测控制器，管理检测过程和TTS调用"""
 
-    def __init__(self, detector, tts_engine):
+    def __init__(self, detector, tts_engine, ocr_worker=None):
         """
         初始化检测控制器
 
         Args:
             detector: 目标检测器
             tts_engine: TTS引擎
+            ocr_worker (optional): OCR 工作者（OCRWorker 或 OCRService），
+                提供时识别 OCRConfig.OCR_CLASSES 目标上的文字
         """
         self.logger = setup_logger('DetectionController')
         self.detector = detector
         self.tts_engine = tts_engine
+        self.ocr_worker = ocr_worker
+        self._ocr_submit_times = {}  # 目标的键 -> 上一次提交 OCR 的时间
         self.detection_queue = deque(maxlen=DetectionConfig.QUEUE_MAX_SIZE)
         self.last_tts_data = {
             'time': 0,
             'content': ""
         }
         self.frame_counter = 0
+        self.last_processed_index = 0  # 最近一次执行检测的帧序号，用于跳过重复帧
+        # 帧采样策略，同时提供给视频捕获层用于跳过不处理帧的解码
+        self.sampler = FrameSampler(DetectionConfig.PROCESS_EVERY_N_FRAMES)
+        # 复用的绘制缓冲区，避免每帧分配新的显示图像
+        self.display_buffer = None
+        # 运动门控：场景静止时复用上一次的检测结果
+        self.motion_gate = MotionGate() if DetectionConfig.MOTION_GATE_ENABLED else None
+        self.last_detections = []
+        # 跟踪器：只在关键帧运行检测器，关键帧之间外推轨迹
+        self.tracker = IoUTracker() if DetectionConfig.TRACKER_ENABLED else None
 
-    def process_frame(self, frame):
+    def prepare_frame(self, frame, frame_index=None):
         """
-        处理单个视频帧
+        判断当前帧需要如何处理（采样、去重、运动门控和关键帧节奏）
 
         Args:
             frame: 输入视频帧
+            frame_index (int, optional): 帧在视频源中的序号，提供时按该序号采样，
+                与捕获层的跳帧策略保持一致；否则按调用次数采样
 
         Returns:
-            numpy.ndarray: 处理后的帧，带有检测标记
+            str: FRAME_SKIP（不处理）、FRAME_REUSE（复用上一次检测结果）、
+                FRAME_TRACK（跟踪外推）或 FRAME_INFER（需要推理）
         """
         self.frame_counter += 1
-        process_this_frame = (self.frame_counter % DetectionConfig.PROCESS_EVERY_N_FRAMES == 0)
+        if frame_index is None:
+            frame_index = self.frame_counter
+        process_this_frame = self.sampler.should_process(frame_index)
+
+        # 同一帧不重复推理
+        if not process_this_frame or frame_index <= self.last_processed_index:
+            return FRAME_SKIP
+        self.last_processed_index = frame_index
+
+        try:
+            if self.motion_gate is not None and not self.motion_gate.should_infer(frame):
+                # 场景静止，复用上一次的检测结果
+                return FRAME_REUSE
+        except Exception as e:
+            self.logger.error(f"运动门控计算失败: {str(e)}")
+
+        if self.tracker is not None and not self.tracker.is_keyframe():
+            # 非关键帧，由跟踪器外推
+            return FRAME_TRACK
+        return FRAME_INFER
 
-        if not process_this_frame:
+    def process_frame(self, frame, frame_index=None):
+        """
+        处理单个视频帧
+
+        Args:
+            frame: 输入视频帧
+            frame_index (int, optional): 帧在视频源中的序号，提供时按该序号采样，
+                与捕获层的跳帧策略保持一致；否则按调用次数采样
+
+        Returns:
+            numpy.ndarray: 处理后的帧，带有检测标记
+        """
+        action = self.prepare_frame(frame, frame_index)
+        if action == FRAME_SKIP:
             return frame
+        if action == FRAME_TRACK:
+            return self.propagate_tracks(frame)
 
         try:
             # 执行目标检测
-            detections = self.detector.detect(frame)
+            detections = self.detector.detect(frame) if action == FRAME_INFER else None
+        except Exception as e:
+            self.logger.error(f"处理帧时发生错误: {str(e)}")
+            return frame
+        return self.handle_detections(frame, detections)
+
+    def handle_detections(self, frame, detections=None):
+        """
+        处理一帧的检测结果：优先级排序、更新队列、TTS播报和绘制
+
+        Args:
+            frame: 输入视频帧
+            detections (List[Dict], optional): 本帧的检测结果；为None时复用上一次的检测结果
+
+        Returns:
+            numpy.ndarray: 处理后的帧，带有检测标记
+        """
+        try:
+            if detections is None:
+                detections = self.last_detections
+            else:
+                # 确保检测结果是列表
+                if not isinstance(detections, list):
+                    self.logger.warning(f"检测器返回了非列表类型的结果: {type(detections)}")
+                    detections = []
+
+                if self.tracker is not None:
+                    # 关键帧：更新轨迹，附加 track_id 和平滑后的距离
+                    detections = self.tracker.update(detections, self.last_processed_index)
+                if self.motion_gate is not None:
+                    self.motion_gate.mark_inferred()
+                if self.ocr_worker is not None:
+                    # 只在检测器输出的框上裁剪（外推的框不够准确）
+                    self._submit_ocr(frame, detections)
+                self.last_detections = detections
 
-            # 确保检测结果是列表
-            if not isinstance(detections, list):
-                self.logger.warning(f"检测器返回了非列表类型的结果: {type(detections)}")
-                detections = []
+            if self.ocr_worker is not None:
+                detections = self._attach_text(detections)
 
             # 优先级排序
             prioritized_detections = prioritize_detections(detections)
@@ -69,13 +163,85 @@ class DetectionController:
             self._process_tts()
 
             # 绘制检测结果
-            display_frame = self.detector.draw_detections(frame, prioritized_detections)
+            if self.display_buffer is None or self.display_buffer.shape != frame.shape:
+                self.display_buffer = frame.copy()
+            display_frame = self.detector.draw_detections(frame, prioritized_detections,
+                                                          out=self.display_buffer)
             return display_frame
 
         except Exception as e:
             self.logger.error(f"处理帧时发生错误: {str(e)}")
             return frame
 
+    def propagate_tracks(self, frame):
+        """
+        非关键帧：用跟踪器外推的轨迹代替检测结果
+
+        Args:
+            frame: 输入视频帧
+
+        Returns:
+            numpy.ndarray: 处理后的帧，带有检测标记
+        """
+        try:
+            self.last_detections = self.tracker.predict(self.last_processed_index)
+        except Exception as e:
+            self.logger.error(f"跟踪外推失败: {str(e)}")
+            self.tracker.reset()
+        return self.handle_detections(frame)
+
+    def _ocr_key(self, det):
+        """OCR 结果的键：有跟踪ID时按目标区分，否则按类别区分；多路共享 OCR 工作者时按控制器区分"""
+        return id(self), det.get('track_id', det['class'])
+
+    def _submit_ocr(self, frame, detections):
+        """
+        把需要识别文字的目标裁剪出来提交给 OCR 工作者（不阻塞）
+
+        Args:
+            frame: 输入视频帧
+            detections (List[Dict]): 本帧的检测结果
+        """
+        current_time = time.time()
+        for det in detections:
+            if det['class'] not in OCRConfig.OCR_CLASSES:
+                continue
+            key = self._ocr_key(det)
+            if current_time - self._ocr_submit_times.get(key, 0) < OCRConfig.RESUBMIT_SECONDS:
+                continue
+            try:
+                crop = crop_for_ocr(frame, det['bbox'])
+            except Exception as e:
+                self.logger.error(f"裁剪 OCR 区域失败: {str(e)}")
+                continue
+            if crop is not None and self.ocr_worker.submit(key, crop):
+                self._ocr_submit_times[key] = current_time
+
+        # 清理长时间未提交的目标
+        expired = [key for key, submitted in self._ocr_submit_times.items()
+                   if current_time - submitted > OCRConfig.RESULT_TTL_SECONDS]
+        for key in expired:
+            del self._ocr_submit_times[key]
+
+    def _attach_text(self, detections):
+        """
+        把已有的 OCR 结果附加到检测结果的 'text' 字段
+
+        Args:
+            detections (List[Dict]): 检测结果
+
+        Returns:
+            List[Dict]: 检测结果，有识别结果的目标附加了 'text'
+        """
+        attached = []
+        for det in detections:
+            if det['class'] in OCRConfig.OCR_CLASSES:
+                text = self.ocr_worker.get_text(self._ocr_key(det))
+                if text:
+                    det = dict(det, text=text)
+            attached.append(det)
+        return attached
+
     def _process_tts(self):
         """处理TTS语音播报"""
         if not self.detection_queue:
@@ -0,0 +1,32 @@
+# src/controller/frame_sampler.py
+from src.detector.detection_config import DetectionConfig
+
+
+class FrameSampler:
+    """
+    帧采样策略：决定哪些帧需要进行目标检测
+
+    检测控制器和视频捕获层共享同一个采样器，捕获线程据此对不会被处理的帧
+    只调用 grab() 而跳过解码。
+    """
+
+    def __init__(self, every_n_frames=None):
+        """
+        初始化帧采样器
+
+        Args:
+            every_n_frames (int, optional): 每N帧处理1帧，默认使用配置中的值
+        """
+        self.every_n_frames = max(1, int(every_n_frames or DetectionConfig.PROCESS_EVERY_N_FRAMES))
+
+    def should_process(self, frame_index):
+        """
+        判断指定序号的帧是否需要处理
+
+        Args:
+            frame_index (int): 帧在视频源中的序号（从1开始）
+
+        Returns:
+            bool: 是否需要处理该帧
+        """
+        return frame_index % self.every_n_frames == 0
\ No newline at end of file
@@ -0,0 +1,81 @@
+# src/controller/multi_stream_controller.py
+from src.controller.detection_controller import DetectionController, FRAME_SKIP, FRAME_INFER, FRAME_TRACK
+from src.utils.logger import setup_logger
+
+
+class MultiStreamController:
+    """
+    多路检测控制器
+
+    每路视频流对应一个 DetectionController（独立的采样、门控、检测队列和播报节流），
+    共享同一个检测器：各路需要推理的帧合并为一个批次送入检测器，结果再分发回对应的控制器。
+    """
+
+    def __init__(self, detector, tts_engine, num_streams, ocr_worker=None):
+        """
+        初始化多路检测控制器
+
+        Args:
+            detector: 目标检测器（需要提供 detect_batch 方法）
+            tts_engine: TTS引擎
+            num_streams (int): 视频流数量
+            ocr_worker (optional): OCR 工作者，各路共享
+        """
+        self.logger = setup_logger('MultiStreamController')
+        self.detector = detector
+        self.controllers = [DetectionController(detector, tts_engine, ocr_worker) for _ in range(num_streams)]
+
+    @property
+    def samplers(self):
+        """各路控制器的帧采样策略，供捕获层跳过不处理帧的解码"""
+        return [controller.sampler for controller in self.controllers]
+
+    def process_slots(self, slots):
+        """
+        处理各路视频流的最新帧
+
+        Args:
+            slots (List[Tuple[int, FrameSlot]]): (视频流索引, 帧槽位) 列表
+
+        Returns:
+            Dict[int, numpy.ndarray]: 视频流索引到处理后帧的映射
+        """
+        display_frames = {}
+        batch_streams = []
+        batch_frames = []
+        reuse_streams = []
+        track_streams = []
+
+        for stream_index, slot in slots:
+            controller = self.controllers[stream_index]
+            action = controller.prepare_frame(slot.frame, slot.seq)
+            if action == FRAME_SKIP:
+                display_frames[stream_index] = slot.frame
+            elif action == FRAME_INFER:
+                batch_streams.append((stream_index, slot))
+                batch_frames.append(slot.frame)
+            elif action == FRAME_TRACK:
+                track_streams.append((stream_index, slot))
+            else:
+                reuse_streams.append((stream_index, slot))
+
+        # 需要推理的帧合并为一个批次，模型只加载一次
+        batch_results = []
+        if batch_frames:
+            try:
+                batch_results = self.detector.detect_batch(batch_frames)
+            except Exception as e:
+                self.logger.error(f"批量检测时发生错误: {str(e)}")
+            if len(batch_results) != len(batch_frames):
+                batch_results = [[] for _ in batch_frames]
+
+        for (stream_index, slot), detections in zip(batch_streams, batch_results):
+            display_frames[stream_index] = self.controllers[stream_index].handle_detections(slot.frame, detections)
+
+        for stream_index, slot in track_streams:
+            display_frames[stream_index] = self.controllers[stream_index].propagate_tracks(slot.frame)
+
+        for stream_index, slot in reuse_streams:
+            display_frames[stream_index] = self.controllers[stream_index].handle_detections(slot.frame)
+
+        return display_frames
\ No newline at end of file
@@ -3,11 +3,13 @@ from .yolo import ObjectDetector
 from .yolo_config import DetectorConfig
 from .detection_config import DetectionConfig
 from .detection_utils import prioritize_detections, format_detection_speech
+from .batch_scheduler import MicroBatchScheduler
 
 __all__ = [
     'ObjectDetector',
     'DetectorConfig',
     'DetectionConfig',
     'prioritize_detections',
-    'format_detection_speech'
+    'format_detection_speech',
+    'MicroBatchScheduler'
 ]
\ No newline at end of file
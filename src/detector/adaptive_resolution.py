@@ -0,0 +1,142 @@
+# src/detector/adaptive_resolution.py
+from collections import deque
+import numpy as np
+from .yolo_config import DetectorConfig
+
+
+class AdaptiveResolution:
+    """
+    基于推理延迟的自适应输入分辨率
+
+    在一组输入尺寸（如 320/480/640）之间切换：当前尺寸的滚动 p95 延迟超过预算时降一档，
+    明显低于预算时升一档。延迟按大模型的单帧推理耗时计算。最近目标的距离估算不可靠
+    （置信度低或框太小）或检测到的目标太少时，临时提升一档若干帧；空画面默认不提升。
+    """
+
+    def __init__(self, ladder=None, latency_budget_ms=None, window=None, config=None):
+        """
+        初始化自适应分辨率控制器
+
+        Args:
+            ladder (List[int], optional): 从小到大的输入尺寸列表，默认使用 config.IMGSZ_LADDER
+            latency_budget_ms (float, optional): 每次推理的延迟预算（毫秒）
+            window (int, optional): 计算 p95 的滚动窗口大小
+            config (optional): 检测器配置
+        """
+        self.config = config or DetectorConfig()
+        self.ladder = sorted(ladder or self.config.IMGSZ_LADDER)
+        self.latency_budget_ms = latency_budget_ms or self.config.LATENCY_BUDGET_MS
+        window = window or self.config.LATENCY_WINDOW
+
+        # 每个尺寸单独记录延迟，切换后仍可参考该尺寸的历史延迟
+        self._latencies = {size: deque(maxlen=window) for size in self.ladder}
+        # 从配置（含性能档案）的输入尺寸开始，不在列表中时从不超过该尺寸的最大一档开始
+        self.index = max(0, sum(1 for size in self.ladder if size <= self.config.INPUT_WIDTH) - 1)
+        self._samples_since_switch = 0
+        self._boost_remaining = 0
+        self._boost_cooldown = 0
+
+        # 统计信息
+        self.switches = 0
+        self.boosts = 0
+
+    @property
+    def imgsz(self):
+        """当前使用的输入尺寸（临时提升期间为高一档的尺寸）"""
+        if self._boost_remaining > 0:
+            return self.ladder[min(self.index + 1, len(self.ladder) - 1)]
+        return self.ladder[self.index]
+
+    def p95(self, size=None):
+        """
+        获取指定尺寸的滚动 p95 延迟
+
+        Args:
+            size (int, optional): 输入尺寸，默认为当前基准尺寸
+
+        Returns:
+            float: p95 延迟（毫秒），没有记录时返回 None
+        """
+        latencies = self._latencies[self.ladder[self.index] if size is None else size]
+        return float(np.percentile(latencies, 95)) if latencies else None
+
+    def record_latency(self, imgsz, latency_ms):
+        """
+        记录一次推理的延迟，并根据 p95 调整基准尺寸
+
+        Args:
+            imgsz (int): 本次推理使用的输入尺寸
+            latency_ms (float): 大模型的单帧推理耗时（毫秒），本次没有运行大模型（级联只用了筛选模型）时为
+                None，只计入临时提升的次数
+        """
+        if latency_ms is not None and imgsz in self._latencies:
+            self._latencies[imgsz].append(latency_ms)
+
+        if self._boost_remaining > 0:
+            # 临时提升期间不调整基准尺寸
+            self._boost_remaining -= 1
+            return
+        if self._boost_cooldown > 0:
+            self._boost_cooldown -= 1
+        if latency_ms is None:
+            return
+
+        self._samples_since_switch += 1
+        if self._samples_since_switch < self.config.ADAPTIVE_MIN_SAMPLES:
+            return
+
+        p95 = self.p95()
+        if p95 > self.latency_budget_ms and self.index > 0:
+            self._switch(self.index - 1)
+        elif self.index < len(self.ladder) - 1:
+            # 上一档有历史延迟时以其为准，否则要求当前延迟留有足够余量
+            upper_p95 = self.p95(self.ladder[self.index + 1])
+            if (upper_p95 <= self.latency_budget_ms if upper_p95 is not None
+                    else p95 < self.latency_budget_ms * self.config.STEP_UP_HEADROOM):
+                self._switch(self.index + 1)
+
+    def _switch(self, index):
+        """切换基准尺寸"""
+        self.index = index
+        self._samples_since_switch = 0
+        self.switches += 1
+
+    def check_detections(self, detections, frame_width):
+        """
+        根据检测结果判断是否需要临时提升分辨率
+
+        Args:
+            detections (List[Dict]): 本帧的检测结果
+            frame_width (int): 原图宽度，用于换算目标在模型输入中的像素宽度
+        """
+        if self._boost_remaining > 0 or self._boost_cooldown > 0 or self.index == len(self.ladder) - 1:
+            return
+
+        if not detections:
+            uncertain = self.config.BOOST_ON_EMPTY
+        else:
+            uncertain = len(detections) < self.config.FEW_OBJECTS
+            closest = min(detections, key=lambda det: det['distance'])
+            box_pixels = (closest['bbox'][2] - closest['bbox'][0]) / frame_width * self.ladder[self.index]
+            uncertain = uncertain or (closest['confidence'] < self.config.UNCERTAIN_CONFIDENCE
+                                      or box_pixels < self.config.UNCERTAIN_BOX_PIXELS)
+        if uncertain:
+            self._boost_remaining = self.config.BOOST_FRAMES
+            # 提升结束后间隔一段时间才能再次提升，避免一直停留在高分辨率
+            self._boost_cooldown = self.config.BOOST_COOLDOWN_FRAMES
+            self.boosts += 1
+
+    def get_stats(self):
+        """
+        获取自适应分辨率统计信息
+
+        Returns:
+            dict: 当前尺寸、基准尺寸的 p95 延迟、切换次数和临时提升次数
+        """
+        return {
+            'imgsz': self.imgsz,
+            'base_imgsz': self.ladder[self.index],
+            'p95_ms': self.p95(),
+            'switches': self.switches,
+            'boosts': self.boosts
+        }
@@ -0,0 +1,103 @@
+# src/detector/artifact_cache.py
+from pathlib import Path
+
+
+def _ultralytics_version():
+    """ultralytics 版本号（未安装时返回 none）"""
+    try:
+        import ultralytics
+        return ultralytics.__version__
+    except ImportError:
+        return "none"
+
+
+def _is_fresh(cache_path, source_path):
+    """缓存存在且不早于源模型文件（源文件不存在时只要求缓存存在）"""
+    cache_path, source_path = Path(cache_path), Path(source_path)
+    if not cache_path.exists():
+        return False
+    return not source_path.exists() or cache_path.stat().st_mtime >= source_path.stat().st_mtime
+
+
+def fused_model_path(config):
+    """
+    融合后 torch 模型的缓存路径，按模型名称、ultralytics 版本和 torch 版本区分
+
+    Args:
+        config: 检测器配置
+
+    Returns:
+        Path: 缓存文件路径
+    """
+    import torch
+
+    torch_version = torch.__version__.split('+')[0]
+    name = f"{config.MODEL_NAME}-ultralytics{_ultralytics_version()}-torch{torch_version}-fused.pt"
+    return Path(config.ARTIFACT_CACHE_DIR) / name
+
+
+def load_fused_model(config, logger):
+    """
+    从缓存加载融合后的模型（内存映射加载，避免把整个文件读入内存再反序列化）
+
+    Args:
+        config: 检测器配置
+        logger: 日志记录器
+
+    Returns:
+        torch.nn.Module: 融合后的检测网络，缓存不存在或已过期时返回 None
+    """
+    import torch
+
+    path = fused_model_path(config)
+    if not _is_fresh(path, config.MODEL_PATH):
+        return None
+    try:
+        # mmap 参数需要 torch >= 2.1（requirements.txt 固定为 2.3.1）
+        net = torch.load(path, map_location='cpu', mmap=True, weights_only=False)
+        logger.info(f"从缓存加载融合模型: {path}")
+        return net
+    except Exception as e:
+        logger.warning(f"加载缓存模型失败，重新加载原始模型: {str(e)}")
+        return None
+
+
+def save_fused_model(net, config, logger):
+    """
+    保存融合后的模型到缓存
+
+    Args:
+        net (torch.nn.Module): 融合后的检测网络
+        config: 检测器配置
+        logger: 日志记录器
+    """
+    import torch
+
+    path = fused_model_path(config)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 先写临时文件再重命名，避免中断时留下损坏的缓存
+        tmp_path = path.with_suffix('.tmp')
+        torch.save(net, tmp_path)
+        tmp_path.replace(path)
+        logger.info(f"已缓存融合模型: {path}")
+    except Exception as e:
+        logger.warning(f"缓存融合模型失败: {str(e)}")
+
+
+def optimized_onnx_path(model_path, config):
+    """
+    onnxruntime 优化后模型的缓存路径，按源模型名称和 onnxruntime 版本区分
+
+    Args:
+        model_path: 源 ONNX 模型路径
+        config: 检测器配置
+
+    Returns:
+        tuple: (缓存文件路径, 缓存是否可用)
+    """
+    import onnxruntime as ort
+
+    model_path = Path(model_path)
+    path = Path(config.ARTIFACT_CACHE_DIR) / f"{model_path.stem}-ort{ort.__version__}-optimized.onnx"
+    return path, _is_fresh(path, model_path)
@@ -0,0 +1,250 @@
+# src/detector/autotune.py
+import copy
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+from .yolo_config import DetectorConfig
+from .detection_config import DetectionConfig
+from src.config import LOGS_DIR
+from src.utils.logger import setup_logger
+
+# 性能档案中可以覆盖的配置项
+PROFILE_KEYS = (
+    'BACKEND', 'INPUT_WIDTH', 'INPUT_HEIGHT', 'BATCH_SIZE',
+    'TORCH_INTRA_OP_THREADS', 'TORCH_INTER_OP_THREADS',
+    'ORT_INTRA_OP_THREADS', 'ORT_INTER_OP_THREADS'
+)
+
+
+def host_id():
+    """当前主机的标识（主机名、CPU架构和核心数），性能档案按主机保存"""
+    return f"{socket.gethostname()}-{platform.machine()}-{os.cpu_count()}cpu"
+
+
+def load_profile(config, logger):
+    """
+    读取当前主机的性能档案并应用到配置
+
+    档案中的模型名称与配置不一致时不应用（不同模型的最优设置不同）。
+
+    Args:
+        config: 检测器配置
+        logger: 日志记录器
+
+    Returns:
+        应用了性能档案的配置副本；没有可用档案时返回原配置
+    """
+    path = Path(config.PERF_PROFILE_PATH)
+    if not config.USE_PERF_PROFILE or not path.exists():
+        return config
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            profile = json.load(f).get(host_id())
+    except Exception as e:
+        logger.warning(f"读取性能档案失败: {str(e)}")
+        return config
+    if not profile:
+        return config
+    if profile.get('MODEL_NAME') != config.MODEL_NAME:
+        logger.info(f"性能档案对应模型 {profile.get('MODEL_NAME')}，与当前模型 {config.MODEL_NAME} 不一致，不应用")
+        return config
+
+    config = copy.copy(config)
+    settings = {key: value for key, value in profile['settings'].items() if key in PROFILE_KEYS}
+    for key, value in settings.items():
+        setattr(config, key, value)
+    logger.info(f"已应用性能档案 {path}: {settings}")
+    return config
+
+
+def _thread_candidates():
+    """算子内线程数候选：1、2、4…直到CPU核心数"""
+    cpu_count = os.cpu_count() or 1
+    candidates = {cpu_count}
+    threads = 1
+    while threads < cpu_count:
+        candidates.add(threads)
+        threads *= 2
+    return sorted(candidates)
+
+
+def _benchmark_setting(config, video_path, num_frames):
+    """
+    在独立进程中按一组设置运行检测器（torch 的线程数只能在进程内设置一次）
+
+    Returns:
+        dict: 每批延迟 p50/p95/平均值（毫秒）和吞吐量（帧/秒）
+    """
+    from .quantization import sample_video_frames
+    from .yolo import ObjectDetector
+
+    frames = sample_video_frames(video_path, num_frames)
+    if not frames:
+        raise RuntimeError(f"未能从 {video_path} 读取帧")
+
+    detector = ObjectDetector(config)
+    batch_size = config.BATCH_SIZE
+    batches = [frames[i:i + batch_size] for i in range(0, len(frames) - batch_size + 1, batch_size)]
+    latencies = []
+    start_time = time.perf_counter()
+    for batch in batches:
+        batch_start = time.perf_counter()
+        detector.detect_batch(batch)
+        latencies.append((time.perf_counter() - batch_start) * 1000.0)
+    elapsed = time.perf_counter() - start_time
+
+    values = np.asarray(latencies)
+    return {
+        'p50_ms': round(float(np.percentile(values, 50)), 2),
+        'p95_ms': round(float(np.percentile(values, 95)), 2),
+        'mean_ms': round(float(values.mean()), 2),
+        'fps': round(len(batches) * batch_size / elapsed, 2)
+    }
+
+
+def autotune(video_path=None, num_frames=None, backends=None, imgsz_list=None, intra_threads=None,
+             inter_threads=None, batch_sizes=None, latency_budget_ms=None, config=None):
+    """
+    在视频帧上遍历推理设置，把当前主机的最优设置写入性能档案
+
+    选择规则：在每批 p95 延迟不超过预算的设置中，优先选择输入尺寸最大的（精度优先），
+    同尺寸下选择吞吐量最高的；没有设置满足预算时选择 p95 延迟最低的。
+
+    Args:
+        video_path (optional): 视频路径，默认使用 DetectionConfig.VIDEO_PATH
+        num_frames (int, optional): 每组设置测试的帧数，默认使用 config.AUTOTUNE_FRAMES
+        backends (List[str], optional): 推理后端，默认 torch，ONNX 模型存在时加上 onnxruntime
+        imgsz_list (List[int], optional): 输入尺寸，默认使用 config.IMGSZ_LADDER
+        intra_threads (List[int], optional): 算子内线程数，默认 1、2、4…直到CPU核心数
+        inter_threads (List[int], optional): torch 的算子间线程数，默认 [1, 2]（onnxruntime 会话使用顺序执行模式，
+            算子间线程数不起作用，固定为1）
+        batch_sizes (List[int], optional): 批大小，默认 [1, 2]
+        latency_budget_ms (float, optional): 每批延迟预算（毫秒），默认使用 config.LATENCY_BUDGET_MS
+        config (optional): 检测器配置
+
+    Returns:
+        dict: 写入档案的当前主机条目
+    """
+    logger = setup_logger('autotune')
+    config = config or DetectorConfig()
+    video_path = video_path or DetectionConfig.VIDEO_PATH
+    num_frames = num_frames or config.AUTOTUNE_FRAMES
+    latency_budget_ms = latency_budget_ms or config.LATENCY_BUDGET_MS
+    if backends is None:
+        backends = ['torch'] + (['onnxruntime'] if Path(config.ONNX_MODEL_PATH).exists() else [])
+
+    grid = []
+    for backend in backends:
+        # onnxruntime 会话使用 ORT_SEQUENTIAL 执行模式，inter_op_num_threads 不起作用，不必遍历
+        backend_inter_threads = (inter_threads or [1, 2]) if backend == 'torch' else [1]
+        grid.extend(itertools.product(
+            [backend],
+            imgsz_list or config.IMGSZ_LADDER,
+            intra_threads or _thread_candidates(),
+            backend_inter_threads,
+            batch_sizes or [1, 2]
+        ))
+    logger.info(f"开始自动调优，共 {len(grid)} 组设置，每组 {num_frames} 帧")
+
+    results = []
+    for backend, imgsz, intra, inter, batch_size in grid:
+        settings = {
+            'BACKEND': backend,
+            'INPUT_WIDTH': imgsz,
+            'INPUT_HEIGHT': imgsz,
+            'BATCH_SIZE': batch_size
+        }
+        prefix = 'TORCH' if backend == 'torch' else 'ORT'
+        settings[f'{prefix}_INTRA_OP_THREADS'] = intra
+        settings[f'{prefix}_INTER_OP_THREADS'] = inter
+
+        # 固定设置测量，不受档案、自适应分辨率和级联影响
+        setting_config = copy.copy(config)
+        for key, value in settings.items():
+            setattr(setting_config, key, value)
+        setting_config.USE_PERF_PROFILE = False
+        setting_config.ADAPTIVE_RESOLUTION = False
+        setting_config.CASCADE_ENABLED = False
+        setting_config.WARMUP_ITERATIONS = 1
+
+        try:
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+                metrics = executor.submit(_benchmark_setting, setting_config, video_path, num_frames).result()
+        except Exception as e:
+            logger.error(f"设置 {settings} 测试失败: {str(e)}")
+            continue
+        logger.info(f"{settings}: {metrics}")
+        results.append({'settings': settings, 'metrics': metrics})
+
+    if not results:
+        raise RuntimeError("所有设置均测试失败，未生成性能档案")
+
+    within_budget = [r for r in results if r['metrics']['p95_ms'] <= latency_budget_ms]
+    if within_budget:
+        best = max(within_budget, key=lambda r: (r['settings']['INPUT_WIDTH'], r['metrics']['fps']))
+    else:
+        logger.warning(f"没有设置满足 {latency_budget_ms} ms 的延迟预算，选择延迟最低的设置")
+        best = min(results, key=lambda r: r['metrics']['p95_ms'])
+
+    entry = {
+        'MODEL_NAME': config.MODEL_NAME,
+        'settings': best['settings'],
+        'metrics': best['metrics'],
+        'latency_budget_ms': latency_budget_ms,
+        'created': time.strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+    # 性能档案按主机保存，同一文件可以包含多台设备
+    path = Path(config.PERF_PROFILE_PATH)
+    profiles = {}
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            profiles = json.load(f)
+    profiles[host_id()] = entry
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(profiles, f, ensure_ascii=False, indent=2)
+
+    # 完整的测试结果写入 logs 目录
+    sweep_path = os.path.join(LOGS_DIR, f"autotune_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(sweep_path, 'w', encoding='utf-8') as f:
+        json.dump({'host': host_id(), 'best': entry, 'results': results}, f, ensure_ascii=False, indent=2)
+
+    logger.info(f"最优设置: {best['settings']}, {best['metrics']}，已写入 {path}（完整结果: {sweep_path}）")
+    return entry
+
+
+if __name__ == "__main__":
+    import argparse
+
+    def int_list(text):
+        return [int(item) for item in text.split(',')]
+
+    parser = argparse.ArgumentParser(description="CPU 推理自动调优，生成当前主机的性能档案")
+    parser.add_argument('--video', default=None, help="测试视频路径")
+    parser.add_argument('--frames', type=int, default=None, help="每组设置测试的帧数")
+    parser.add_argument('--backends', default=None, help="推理后端，逗号分隔，如 torch,onnxruntime")
+    parser.add_argument('--imgsz', type=int_list, default=None, help="输入尺寸，逗号分隔")
+    parser.add_argument('--intra', type=int_list, default=None, help="算子内线程数，逗号分隔")
+    parser.add_argument('--inter', type=int_list, default=None, help="torch 算子间线程数，逗号分隔")
+    parser.add_argument('--batch', type=int_list, default=None, help="批大小，逗号分隔")
+    parser.add_argument('--budget', type=float, default=None, help="每批延迟预算（毫秒）")
+    args = parser.parse_args()
+
+    autotune(
+        video_path=args.video,
+        num_frames=args.frames,
+        backends=args.backends.split(',') if args.backends else None,
+        imgsz_list=args.imgsz,
+        intra_threads=args.intra,
+        inter_threads=args.inter,
+        batch_sizes=args.batch,
+        latency_budget_ms=args.budget
+    )
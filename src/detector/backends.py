@@ -0,0 +1,206 @@
+# src/detector/backends.py
+from collections import namedtuple
+from pathlib import Path
+import numpy as np
+
+# 单帧的原始检测结果：xyxy (N, 4) float32，conf (N,) float32，cls (N,) int64，坐标为原图像素坐标
+RawDetections = namedtuple('RawDetections', ['xyxy', 'conf', 'cls'])
+
+
+def empty_raw_detections():
+    """返回不含任何目标的原始检测结果"""
+    return RawDetections(
+        np.zeros((0, 4), dtype=np.float32),
+        np.zeros((0,), dtype=np.float32),
+        np.zeros((0,), dtype=np.int64)
+    )
+
+
+class TorchBackend:
+    """ultralytics/PyTorch 推理后端"""
+
+    def __init__(self, config, logger):
+        """
+        加载 ultralytics YOLO 模型
+
+        Args:
+            config: 检测器配置
+            logger: 日志记录器
+        """
+        from .artifact_cache import load_fused_model, save_fused_model
+
+        self.config = config
+        self.logger = logger
+        self.model = None
+        self.fast_path = False
+        self._configure_threads()
+
+        # 优先从本地缓存加载融合后的模型（仅快速路径可直接使用融合后的网络）
+        use_cache = self.config.FAST_PREPROCESS and self.config.USE_ARTIFACT_CACHE
+        net = load_fused_model(self.config, self.logger) if use_cache else None
+        if net is not None:
+            self.names = net.names  # 类别ID到类别名称的映射
+            self._init_fast_path(net)
+            return
+
+        self._load_model()
+        self.names = self.model.names  # 类别ID到类别名称的映射
+
+        # 快速路径：预分配输入缓冲区，直接调用底层网络，绕过 ultralytics 的通用输入处理
+        if self.config.FAST_PREPROCESS:
+            try:
+                self._init_fast_path()
+            except Exception as e:
+                self.logger.warning(f"初始化快速推理路径失败，使用 ultralytics 默认流程: {str(e)}")
+            if self.fast_path and use_cache:
+                save_fused_model(self.net, self.config, self.logger)
+
+    def _configure_threads(self):
+        """按配置设置 torch 的算子内/算子间线程数"""
+        import torch
+
+        if self.config.TORCH_INTRA_OP_THREADS:
+            torch.set_num_threads(self.config.TORCH_INTRA_OP_THREADS)
+        if self.config.TORCH_INTER_OP_THREADS:
+            try:
+                torch.set_num_interop_threads(self.config.TORCH_INTER_OP_THREADS)
+            except RuntimeError as e:
+                # 算子间线程池启动后不能再修改
+                self.logger.warning(f"无法设置 torch 算子间线程数: {str(e)}")
+        self.logger.info(f"torch 线程数 intra={torch.get_num_threads()} inter={torch.get_num_interop_threads()}")
+
+    def _load_model(self):
+        """
+        通过 ultralytics 加载本地 .pt 模型（不在线下载）
+
+        ultralytics 会把不存在的官方模型文件名当作下载请求，因此先检查文件是否存在。
+
+        Raises:
+            FileNotFoundError: 本地模型文件不存在
+            RuntimeError: 模型加载失败
+        """
+        from ultralytics import YOLO
+
+        if not Path(self.config.MODEL_PATH).is_file():
+            raise FileNotFoundError(f"模型文件不存在: {self.config.MODEL_PATH}")
+        try:
+            self.model = YOLO(self.config.MODEL_PATH)
+            self.logger.info(f"成功加载模型: {self.config.MODEL_PATH}")
+        except Exception as e:
+            self.logger.error(f"无法加载模型: {str(e)}, 类型: {type(e).__name__}")
+            raise RuntimeError(f"无法加载模型: {str(e)}")
+
+    def _init_fast_path(self, net=None):
+        """
+        融合 Conv+BN 并准备复用的输入缓冲区（CUDA 上使用锁页内存）
+
+        Args:
+            net (torch.nn.Module, optional): 已融合的检测网络（来自缓存），默认融合 ultralytics 加载的模型
+        """
+        import torch
+        from .letterbox import LetterboxBuffer
+
+        self.device = torch.device(self.config.DEVICE)
+        if net is None:
+            net = self.model.model.fuse(verbose=False)
+        self.net = net.to(self.device).eval()
+        self.dtype = next(self.net.parameters()).dtype
+        self.stride = int(self.net.stride.max())
+        pin_memory = self.device.type == 'cuda'
+        self.letterbox = LetterboxBuffer(
+            allocator=lambda shape: torch.empty(shape, dtype=torch.float32, pin_memory=pin_memory).numpy()
+        )
+        self.fast_path = True
+
+    def _infer_fast(self, frames, imgsz):
+        """快速路径推理：等比缩放填充到复用缓冲区，直接前向网络，NumPy 解码并批量还原坐标"""
+        import torch
+        from .letterbox import decode_predictions
+
+        input_shape = (imgsz, imgsz) if isinstance(imgsz, int) else tuple(imgsz)
+        batch, transforms = self.letterbox.prepare(frames, input_shape, stride=self.stride)
+        with torch.inference_mode():
+            # from_numpy 不复制数据，锁页内存上的批次可以异步拷贝到 GPU
+            tensor = torch.from_numpy(batch).to(self.device, dtype=self.dtype, non_blocking=True)
+            output = self.net(tensor)
+            output = output[0] if isinstance(output, (list, tuple)) else output
+            output = output.float().cpu().numpy()
+        return [
+            decode_predictions(output[i], transforms[i], self.config.CONFIDENCE_THRESHOLD,
+                               self.config.NMS_IOU_THRESHOLD)
+            for i in range(len(frames))
+        ]
+
+    def infer(self, frames, imgsz=None):
+        """
+        批量推理
+
+        Args:
+            frames (List[numpy.ndarray]): 输入图像帧列表 (BGR格式)
+            imgsz (int or tuple, optional): 模型输入尺寸，默认使用 (INPUT_HEIGHT, INPUT_WIDTH)
+
+        Returns:
+            List[RawDetections]: 与输入帧一一对应的原始检测结果
+        """
+        imgsz = imgsz or (self.config.INPUT_HEIGHT, self.config.INPUT_WIDTH)
+        if self.fast_path:
+            return self._infer_fast(frames, imgsz)
+
+        results = self.model(
+            list(frames),  # 输入批量帧
+            imgsz=imgsz,  # 输入尺寸
+            conf=self.config.CONFIDENCE_THRESHOLD,  # 置信度阈值
+            device=self.config.DEVICE,  # 推理设备
+            verbose=False
+        )
+        raw = []
+        for result in results:
+            boxes = result.boxes  # 获取检测框信息
+            raw.append(RawDetections(
+                boxes.xyxy.cpu().numpy().astype(np.float32, copy=False),
+                boxes.conf.cpu().numpy().astype(np.float32, copy=False),
+                boxes.cls.cpu().numpy().astype(np.int64)
+            ))
+        return raw
+
+
+def create_backend(config, logger):
+    """
+    根据配置创建推理后端
+
+    Args:
+        config: 检测器配置（BACKEND 为 "torch" 或 "onnxruntime"，PRECISION 为 "fp32" 或 "int8"）
+        logger: 日志记录器
+
+    Returns:
+        推理后端实例，提供 infer(frames, imgsz=None) 方法和 names 属性
+    """
+    if config.USE_SLICED_HEAD:
+        from .head_slicing import prepare_sliced_config, sliced_names_match
+        sliced = prepare_sliced_config(config, logger)
+        if sliced is not config:
+            backend = _create_backend(sliced, logger)
+            if sliced_names_match(backend.names, config, logger):
+                return backend
+            # 裁剪模型的类别与当前 TARGET_CLASSES 不一致（如文件被替换），退回原始模型
+            logger.warning(f"裁剪检测头模型的类别 {list(backend.names.values())} 与 TARGET_CLASSES 不一致，"
+                           f"使用原始模型")
+    return _create_backend(config, logger)
+
+
+def _create_backend(config, logger):
+    """按 BACKEND 和 PRECISION 创建推理后端（不处理裁剪检测头）"""
+    if config.PRECISION == "int8":
+        # 量化模型只能由 onnxruntime 执行
+        from .onnx_backend import OnnxRuntimeBackend
+        if config.BACKEND != "onnxruntime":
+            logger.warning(f"INT8 模式使用 onnxruntime 后端，忽略 BACKEND={config.BACKEND}")
+        return OnnxRuntimeBackend(config, logger, model_path=config.INT8_MODEL_PATH)
+    if config.PRECISION != "fp32":
+        raise ValueError(f"未知的推理精度: {config.PRECISION}")
+    if config.BACKEND == "onnxruntime":
+        from .onnx_backend import OnnxRuntimeBackend
+        return OnnxRuntimeBackend(config, logger)
+    if config.BACKEND != "torch":
+        raise ValueError(f"未知的推理后端: {config.BACKEND}")
+    return TorchBackend(config, logger)
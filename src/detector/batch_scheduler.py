@@ -0,0 +1,279 @@
+# src/detector/batch_scheduler.py
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+import cv2
+from .yolo_config import DetectorConfig
+from src.config import LOGS_DIR
+from src.utils.logger import setup_logger
+
+
+class MicroBatchScheduler:
+    """
+    微批调度器
+
+    多个生产者（离线视频处理线程、多路摄像头）提交单帧，调度线程将它们凑成批次，
+    达到最大批大小或等待超过截止时间后调用 detector.detect_batch() 一次推理，
+    再通过 Future 把每帧的检测结果返回给对应的提交者。
+    生产者通过 register_producer()/unregister_producer() 登记后，只剩一个生产者时
+    不再等待截止时间（不会有其他生产者的帧到来），直接推理队列中已有的帧。
+    """
+
+    def __init__(self, detector, max_batch_size=None, max_wait_ms=None):
+        """
+        初始化微批调度器
+
+        Args:
+            detector: 目标检测器（需要提供 detect_batch 方法）
+            max_batch_size (int, optional): 最大批大小，默认使用检测器配置（含性能档案）中的 BATCH_SIZE
+            max_wait_ms (float, optional): 凑批的最长等待时间（毫秒），默认使用 DetectorConfig.BATCH_MAX_WAIT_MS
+        """
+        self.logger = setup_logger('MicroBatchScheduler')
+        self.detector = detector
+        config = getattr(detector, 'config', DetectorConfig)
+        self.max_batch_size = max(1, int(max_batch_size or config.BATCH_SIZE))
+        self.max_wait = (DetectorConfig.BATCH_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000.0
+        self.queue = queue.Queue()
+        self.stop_event = threading.Event()
+        self._producer_lock = threading.Lock()
+        self.active_producers = None  # 已登记的活跃生产者数量，None 表示未登记
+
+        # 统计信息
+        self.batches = 0
+        self.frames = 0
+
+        self.worker_thread = threading.Thread(
+            target=self._run,
+            name="MicroBatchSchedulerThread",
+            daemon=True
+        )
+        self.worker_thread.start()
+
+    def submit(self, frame):
+        """
+        提交一帧等待批量推理
+
+        帧数据在 Future 完成之前必须保持有效（例如环形缓冲区槽位不能提前释放）。
+
+        Args:
+            frame (numpy.ndarray): 输入图像帧 (BGR格式)
+
+        Returns:
+            concurrent.futures.Future: 完成后结果为该帧的检测结果列表
+        """
+        future = Future()
+        if self.stop_event.is_set():
+            future.set_result([])
+            return future
+        self.queue.put((frame, future))
+        return future
+
+    def register_producer(self):
+        """登记一个生产者（离线处理的视频读取线程等）"""
+        with self._producer_lock:
+            self.active_producers = (self.active_producers or 0) + 1
+
+    def unregister_producer(self):
+        """生产者不再提交新帧时注销"""
+        with self._producer_lock:
+            self.active_producers = max(0, (self.active_producers or 0) - 1)
+
+    def detect(self, frame, timeout=None):
+        """
+        同步接口：提交一帧并等待其检测结果
+
+        Args:
+            frame (numpy.ndarray): 输入图像帧
+            timeout (float, optional): 最长等待时间（秒）
+
+        Returns:
+            List[Dict]: 检测结果列表
+        """
+        return self.submit(frame).result(timeout=timeout)
+
+    def _collect_batch(self):
+        """
+        收集一个批次：阻塞等待第一帧，之后在截止时间前尽量凑满批次；
+        只剩一个已登记的生产者时不等待，只取队列中已有的帧
+        """
+        try:
+            batch = [self.queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+
+        producers = self.active_producers
+        if producers is not None and producers <= 1:
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            return batch
+
+        deadline = time.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """调度线程：循环凑批并执行批量推理"""
+        self.logger.info(f"微批调度线程启动，最大批大小: {self.max_batch_size}，最长等待: {self.max_wait * 1000:.1f} 毫秒")
+        while not self.stop_event.is_set():
+            # 跳过提交者已取消的帧（对已取消的 Future 调用 set_result 会抛出异常并终止调度线程）
+            batch = [(frame, future) for frame, future in self._collect_batch()
+                     if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            frames = [frame for frame, _ in batch]
+            try:
+                results = self.detector.detect_batch(frames)
+            except Exception as e:
+                self.logger.error(f"批量推理失败: {str(e)}")
+                results = [[] for _ in batch]
+
+            for index, (_, future) in enumerate(batch):
+                if index < len(results):
+                    future.set_result(results[index])
+                else:
+                    # 检测器返回的结果少于帧数时，剩余的提交者不能一直等待
+                    future.set_exception(RuntimeError(f"批量推理返回 {len(results)} 个结果，少于 {len(batch)} 帧"))
+
+            self.batches += 1
+            self.frames += len(batch)
+
+        # 停止后让剩余的提交者立即返回
+        while True:
+            try:
+                _, future = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if future.set_running_or_notify_cancel():
+                future.set_result([])
+        self.logger.info("微批调度线程已退出")
+
+    def get_stats(self):
+        """
+        获取调度统计信息
+
+        Returns:
+            dict: 批次数、帧数和平均批大小
+        """
+        return {
+            'batches': self.batches,
+            'frames': self.frames,
+            'avg_batch_size': self.frames / self.batches if self.batches else 0.0
+        }
+
+    def stop(self):
+        """停止调度线程"""
+        self.stop_event.set()
+        if self.worker_thread.is_alive():
+            self.worker_thread.join(timeout=2.0)
+
+
+def process_videos_offline(video_paths, detector=None, output_path=None, max_batch_size=None,
+                           frames_in_flight=None):
+    """
+    离线处理多个视频文件：每个视频一个读取线程，通过微批调度器合并为批次推理
+
+    每个读取线程最多保持 frames_in_flight 帧已提交、尚未取回结果，不必等上一帧的结果
+    就继续读取，同一视频的相邻帧也能合并进同一批次。
+
+    Args:
+        video_paths (List[str]): 视频文件路径
+        detector (optional): 目标检测器，默认新建 ObjectDetector
+        output_path (optional): 检测结果路径，默认写入 logs/offline_detections_<时间>.json
+        max_batch_size (int, optional): 最大批大小，默认使用 DetectorConfig.OFFLINE_BATCH_SIZE
+        frames_in_flight (int, optional): 每个视频在途的最大帧数，默认使用 DetectorConfig.OFFLINE_FRAMES_IN_FLIGHT
+
+    Returns:
+        dict: 每个视频的路径、帧数和逐帧检测结果（与输入顺序一致），以及总吞吐量和调度统计
+    """
+    logger = setup_logger('offline_detection')
+    if detector is None:
+        from .yolo import ObjectDetector
+        detector = ObjectDetector()
+    scheduler = MicroBatchScheduler(detector, max_batch_size=max_batch_size or DetectorConfig.OFFLINE_BATCH_SIZE)
+    frames_in_flight = max(1, frames_in_flight or DetectorConfig.OFFLINE_FRAMES_IN_FLIGHT)
+    results = [[] for _ in video_paths]
+
+    def collect(path, frames, future):
+        try:
+            frames.append(future.result())
+        except Exception as e:
+            logger.error(f"视频 {path} 检测失败: {str(e)}")
+            frames.append([])
+
+    def produce(path, frames):
+        cap = cv2.VideoCapture(str(path))
+        try:
+            if not cap.isOpened():
+                logger.error(f"无法打开视频: {path}")
+                return
+            # cap.read() 每次返回新的帧数组，在途帧由调度队列持有，推理完成前保持有效
+            pending = deque()
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                pending.append(scheduler.submit(frame))
+                if len(pending) >= frames_in_flight:
+                    collect(path, frames, pending.popleft())
+            while pending:
+                collect(path, frames, pending.popleft())
+        finally:
+            cap.release()
+            scheduler.unregister_producer()
+
+    start_time = time.perf_counter()
+    for _ in video_paths:
+        scheduler.register_producer()
+    producers = [threading.Thread(target=produce, args=(path, frames), name=f"OfflineProducer-{i}", daemon=True)
+                 for i, (path, frames) in enumerate(zip(video_paths, results))]
+    for producer in producers:
+        producer.start()
+    for producer in producers:
+        producer.join()
+    elapsed = time.perf_counter() - start_time
+    scheduler.stop()
+
+    total_frames = sum(len(frames) for frames in results)
+    report = {
+        'videos': [{'path': str(path), 'frames': len(frames), 'detections': frames}
+                   for path, frames in zip(video_paths, results)],
+        'fps': round(total_frames / elapsed, 2) if elapsed > 0 else 0.0,
+        'scheduler': scheduler.get_stats()
+    }
+
+    output_path = output_path or os.path.join(LOGS_DIR, f"offline_detections_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False)
+    logger.info(f"离线处理完成: {len(video_paths)} 个视频, {total_frames} 帧, {report['fps']} 帧/秒, "
+                f"平均批大小 {report['scheduler']['avg_batch_size']:.2f}，结果: {output_path}")
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="离线批量检测多个视频文件")
+    parser.add_argument('videos', nargs='*', help="视频文件路径，默认使用 DetectionConfig.VIDEO_SOURCES 或 VIDEO_PATH")
+    parser.add_argument('--output', default=None, help="检测结果路径")
+    parser.add_argument('--batch-size', type=int, default=None, help="最大批大小，默认使用 OFFLINE_BATCH_SIZE")
+    args = parser.parse_args()
+
+    from .detection_config import DetectionConfig
+    videos = args.videos or DetectionConfig.VIDEO_SOURCES or [DetectionConfig.VIDEO_PATH]
+    process_videos_offline(videos, output_path=args.output, max_batch_size=args.batch_size)
@@ -0,0 +1,80 @@
+# src/detector/cascade.py
+import numpy as np
+from .yolo_config import DetectorConfig
+
+# 升级到大模型的原因
+ESCALATE_LOW_CONFIDENCE = 'low_confidence'  # 筛选模型发现低置信度的目标类别
+ESCALATE_NEAR = 'near'  # 筛选模型发现近距离目标
+ESCALATE_REFRESH = 'refresh'  # 周期性刷新
+
+
+class CascadePolicy:
+    """
+    两级级联的升级策略
+
+    小模型（筛选模型）处理每一帧，只有在以下情况才对该帧运行大模型：
+    目标类别的置信度偏低、有目标近于阈值距离，或距上一次运行大模型已超过刷新间隔。
+    其余帧直接使用筛选模型的结果。
+    """
+
+    def __init__(self, accept_confidence=None, near_distance=None, refresh_interval=None):
+        """
+        初始化级联策略
+
+        Args:
+            accept_confidence (float, optional): 筛选模型结果可直接采用的最低置信度，默认使用 CONFIDENCE_THRESHOLD
+            near_distance (float, optional): 近距离阈值（米），有目标更近时运行大模型
+            refresh_interval (int, optional): 每隔多少帧至少运行一次大模型
+        """
+        self.accept_confidence = (DetectorConfig.CONFIDENCE_THRESHOLD
+                                  if accept_confidence is None else accept_confidence)
+        self.near_distance = DetectorConfig.CASCADE_NEAR_DISTANCE if near_distance is None else near_distance
+        self.refresh_interval = (DetectorConfig.CASCADE_REFRESH_INTERVAL
+                                 if refresh_interval is None else refresh_interval)
+        self.frames_since_escalation = 0
+
+        # 统计信息
+        self.screened_frames = 0
+        self.escalations = {ESCALATE_LOW_CONFIDENCE: 0, ESCALATE_NEAR: 0, ESCALATE_REFRESH: 0}
+
+    def should_escalate(self, confidences, distances):
+        """
+        根据筛选模型在目标类别上的检测结果决定是否运行大模型
+
+        Args:
+            confidences (numpy.ndarray): 目标类别检测的置信度
+            distances (numpy.ndarray): 目标类别检测的估算距离（米）
+
+        Returns:
+            str: 升级原因，不需要运行大模型时返回 None
+        """
+        self.screened_frames += 1
+        self.frames_since_escalation += 1
+
+        reason = None
+        if np.any(confidences < self.accept_confidence):
+            reason = ESCALATE_LOW_CONFIDENCE
+        elif np.any(distances <= self.near_distance):
+            reason = ESCALATE_NEAR
+        elif self.frames_since_escalation >= self.refresh_interval:
+            reason = ESCALATE_REFRESH
+
+        if reason is not None:
+            self.escalations[reason] += 1
+            self.frames_since_escalation = 0
+        return reason
+
+    def get_stats(self):
+        """
+        获取级联统计信息
+
+        Returns:
+            dict: 筛选帧数、大模型运行次数（按原因）和大模型跳过比例
+        """
+        escalated = sum(self.escalations.values())
+        return {
+            'screened_frames': self.screened_frames,
+            'escalated_frames': escalated,
+            'escalations': dict(self.escalations),
+            'skip_ratio': 1.0 - escalated / self.screened_frames if self.screened_frames else 0.0
+        }
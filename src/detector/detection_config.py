@@ -10,6 +10,25 @@ class DetectionConfig:
 
     # 性能优化
     PROCESS_EVERY_N_FRAMES = 2  # 每处理2帧中的1帧
+    GRAB_SKIPPED_FRAMES = True  # 捕获线程对不处理的帧只grab不解码
+    FRAME_WAIT_TIMEOUT = 1.0  # 主循环等待新帧的超时时间（秒）
+
+    # 运动门控：场景静止时复用上一次的检测结果
+    MOTION_GATE_ENABLED = True  # 是否启用运动门控
+    MOTION_THUMB_SIZE = (64, 36)  # 计算变化分数的灰度缩略图尺寸 (宽, 高)
+    MOTION_SCORE_THRESHOLD = 6.0  # 触发推理的平均灰度差阈值（0-255）
+    MOTION_MAX_STALENESS_SECONDS = 1.0  # 复用检测结果的最长时间，超过后强制推理
+
+    # 跟踪器：只在关键帧运行检测器，关键帧之间外推轨迹
+    TRACKER_ENABLED = True  # 是否启用跟踪外推
+    TRACKER_IOU_THRESHOLD = 0.3  # 轨迹与检测关联的最小IoU
+    TRACKER_MAX_MISSES = 2  # 轨迹连续多少个关键帧未匹配后删除
+    TRACKER_VELOCITY_GAIN = 0.5  # 速度更新增益（0-1）
+    TRACKER_DISTANCE_SMOOTHING = 0.5  # 距离平滑系数，新测量值的权重（0-1）
+    KEYFRAME_MIN_INTERVAL = 2  # 最小关键帧间隔（处理帧数）
+    KEYFRAME_MAX_INTERVAL = 6  # 最大关键帧间隔（处理帧数）
+    KEYFRAME_DISAGREEMENT_HIGH = 0.5  # 偏差高于该值时缩短关键帧间隔
+    KEYFRAME_DISAGREEMENT_LOW = 0.2  # 偏差低于该值时放宽关键帧间隔
 
     # TTS相关
     TTS_THROTTLE_SECONDS = 3.0  # TTS播报节流时间
@@ -19,6 +38,7 @@ class DetectionConfig:
 
     # 视频设置
     VIDEO_PATH = "../data/test.mp4"
+    VIDEO_SOURCES = []  # 多路视频源（路径或摄像头ID），多于一路时启用多路批量检测
     WINDOW_NAME = "Visual Aids"
 
     # 对象优先级权重 (值越大优先级越高)
@@ -85,7 +85,9 @@ def format_detection_speech(detections):
                 logger.warning(f"检测结果缺少必要字段: {det}")
                 continue
 
-            descriptions.append(f"{det['class']}，{det['distance']}米")
+            # 附带 OCR 识别出的文字（如公交线路、标志牌内容）
+            name = f"{det['class']} {det['text']}" if det.get('text') else det['class']
+            descriptions.append(f"{name}，{det['distance']}米")
 
         if not descriptions:
             return ""
@@ -0,0 +1,271 @@
+# src/detector/head_slicing.py
+import ast
+import copy
+import hashlib
+import json
+from pathlib import Path
+from .artifact_cache import _is_fresh
+from .yolo_config import DetectorConfig
+from src.utils.logger import setup_logger
+
+# 配置中的类别名称与 COCO 类别名称不一致时的对应关系
+CLASS_ALIASES = {
+    'motorbike': 'motorcycle',
+}
+
+
+def resolve_target_classes(names, target_classes):
+    """
+    将目标类别名称解析为模型中的类别ID
+
+    Args:
+        names (dict): 模型的类别ID到名称的映射
+        target_classes (List[str]): 目标类别名称（可以使用 CLASS_ALIASES 中的别名）
+
+    Returns:
+        tuple: (类别ID列表, 对应的目标类别名称列表, 模型中不存在的类别名称列表)
+    """
+    name_to_id = {name: cls_id for cls_id, name in names.items()}
+    ids, kept_names, missing = [], [], []
+    for target in target_classes:
+        cls_id = name_to_id.get(target, name_to_id.get(CLASS_ALIASES.get(target)))
+        if cls_id is None:
+            missing.append(target)
+        elif cls_id not in ids:
+            ids.append(cls_id)
+            kept_names.append(target)
+    return ids, kept_names, missing
+
+
+def slice_detection_head(model, target_classes):
+    """
+    裁剪检测头的分类分支，只保留目标类别的输出（无需重新训练）
+
+    检测头每个尺度的分类分支 (cv3) 最后是一个输出 nc 个通道的 1x1 卷积，按目标类别ID
+    取出对应的卷积核和偏置即可得到只输出目标类别分数的检测头；边界框分支 (cv2) 不变。
+
+    Args:
+        model: ultralytics DetectionModel（原地修改）
+        target_classes (List[str]): 目标类别名称
+
+    Returns:
+        tuple: (新类别ID到目标类别名称的映射, 模型中不存在的目标类别名称列表)
+    """
+    import torch
+
+    ids, kept_names, missing = resolve_target_classes(model.names, target_classes)
+    if not ids:
+        raise ValueError(f"模型中不存在任何目标类别: {target_classes}")
+
+    detect = model.model[-1]
+    index = torch.tensor(ids, dtype=torch.long)
+    branches = [detect.cv3] + ([detect.one2one_cv3] if hasattr(detect, 'one2one_cv3') else [])
+    for branch in branches:
+        for level in branch:
+            conv = level[-1]
+            sliced = torch.nn.Conv2d(conv.in_channels, len(ids), conv.kernel_size, conv.stride,
+                                     conv.padding, bias=conv.bias is not None)
+            with torch.no_grad():
+                sliced.weight.copy_(conv.weight[index])
+                if conv.bias is not None:
+                    sliced.bias.copy_(conv.bias[index])
+            level[-1] = sliced.to(conv.weight.device, conv.weight.dtype)
+
+    # 更新类别数、每个锚点的输出通道数和类别名称
+    detect.nc = len(ids)
+    detect.no = detect.nc + detect.reg_max * 4
+    names = dict(enumerate(kept_names))
+    model.names = names
+    if isinstance(getattr(model, 'yaml', None), dict):
+        model.yaml['nc'] = detect.nc
+    return names, missing
+
+
+def source_class_names(config, logger=None):
+    """
+    读取原始模型的类别名称，结果缓存在 ARTIFACT_CACHE_DIR 中，原始模型更新后重新读取
+
+    优先从原始 .pt 模型读取，不存在时从原始 ONNX 模型的元数据读取。
+
+    Args:
+        config: 检测器配置
+        logger (optional): 日志记录器
+
+    Returns:
+        dict: 类别ID到名称的映射，无法读取时返回 None
+    """
+    logger = logger or setup_logger('head_slicing')
+    cache_path = Path(config.ARTIFACT_CACHE_DIR) / f"{config.MODEL_NAME}-names.json"
+    if _is_fresh(cache_path, config.MODEL_PATH):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return {int(cls_id): name for cls_id, name in json.load(f).items()}
+        except Exception as e:
+            logger.warning(f"读取类别名称缓存失败: {str(e)}")
+
+    try:
+        if Path(config.MODEL_PATH).exists():
+            from ultralytics import YOLO
+            names = dict(YOLO(config.MODEL_PATH).names)
+        elif Path(config.ONNX_MODEL_PATH).exists():
+            import onnxruntime as ort
+            session = ort.InferenceSession(str(config.ONNX_MODEL_PATH), providers=['CPUExecutionProvider'])
+            names = ast.literal_eval(session.get_modelmeta().custom_metadata_map['names'])
+        else:
+            return None
+    except Exception as e:
+        logger.warning(f"读取原始模型的类别名称失败: {str(e)}")
+        return None
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(names, f, ensure_ascii=False)
+    except Exception as e:
+        logger.warning(f"缓存类别名称失败: {str(e)}")
+    return names
+
+
+def sliced_model_name(config, names):
+    """
+    裁剪后模型的名称（用于文件名和缓存键），包含解析后类别ID的短哈希，
+    TARGET_CLASSES 变化时得到不同的名称
+
+    Args:
+        config: 检测器配置
+        names (dict): 原始模型的类别ID到名称的映射
+
+    Returns:
+        str: 裁剪后模型的名称
+    """
+    ids, _, _ = resolve_target_classes(names, config.TARGET_CLASSES)
+    digest = hashlib.sha1(",".join(str(cls_id) for cls_id in ids).encode('utf-8')).hexdigest()[:8]
+    return f"{config.MODEL_NAME}_targets-{digest}"
+
+
+def sliced_config(config, names=None, logger=None):
+    """
+    返回指向裁剪后模型文件的配置副本
+
+    Args:
+        config: 检测器配置
+        names (dict, optional): 原始模型的类别ID到名称的映射，默认通过 source_class_names() 读取
+        logger (optional): 日志记录器
+
+    Returns:
+        配置副本（MODEL_NAME、MODEL_PATH、ONNX_MODEL_PATH 和 INT8_MODEL_PATH 指向裁剪后的模型）
+    """
+    if names is None:
+        names = source_class_names(config, logger)
+        if names is None:
+            raise RuntimeError(f"无法读取原始模型的类别名称: {config.MODEL_PATH}")
+    name = sliced_model_name(config, names)
+    model_path = Path(config.MODEL_PATH)
+    sliced = copy.copy(config)
+    sliced.MODEL_NAME = name
+    sliced.MODEL_PATH = model_path.with_name(f"{name}.pt")
+    sliced.ONNX_MODEL_PATH = model_path.with_name(f"{name}.onnx")
+    sliced.INT8_MODEL_PATH = model_path.with_name(f"{name}_int8.onnx")
+    return sliced
+
+
+def build_sliced_model(config=None, logger=None):
+    """
+    从原始 .pt 模型构建只输出目标类别的模型并保存
+
+    Args:
+        config (optional): 检测器配置
+        logger (optional): 日志记录器
+
+    Returns:
+        Path: 裁剪后的 .pt 模型路径
+    """
+    from ultralytics import YOLO
+
+    config = config or DetectorConfig()
+    logger = logger or setup_logger('head_slicing')
+
+    model = YOLO(config.MODEL_PATH)
+    original_nc = len(model.model.names)
+    output_path = sliced_config(config, dict(model.model.names)).MODEL_PATH
+    names, missing = slice_detection_head(model.model, config.TARGET_CLASSES)
+    if missing:
+        logger.warning(f"模型中不存在以下目标类别，已忽略: {missing}")
+    model.save(output_path)
+    logger.info(f"检测头已从 {original_nc} 类裁剪为 {len(names)} 类: {list(names.values())}，保存到 {output_path}")
+    return output_path
+
+
+def sliced_names_match(names, config, logger=None):
+    """
+    检查加载后的裁剪模型的类别名称是否与当前 TARGET_CLASSES 一致
+
+    Args:
+        names (dict): 加载后的模型的类别ID到名称的映射
+        config: 检测器配置（原始模型）
+        logger (optional): 日志记录器
+
+    Returns:
+        bool: 是否一致
+    """
+    source_names = source_class_names(config, logger)
+    if source_names is None:
+        return False
+    _, kept_names, _ = resolve_target_classes(source_names, config.TARGET_CLASSES)
+    return dict(names) == dict(enumerate(kept_names))
+
+
+def prepare_sliced_config(config, logger):
+    """
+    在启用 USE_SLICED_HEAD 时返回指向裁剪后模型的配置，必要时自动构建 .pt 模型
+
+    onnxruntime 后端需要事先导出裁剪后的 ONNX 模型（python -m src.detector.head_slicing --export），
+    裁剪后的模型不存在、早于原始 .pt 模型或不可用时退回原始模型（.pt 模型会自动重新构建）。
+
+    Args:
+        config: 检测器配置
+        logger: 日志记录器
+
+    Returns:
+        检测器配置（裁剪后模型或原始模型）
+    """
+    names = source_class_names(config, logger)
+    if names is None:
+        logger.warning(f"无法读取原始模型的类别名称，使用原始模型: {config.MODEL_PATH}")
+        return config
+    sliced = sliced_config(config, names)
+    uses_onnx = config.BACKEND == "onnxruntime" or config.PRECISION == "int8"
+    if uses_onnx:
+        model_path = sliced.INT8_MODEL_PATH if config.PRECISION == "int8" else sliced.ONNX_MODEL_PATH
+        if _is_fresh(model_path, config.MODEL_PATH):
+            return sliced
+        if Path(model_path).exists():
+            logger.warning(f"裁剪检测头的 ONNX 模型早于原始模型: {model_path}，请重新导出，使用原始模型")
+        else:
+            logger.warning(f"裁剪检测头的 ONNX 模型不存在: {model_path}，使用原始模型")
+        return config
+
+    if _is_fresh(sliced.MODEL_PATH, config.MODEL_PATH):
+        return sliced
+    if not Path(config.MODEL_PATH).exists():
+        logger.warning(f"原始模型不存在，无法裁剪检测头: {config.MODEL_PATH}")
+        return config
+    try:
+        build_sliced_model(config, logger)
+        return sliced
+    except Exception as e:
+        logger.warning(f"裁剪检测头失败，使用原始模型: {str(e)}")
+        return config
+
+
+if __name__ == "__main__":
+    import argparse
+    from .onnx_backend import export_onnx
+
+    parser = argparse.ArgumentParser(description="裁剪检测头，只保留 TARGET_CLASSES")
+    parser.add_argument('--export', action='store_true', help="同时导出裁剪后的 ONNX 模型")
+    args = parser.parse_args()
+
+    sliced_path = build_sliced_model()
+    if args.export:
+        export_onnx(sliced_path, sliced_config(DetectorConfig()).ONNX_MODEL_PATH)
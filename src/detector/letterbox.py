@@ -0,0 +1,213 @@
+# src/detector/letterbox.py
+import math
+import cv2
+import numpy as np
+from .backends import RawDetections, empty_raw_detections
+
+# 与 ultralytics 一致的填充灰度值
+PAD_VALUE = 114
+
+
+def letterbox(frame, new_shape, color=(114, 114, 114)):
+    """
+    等比缩放并填充到目标尺寸（与 ultralytics 的 LetterBox 一致）
+
+    Args:
+        frame (numpy.ndarray): 输入图像 (BGR)
+        new_shape (tuple): 目标尺寸 (高, 宽)
+        color (tuple): 填充颜色
+
+    Returns:
+        tuple: (填充后的图像, 缩放比例, (左侧填充, 顶部填充))
+    """
+    height, width = frame.shape[:2]
+    ratio = min(new_shape[0] / height, new_shape[1] / width)
+    new_w, new_h = int(round(width * ratio)), int(round(height * ratio))
+    pad_w, pad_h = (new_shape[1] - new_w) / 2, (new_shape[0] - new_h) / 2
+
+    if (width, height) != (new_w, new_h):
+        frame = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    top, bottom = int(round(pad_h - 0.1)), int(round(pad_h + 0.1))
+    left, right = int(round(pad_w - 0.1)), int(round(pad_w + 0.1))
+    padded = cv2.copyMakeBorder(frame, top, bottom, left, right, cv2.BORDER_CONSTANT, value=color)
+    return padded, ratio, (left, top)
+
+
+def preprocess_batch(frames, input_shape):
+    """
+    等比缩放填充、BGR转RGB、归一化并组成 NCHW 批次
+
+    Args:
+        frames (List[numpy.ndarray]): 输入图像帧列表 (BGR格式)
+        input_shape (tuple): 模型输入尺寸 (高, 宽)
+
+    Returns:
+        tuple: (float32 输入批次, 每帧的 (缩放比例, 填充, 原图尺寸))
+    """
+    batch = np.empty((len(frames), 3) + tuple(input_shape), dtype=np.float32)
+    transforms = []
+    for i, frame in enumerate(frames):
+        padded, ratio, pad = letterbox(frame, input_shape)
+        # HWC(BGR) -> CHW(RGB)，并缩放到 [0, 1]
+        np.multiply(padded[..., ::-1].transpose(2, 0, 1), 1.0 / 255.0, out=batch[i], casting='unsafe')
+        transforms.append((ratio, pad, frame.shape[:2]))
+    return batch, transforms
+
+
+def nms(boxes, scores, iou_threshold):
+    """
+    纯 NumPy 实现的非极大值抑制
+
+    Args:
+        boxes (numpy.ndarray): (N, 4) 的 xyxy 边界框
+        scores (numpy.ndarray): (N,) 置信度
+        iou_threshold (float): IoU 阈值
+
+    Returns:
+        numpy.ndarray: 保留的索引（按置信度降序）
+    """
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1).clip(0) * (y2 - y1).clip(0)
+    order = scores.argsort()[::-1]
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+        if order.size == 1:
+            break
+        rest = order[1:]
+        inter_w = (np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest])).clip(0)
+        inter_h = (np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest])).clip(0)
+        inter = inter_w * inter_h
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-7)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def decode_predictions(output, transform, conf_threshold, iou_threshold, max_det=300):
+    """
+    解析单帧的 YOLO 输出 (4+nc, N)：置信度过滤、NMS，并批量还原等比缩放和填充得到原图坐标
+
+    Args:
+        output (numpy.ndarray): 单帧输出，前4行为输入图像上的 cx, cy, w, h，其余为各类别分数
+        transform (tuple): (缩放比例, (左侧填充, 顶部填充), (原图高, 原图宽))
+        conf_threshold (float): 置信度阈值
+        iou_threshold (float): NMS 的 IoU 阈值
+        max_det (int): NMS 后最多保留的检测数
+
+    Returns:
+        RawDetections: 原图坐标下的检测结果
+    """
+    predictions = output.T  # (N, 4+nc)
+    class_scores = predictions[:, 4:]
+    cls = class_scores.argmax(axis=1)
+    conf = class_scores[np.arange(len(cls)), cls]
+    mask = conf >= conf_threshold
+    if not mask.any():
+        return empty_raw_detections()
+
+    boxes_cxcywh, conf, cls = predictions[mask, :4], conf[mask], cls[mask]
+    boxes = np.empty_like(boxes_cxcywh)
+    boxes[:, 0] = boxes_cxcywh[:, 0] - boxes_cxcywh[:, 2] / 2
+    boxes[:, 1] = boxes_cxcywh[:, 1] - boxes_cxcywh[:, 3] / 2
+    boxes[:, 2] = boxes_cxcywh[:, 0] + boxes_cxcywh[:, 2] / 2
+    boxes[:, 3] = boxes_cxcywh[:, 1] + boxes_cxcywh[:, 3] / 2
+
+    # 按类别偏移后统一做一次NMS，等价于逐类别NMS
+    offsets = cls[:, None].astype(np.float32) * 7680.0
+    keep = nms(boxes + offsets, conf, iou_threshold)[:max_det]
+    boxes, conf, cls = boxes[keep], conf[keep], cls[keep]
+
+    # 还原等比缩放和填充
+    ratio, (pad_x, pad_y), (height, width) = transform
+    boxes[:, [0, 2]] = ((boxes[:, [0, 2]] - pad_x) / ratio).clip(0, width)
+    boxes[:, [1, 3]] = ((boxes[:, [1, 3]] - pad_y) / ratio).clip(0, height)
+    return RawDetections(boxes.astype(np.float32, copy=False), conf.astype(np.float32, copy=False),
+                         cls.astype(np.int64))
+
+
+class LetterboxBuffer:
+    """
+    预分配的等比缩放填充缓冲区
+
+    帧直接用 cv2.resize(dst=...) 缩放到复用的 uint8 画布中，再一次性完成 BGR转RGB、HWC转CHW
+    和归一化写入复用的 float32 批次缓冲区，除首次或尺寸变化外每帧不分配新数组。
+    批次缓冲区可以由调用方提供（例如 torch 的锁页内存），以便直接构造张量。
+    """
+
+    def __init__(self, allocator=None):
+        """
+        Args:
+            allocator (callable, optional): allocator(shape) -> float32 numpy 数组，用于分配批次缓冲区，
+                默认使用 numpy.empty
+        """
+        self.allocator = allocator or (lambda shape: np.empty(shape, dtype=np.float32))
+        self._canvas = None  # (H, W, 3) uint8 画布
+        self._batch = None  # (B, 3, H, W) float32 批次缓冲区
+
+    @staticmethod
+    def target_shape(frames, input_shape, stride=None):
+        """
+        计算批次的输入尺寸
+
+        Args:
+            frames (List[numpy.ndarray]): 输入图像帧列表
+            input_shape (tuple): 最大输入尺寸 (高, 宽)
+            stride (int, optional): 提供时按最小填充原则把输入尺寸收缩到能容纳所有帧的 stride 整数倍
+                （与 ultralytics 的矩形推理一致），否则固定使用 input_shape
+
+        Returns:
+            tuple: 输入尺寸 (高, 宽)
+        """
+        if stride is None:
+            return tuple(input_shape)
+        height, width = 0, 0
+        for frame in frames:
+            frame_h, frame_w = frame.shape[:2]
+            ratio = min(input_shape[0] / frame_h, input_shape[1] / frame_w)
+            height = max(height, int(round(frame_h * ratio)))
+            width = max(width, int(round(frame_w * ratio)))
+        return (min(input_shape[0], math.ceil(height / stride) * stride),
+                min(input_shape[1], math.ceil(width / stride) * stride))
+
+    def prepare(self, frames, input_shape, stride=None):
+        """
+        将一批帧写入复用的输入缓冲区
+
+        Args:
+            frames (List[numpy.ndarray]): 输入图像帧列表 (BGR格式)
+            input_shape (tuple): 最大输入尺寸 (高, 宽)
+            stride (int, optional): 模型步长，提供时使用最小填充的矩形输入
+
+        Returns:
+            tuple: (float32 NCHW 批次（复用缓冲区的视图）, 每帧的 (缩放比例, 填充, 原图尺寸))
+        """
+        shape_h, shape_w = self.target_shape(frames, input_shape, stride)
+        if self._canvas is None or self._canvas.shape[:2] != (shape_h, shape_w):
+            self._canvas = np.empty((shape_h, shape_w, 3), dtype=np.uint8)
+        if (self._batch is None or self._batch.shape[2:] != (shape_h, shape_w)
+                or self._batch.shape[0] < len(frames)):
+            self._batch = self.allocator((len(frames), 3, shape_h, shape_w))
+
+        batch = self._batch[:len(frames)]
+        transforms = []
+        for i, frame in enumerate(frames):
+            height, width = frame.shape[:2]
+            ratio = min(shape_h / height, shape_w / width)
+            new_w, new_h = int(round(width * ratio)), int(round(height * ratio))
+            left = int(round((shape_w - new_w) / 2 - 0.1))
+            top = int(round((shape_h - new_h) / 2 - 0.1))
+
+            # 填充区域写入灰色，图像区域直接缩放到画布内
+            self._canvas.fill(PAD_VALUE)
+            region = self._canvas[top:top + new_h, left:left + new_w]
+            if (width, height) == (new_w, new_h):
+                np.copyto(region, frame)
+            else:
+                cv2.resize(frame, (new_w, new_h), dst=region, interpolation=cv2.INTER_LINEAR)
+
+            # BGR转RGB、HWC转CHW并归一化到 [0, 1]，逐通道写入批次缓冲区
+            for channel in range(3):
+                np.multiply(self._canvas[..., 2 - channel], 1.0 / 255.0, out=batch[i, channel], casting='unsafe')
+            transforms.append((ratio, (left, top), (height, width)))
+        return batch, transforms
@@ -0,0 +1,120 @@
+# src/detector/motion_gate.py
+import time
+import cv2
+import numpy as np
+from .detection_config import DetectionConfig
+
+
+class MotionGate:
+    """
+    运动/场景变化门控
+
+    将帧缩小为灰度缩略图，与上一次推理时的缩略图做差得到变化分数。
+    场景静止时复用上一次的检测结果，变化分数超过阈值或结果过旧时才执行推理。
+    """
+
+    def __init__(self, thumb_size=None, score_threshold=None, max_staleness=None):
+        """
+        初始化运动门控
+
+        Args:
+            thumb_size (tuple, optional): 缩略图尺寸 (宽, 高)，默认使用配置中的值
+            score_threshold (float, optional): 触发推理的变化分数阈值（平均灰度差）
+            max_staleness (float, optional): 复用检测结果的最长时间（秒），超过后强制推理
+        """
+        self.thumb_size = tuple(thumb_size or DetectionConfig.MOTION_THUMB_SIZE)
+        self.score_threshold = (DetectionConfig.MOTION_SCORE_THRESHOLD
+                                if score_threshold is None else score_threshold)
+        self.max_staleness = (DetectionConfig.MOTION_MAX_STALENESS_SECONDS
+                              if max_staleness is None else max_staleness)
+
+        width, height = self.thumb_size
+        self._small = None  # 缩小后的彩色帧缓冲区，按通道数延迟分配
+        self._thumb = np.zeros((height, width), dtype=np.uint8)  # 当前帧缩略图
+        self._reference = np.zeros((height, width), dtype=np.uint8)  # 上一次推理时的缩略图
+        self._has_reference = False
+        self.last_infer_time = 0.0
+        self.last_score = 0.0
+
+        # 统计信息
+        self.inferred_frames = 0
+        self.reused_frames = 0
+
+    def _update_thumbnail(self, frame):
+        """将帧缩小为灰度缩略图，写入复用的缓冲区"""
+        width, height = self.thumb_size
+        if frame.ndim == 2:
+            cv2.resize(frame, (width, height), dst=self._thumb, interpolation=cv2.INTER_AREA)
+            return
+        if self._small is None or self._small.shape[2] != frame.shape[2]:
+            self._small = np.empty((height, width, frame.shape[2]), dtype=np.uint8)
+        cv2.resize(frame, (width, height), dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._thumb)
+
+    def change_score(self, frame):
+        """
+        计算当前帧相对上一次推理帧的变化分数
+
+        Args:
+            frame (numpy.ndarray): 输入帧（BGR或灰度）
+
+        Returns:
+            float: 平均每像素灰度差（0-255），尚无参考帧时返回无穷大
+        """
+        self._update_thumbnail(frame)
+        if not self._has_reference:
+            return float('inf')
+        return cv2.norm(self._thumb, self._reference, cv2.NORM_L1) / self._thumb.size
+
+    def should_infer(self, frame, now=None):
+        """
+        判断当前帧是否需要执行推理
+
+        返回True时调用方应执行推理并调用 mark_inferred()。
+
+        Args:
+            frame (numpy.ndarray): 输入帧
+            now (float, optional): 当前时间戳，默认使用 time.time()
+
+        Returns:
+            bool: 是否需要执行推理
+        """
+        now = time.time() if now is None else now
+        self.last_score = self.change_score(frame)
+        stale = now - self.last_infer_time >= self.max_staleness
+        if stale or self.last_score >= self.score_threshold:
+            return True
+        self.reused_frames += 1
+        return False
+
+    def mark_inferred(self, now=None):
+        """
+        记录当前帧已执行推理，将其缩略图作为新的参考
+
+        Args:
+            now (float, optional): 推理完成的时间戳，默认使用 time.time()
+        """
+        np.copyto(self._reference, self._thumb)
+        self._has_reference = True
+        self.last_infer_time = time.time() if now is None else now
+        self.inferred_frames += 1
+
+    def reset(self):
+        """清除参考帧，下一帧必定触发推理"""
+        self._has_reference = False
+        self.last_infer_time = 0.0
+
+    def get_stats(self):
+        """
+        获取门控统计信息
+
+        Returns:
+            dict: 推理帧数、复用帧数、复用比例和最近一次变化分数
+        """
+        total = self.inferred_frames + self.reused_frames
+        return {
+            'inferred_frames': self.inferred_frames,
+            'reused_frames': self.reused_frames,
+            'reuse_ratio': self.reused_frames / total if total else 0.0,
+            'last_score': self.last_score
+        }
\ No newline at end of file
@@ -0,0 +1,149 @@
+# src/detector/onnx_backend.py
+import ast
+import shutil
+from pathlib import Path
+import numpy as np
+from .letterbox import LetterboxBuffer, decode_predictions
+from .artifact_cache import optimized_onnx_path
+from .yolo_config import DetectorConfig
+from src.utils.logger import setup_logger
+
+
+class OnnxRuntimeBackend:
+    """onnxruntime CPU 推理后端，前后处理（含NMS）只依赖 NumPy 和 OpenCV"""
+
+    def __init__(self, config, logger, model_path=None):
+        """
+        创建 onnxruntime 推理会话
+
+        Args:
+            config: 检测器配置
+            logger: 日志记录器
+            model_path (optional): ONNX 模型路径，默认使用 config.ONNX_MODEL_PATH
+        """
+        import onnxruntime as ort
+
+        self.config = config
+        self.logger = logger
+        self.model_path = Path(model_path or config.ONNX_MODEL_PATH)
+        if not self.model_path.exists():
+            raise RuntimeError(
+                f"ONNX 模型不存在: {self.model_path}，请先运行 python -m src.detector.onnx_backend --export"
+            )
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = config.ORT_INTRA_OP_THREADS
+        options.inter_op_num_threads = config.ORT_INTER_OP_THREADS
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+
+        # 图优化结果缓存到本地：命中时直接加载优化后的模型并跳过优化，否则优化后写入缓存
+        # （ENABLE_ALL 的优化结果与硬件相关，缓存只在本机使用）
+        load_path = self.model_path
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if config.USE_ARTIFACT_CACHE:
+            cache_path, cached = optimized_onnx_path(self.model_path, config)
+            if cached:
+                load_path = cache_path
+                options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+                self.logger.info(f"从缓存加载优化后的 ONNX 模型: {cache_path}")
+            else:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                options.optimized_model_filepath = str(cache_path)
+        self.session = ort.InferenceSession(str(load_path), sess_options=options,
+                                            providers=['CPUExecutionProvider'])
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # 静态输入尺寸以模型为准，动态尺寸使用配置中的输入尺寸
+        height, width = model_input.shape[2], model_input.shape[3]
+        self.dynamic_shape = not (isinstance(height, int) and isinstance(width, int))
+        self.input_shape = (
+            height if isinstance(height, int) else config.INPUT_HEIGHT,
+            width if isinstance(width, int) else config.INPUT_WIDTH
+        )
+        self.dynamic_batch = not isinstance(model_input.shape[0], int)
+
+        # ultralytics 导出时将类别名称写入模型元数据
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        self.names = ast.literal_eval(metadata['names']) if 'names' in metadata else {}
+        self.stride = int(metadata.get('stride', 32))
+        # 复用的输入缓冲区，避免每次推理分配新数组
+        self.letterbox = LetterboxBuffer()
+        self.logger.info(
+            f"成功加载 ONNX 模型: {self.model_path}, 输入尺寸 {self.input_shape}, "
+            f"线程数 intra={config.ORT_INTRA_OP_THREADS} inter={config.ORT_INTER_OP_THREADS}"
+        )
+
+    def infer(self, frames, imgsz=None):
+        """
+        批量推理
+
+        Args:
+            frames (List[numpy.ndarray]): 输入图像帧列表 (BGR格式)
+            imgsz (int or tuple, optional): 模型输入尺寸，仅对动态输入尺寸的模型生效
+
+        Returns:
+            List[RawDetections]: 与输入帧一一对应的原始检测结果
+        """
+        input_shape = self.input_shape
+        if imgsz is not None and self.dynamic_shape:
+            input_shape = (imgsz, imgsz) if isinstance(imgsz, int) else tuple(imgsz)
+        # 动态输入尺寸的模型使用最小填充的矩形输入
+        batch, transforms = self.letterbox.prepare(frames, input_shape,
+                                                   stride=self.stride if self.dynamic_shape else None)
+        if self.dynamic_batch:
+            outputs = self.session.run(None, {self.input_name: batch})[0]
+        else:
+            # 静态批大小的模型逐帧推理
+            outputs = np.concatenate(
+                [self.session.run(None, {self.input_name: batch[i:i + 1]})[0] for i in range(len(frames))]
+            )
+        return [
+            decode_predictions(outputs[i], transforms[i], self.config.CONFIDENCE_THRESHOLD,
+                               self.config.NMS_IOU_THRESHOLD)
+            for i in range(len(frames))
+        ]
+
+
+def export_onnx(model_path=None, output_path=None, imgsz=None):
+    """
+    将 ultralytics .pt 模型一次性导出为 ONNX（动态批大小和输入尺寸），只需在有 torch 的环境执行一次
+
+    Args:
+        model_path (optional): .pt 模型路径，默认使用 DetectorConfig.MODEL_PATH
+        output_path (optional): 输出 ONNX 路径，默认使用 DetectorConfig.ONNX_MODEL_PATH
+        imgsz (int, optional): 导出时的输入尺寸，默认使用 DetectorConfig.INPUT_WIDTH
+
+    Returns:
+        Path: 导出的 ONNX 模型路径
+    """
+    from ultralytics import YOLO
+
+    logger = setup_logger('onnx_export')
+    model_path = Path(model_path or DetectorConfig.MODEL_PATH)
+    output_path = Path(output_path or DetectorConfig.ONNX_MODEL_PATH)
+    imgsz = imgsz or DetectorConfig.INPUT_WIDTH
+
+    logger.info(f"正在导出 ONNX 模型: {model_path} -> {output_path}")
+    exported = Path(YOLO(model_path).export(format="onnx", imgsz=imgsz, dynamic=True, simplify=True))
+    if exported.resolve() != output_path.resolve():
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(exported), str(output_path))
+    logger.info(f"ONNX 模型导出完成: {output_path}")
+    return output_path
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="导出 ONNX 检测模型")
+    parser.add_argument('--export', action='store_true', help="将 .pt 模型导出为 ONNX")
+    parser.add_argument('--model', default=None, help=".pt 模型路径")
+    parser.add_argument('--output', default=None, help="输出 ONNX 路径")
+    parser.add_argument('--imgsz', type=int, default=None, help="导出输入尺寸")
+    args = parser.parse_args()
+
+    if args.export:
+        export_onnx(args.model, args.output, args.imgsz)
+    else:
+        parser.print_help()
@@ -0,0 +1,369 @@
+# src/detector/quantization.py
+import copy
+import json
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import cv2
+import numpy as np
+from .letterbox import preprocess_batch
+from .yolo_config import DetectorConfig
+from .detection_config import DetectionConfig
+from src.config import LOGS_DIR
+from src.utils.logger import setup_logger
+
+logger = setup_logger('quantization')
+
+
+def sample_video_frames(video_path, num_frames, phase=0.0):
+    """
+    从视频中均匀抽取若干帧
+
+    Args:
+        video_path: 视频文件路径
+        num_frames (int): 抽取的帧数
+        phase (float): 抽样相位（0-1，按抽样间隔的比例偏移），用于让校准帧和评估帧错开
+
+    Returns:
+        List[numpy.ndarray]: 抽取的帧 (BGR格式)
+    """
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise RuntimeError(f"无法打开视频: {video_path}")
+
+    try:
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if total <= 0:
+            raise RuntimeError(f"无法获取视频帧数: {video_path}")
+        step = total / num_frames
+        wanted = {min(total - 1, int(i * step + phase * step)) for i in range(num_frames)}
+
+        # 顺序 grab 比按帧号 seek 更可靠，只解码需要的帧
+        frames = []
+        for index in range(max(wanted) + 1):
+            if not cap.grab():
+                break
+            if index in wanted:
+                ret, frame = cap.retrieve()
+                if ret:
+                    frames.append(frame)
+        logger.info(f"从 {video_path} 抽取了 {len(frames)} 帧（共 {total} 帧）")
+        return frames
+    finally:
+        cap.release()
+
+
+def _input_shape(model_path, config):
+    """读取 ONNX 模型的输入尺寸，动态尺寸使用配置中的输入尺寸"""
+    import onnx
+
+    dims = onnx.load(str(model_path), load_external_data=False).graph.input[0].type.tensor_type.shape.dim
+    height, width = dims[2].dim_value, dims[3].dim_value
+    return height or config.INPUT_HEIGHT, width or config.INPUT_WIDTH
+
+
+def _head_decode_nodes(model_path):
+    """
+    找出检测头中的解码节点（DFL、框解码、拼接、Sigmoid），这些节点保持 FP32。
+
+    检测头的分支卷积 (cv2/cv3) 照常量化，只有把坐标和类别分数拼到同一个张量里的
+    后处理部分不量化，否则坐标（0-640）和分数（0-1）共用一个量化尺度会严重损失分数精度。
+    """
+    import onnx
+
+    nodes = onnx.load(str(model_path), load_external_data=False).graph.node
+    # ultralytics 导出的节点名形如 /model.23/cv3.0/...，最后一个模块即检测头
+    head = max(
+        (n.name.split('/')[1] for n in nodes if n.name.startswith('/model.')),
+        key=lambda name: int(name.split('.')[1]),
+        default=None
+    )
+    if head is None:
+        return []
+    prefix = f"/{head}/"
+    return [
+        n.name for n in nodes
+        if n.name.startswith(prefix) and not n.name.startswith((prefix + 'cv2', prefix + 'cv3'))
+    ]
+
+
+class VideoCalibrationReader:
+    """onnxruntime 静态量化的校准数据读取器（实现 CalibrationDataReader 接口），每次提供一帧预处理后的输入"""
+
+    def __init__(self, frames, input_name, input_shape):
+        """
+        Args:
+            frames (List[numpy.ndarray]): 校准帧 (BGR格式)
+            input_name (str): 模型输入名称
+            input_shape (tuple): 模型输入尺寸 (高, 宽)
+        """
+        self.frames = frames
+        self.input_name = input_name
+        self.input_shape = input_shape
+        self.index = 0
+
+    def get_next(self):
+        """返回下一帧的输入字典，没有更多数据时返回 None"""
+        if self.index >= len(self.frames):
+            return None
+        batch, _ = preprocess_batch(self.frames[self.index:self.index + 1], self.input_shape)
+        self.index += 1
+        return {self.input_name: batch}
+
+    def rewind(self):
+        """重置到第一帧"""
+        self.index = 0
+
+
+def quantize_model(video_path=None, fp32_path=None, int8_path=None, num_frames=None, config=None):
+    """
+    使用视频中抽取的帧做静态 INT8 量化 (QDQ格式, 权重逐通道 INT8, 激活 UINT8)
+
+    Args:
+        video_path (optional): 校准视频路径，默认使用 DetectionConfig.VIDEO_PATH
+        fp32_path (optional): FP32 ONNX 模型路径，默认使用 config.ONNX_MODEL_PATH
+        int8_path (optional): 输出的 INT8 模型路径，默认使用 config.INT8_MODEL_PATH
+        num_frames (int, optional): 校准帧数，默认使用 config.CALIBRATION_FRAMES
+        config (optional): 检测器配置
+
+    Returns:
+        Path: INT8 模型路径
+    """
+    import onnx
+    from onnxruntime.quantization import CalibrationMethod, QuantFormat, QuantType, quantize_static
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    config = config or DetectorConfig()
+    video_path = video_path or DetectionConfig.VIDEO_PATH
+    fp32_path = Path(fp32_path or config.ONNX_MODEL_PATH)
+    int8_path = Path(int8_path or config.INT8_MODEL_PATH)
+    num_frames = num_frames or config.CALIBRATION_FRAMES
+    if not fp32_path.exists():
+        raise RuntimeError(f"FP32 ONNX 模型不存在: {fp32_path}，请先运行 python -m src.detector.onnx_backend --export")
+
+    frames = sample_video_frames(video_path, num_frames)
+    if not frames:
+        raise RuntimeError(f"未能从 {video_path} 读取校准帧")
+
+    # 量化前先做形状推断和图优化，量化效果更稳定（动态输入尺寸的模型跳过符号形状推断）
+    prepared_path = int8_path.with_name(int8_path.stem + "_prep.onnx")
+    int8_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        quant_pre_process(str(fp32_path), str(prepared_path), skip_symbolic_shape=True)
+    except Exception as e:
+        logger.warning(f"量化预处理失败，直接量化原模型: {str(e)}")
+        shutil.copyfile(fp32_path, prepared_path)
+
+    try:
+        input_name = onnx.load(str(prepared_path), load_external_data=False).graph.input[0].name
+        reader = VideoCalibrationReader(frames, input_name, _input_shape(prepared_path, config))
+
+        excluded = _head_decode_nodes(prepared_path)
+        logger.info(f"开始 INT8 量化: {fp32_path} -> {int8_path}, 校准帧 {len(frames)}, 保持FP32的节点 {len(excluded)}")
+        start_time = time.time()
+        quantize_static(
+            str(prepared_path), str(int8_path), reader,
+            quant_format=QuantFormat.QDQ,
+            per_channel=True,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            calibrate_method=CalibrationMethod.MinMax,
+            nodes_to_exclude=excluded
+        )
+        logger.info(f"INT8 量化完成，耗时 {time.time() - start_time:.1f} 秒: {int8_path}")
+    finally:
+        prepared_path.unlink(missing_ok=True)
+    return int8_path
+
+
+def _rss_bytes():
+    """当前进程常驻内存（字节），没有 psutil 时返回 None"""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process(os.getpid()).memory_info().rss
+
+
+def _iou(box, boxes):
+    """一个框与多个框的 IoU"""
+    x1 = np.maximum(box[0], boxes[:, 0])
+    y1 = np.maximum(box[1], boxes[:, 1])
+    x2 = np.minimum(box[2], boxes[:, 2])
+    y2 = np.minimum(box[3], boxes[:, 3])
+    inter = (x2 - x1).clip(0) * (y2 - y1).clip(0)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return inter / (area + areas - inter + 1e-7)
+
+
+def _match(reference, candidates, iou_threshold):
+    """
+    按置信度贪心匹配同类别的检测框
+
+    Returns:
+        tuple: (每个参考检测是否被匹配的列表, 未匹配的候选检测数)
+    """
+    matched = [False] * len(reference)
+    used = np.zeros(len(candidates), dtype=bool)
+    boxes = np.array([det['bbox'] for det in candidates], dtype=np.float32).reshape(-1, 4)
+    classes = np.array([det['class'] for det in candidates])
+    for i, det in enumerate(reference):
+        if not len(boxes):
+            break
+        ious = _iou(np.asarray(det['bbox'], dtype=np.float32), boxes)
+        ious[(classes != det['class']) | used] = 0.0
+        best = int(ious.argmax())
+        if ious[best] >= iou_threshold:
+            matched[i] = True
+            used[best] = True
+    return matched, int((~used).sum())
+
+
+def _benchmark_precision(config, video_path, num_frames):
+    """
+    在独立进程中加载一种精度的检测器并逐帧检测，避免两个模型的内存相互影响
+
+    Returns:
+        tuple: (每帧检测结果, 每帧耗时毫秒, 检测器内存占用字节或None)
+    """
+    from .yolo import ObjectDetector
+
+    # 与校准帧错开半个抽样间隔
+    frames = sample_video_frames(video_path, num_frames, phase=0.5)
+    if not frames:
+        raise RuntimeError(f"未能从 {video_path} 读取评估帧")
+
+    rss_before = _rss_bytes()
+    detector = ObjectDetector(config)
+    detector.detect(frames[0])  # 预热，不计入统计
+    results, latencies = [], []
+    for frame in frames:
+        start_time = time.perf_counter()
+        results.append(detector.detect(frame))
+        latencies.append((time.perf_counter() - start_time) * 1000.0)
+    # onnxruntime 在首次推理时才分配内存池，推理结束后再统计内存占用
+    rss_after = _rss_bytes()
+    return results, latencies, rss_after - rss_before if rss_before is not None else None
+
+
+def _latency_stats(latencies):
+    """延迟统计（毫秒）"""
+    values = np.asarray(latencies)
+    return {
+        'mean_ms': round(float(values.mean()), 2),
+        'p50_ms': round(float(np.percentile(values, 50)), 2),
+        'p95_ms': round(float(np.percentile(values, 95)), 2),
+        'fps': round(1000.0 / float(values.mean()), 2)
+    }
+
+
+def compare_precisions(video_path=None, num_frames=None, iou_threshold=0.5, config=None, output_path=None):
+    """
+    在同一组视频帧上对比 FP32 与 INT8 模型，并把报告写入 logs 目录。
+
+    没有人工标注，以 FP32 的检测结果为参考，统计 INT8 在 TARGET_CLASSES 上的逐类别召回率，
+    以及距离不超过 NEAR_RANGE_DISTANCE 的近距离目标（决定语音播报的目标）的召回率。
+
+    Args:
+        video_path (optional): 评估视频路径，默认使用 DetectionConfig.VIDEO_PATH
+        num_frames (int, optional): 评估帧数，默认使用 config.REPORT_FRAMES
+        iou_threshold (float): 判定匹配的 IoU 阈值
+        config (optional): 检测器配置
+        output_path (optional): 报告路径，默认写入 logs/precision_report_<时间>.json
+
+    Returns:
+        dict: 对比报告
+    """
+    config = config or DetectorConfig()
+    video_path = video_path or DetectionConfig.VIDEO_PATH
+    num_frames = num_frames or config.REPORT_FRAMES
+
+    report = {
+        'video': str(video_path),
+        'iou_threshold': iou_threshold,
+        'near_range_distance': config.NEAR_RANGE_DISTANCE
+    }
+    results = {}
+    for precision, model_path in (('fp32', config.ONNX_MODEL_PATH), ('int8', config.INT8_MODEL_PATH)):
+        # 两种精度都用 onnxruntime 运行，只比较量化本身的影响
+        precision_config = copy.copy(config)
+        precision_config.BACKEND = "onnxruntime"
+        precision_config.PRECISION = precision
+        precision_config.ADAPTIVE_RESOLUTION = False  # 固定输入尺寸，保证两种精度的延迟可比
+        precision_config.CASCADE_ENABLED = False  # 只比较单个模型
+        precision_config.USE_PERF_PROFILE = False
+        precision_config.USE_SLICED_HEAD = False  # 使用 config 中的模型路径（裁剪检测头的模型用 --sliced 指定）
+
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+            results[precision], latencies, memory = executor.submit(
+                _benchmark_precision, precision_config, video_path, num_frames
+            ).result()
+
+        report['frames'] = len(latencies)
+        report[precision] = {
+            'model': str(model_path),
+            'model_size_mb': round(Path(model_path).stat().st_size / 2 ** 20, 2),
+            'detector_memory_mb': round(memory / 2 ** 20, 2) if memory is not None else None,
+            'latency': _latency_stats(latencies)
+        }
+
+    # 以 FP32 为参考统计 INT8 的召回率
+    per_class = {name: {'reference': 0, 'matched': 0} for name in config.TARGET_CLASSES}
+    near = {'reference': 0, 'matched': 0}
+    int8_extra = 0
+    for reference, candidates in zip(results['fp32'], results['int8']):
+        matched, extra = _match(reference, candidates, iou_threshold)
+        int8_extra += extra
+        for det, hit in zip(reference, matched):
+            stats = per_class.setdefault(det['class'], {'reference': 0, 'matched': 0})
+            stats['reference'] += 1
+            stats['matched'] += hit
+            if det['distance'] <= config.NEAR_RANGE_DISTANCE:
+                near['reference'] += 1
+                near['matched'] += hit
+
+    for stats in list(per_class.values()) + [near]:
+        stats['recall'] = round(stats['matched'] / stats['reference'], 4) if stats['reference'] else None
+    report['per_class_recall'] = per_class
+    report['near_range_recall'] = near
+    report['int8_unmatched_detections'] = int8_extra
+    report['speedup'] = round(report['fp32']['latency']['mean_ms'] / report['int8']['latency']['mean_ms'], 2)
+
+    output_path = Path(output_path or os.path.join(LOGS_DIR, f"precision_report_{time.strftime('%Y%m%d_%H%M%S')}.json"))
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    logger.info(
+        f"FP32 平均 {report['fp32']['latency']['mean_ms']} ms, INT8 平均 {report['int8']['latency']['mean_ms']} ms, "
+        f"加速 {report['speedup']}x, 近距离召回率 {near['recall']}, 报告: {output_path}"
+    )
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="INT8 量化检测模型并生成 FP32/INT8 对比报告")
+    parser.add_argument('--calibrate', action='store_true', help="用视频帧校准并量化 ONNX 模型")
+    parser.add_argument('--report', action='store_true', help="生成 FP32/INT8 延迟、内存和召回率对比报告")
+    parser.add_argument('--video', default=None, help="校准/评估视频路径")
+    parser.add_argument('--frames', type=int, default=None, help="校准/评估帧数")
+    parser.add_argument('--sliced', action='store_true', help="使用裁剪检测头的模型（src.detector.head_slicing 生成）")
+    args = parser.parse_args()
+
+    cli_config = DetectorConfig()
+    if args.sliced:
+        from .head_slicing import sliced_config
+        cli_config = sliced_config(cli_config)
+
+    if not (args.calibrate or args.report):
+        parser.print_help()
+    if args.calibrate:
+        quantize_model(args.video, num_frames=args.frames, config=cli_config)
+    if args.report:
+        compare_precisions(args.video, num_frames=args.frames, config=cli_config)
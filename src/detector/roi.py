@@ -0,0 +1,82 @@
+# src/detector/roi.py
+import cv2
+import numpy as np
+from .backends import RawDetections
+from .yolo_config import DetectorConfig
+
+
+class RegionOfInterest:
+    """
+    行走通道感兴趣区域
+
+    区域由一个或多个归一化坐标的多边形组成（多个矩形即为条带）。推理前把帧裁剪到区域的外接矩形，
+    推理后把边界框映射回原图坐标，并丢弃底边中点（目标的落脚点）不在区域内的目标。
+    每种分辨率的裁剪矩形和区域掩码只计算一次。
+    """
+
+    def __init__(self, polygons=None):
+        """
+        初始化感兴趣区域
+
+        Args:
+            polygons (List[List[Tuple[float, float]]], optional): 归一化坐标 (x, y) 的多边形列表，
+                默认使用 DetectorConfig.ROI_POLYGONS
+        """
+        self.polygons = [np.asarray(polygon, dtype=np.float64)
+                         for polygon in (polygons or DetectorConfig.ROI_POLYGONS)]
+        self._cache = {}  # (高, 宽) -> (x0, y0, x1, y1, 裁剪区域内的掩码)
+
+    def _geometry(self, height, width):
+        """获取指定分辨率下的裁剪矩形和区域掩码（按分辨率缓存）"""
+        key = (height, width)
+        geometry = self._cache.get(key)
+        if geometry is None:
+            scale = np.array([width, height], dtype=np.float64)
+            points = [np.round(polygon * scale).astype(np.int32) for polygon in self.polygons]
+            mask = np.zeros((height, width), dtype=np.uint8)
+            cv2.fillPoly(mask, points, 1)
+
+            ys, xs = np.nonzero(mask)
+            if xs.size == 0:
+                x0, y0, x1, y1 = 0, 0, width, height
+            else:
+                x0, y0, x1, y1 = int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1
+            geometry = (x0, y0, x1, y1, mask[y0:y1, x0:x1].astype(bool))
+            self._cache[key] = geometry
+        return geometry
+
+    def crop(self, frame):
+        """
+        将帧裁剪到区域的外接矩形（返回视图，不复制像素）
+
+        Args:
+            frame (numpy.ndarray): 输入图像帧
+
+        Returns:
+            tuple: (裁剪后的帧, (x偏移, y偏移))
+        """
+        x0, y0, x1, y1, _ = self._geometry(*frame.shape[:2])
+        return frame[y0:y1, x0:x1], (x0, y0)
+
+    def restore(self, raw, frame_shape):
+        """
+        将裁剪帧上的检测结果映射回原图坐标，并丢弃落脚点不在区域内的目标
+
+        Args:
+            raw (RawDetections): 裁剪帧上的原始检测结果
+            frame_shape (tuple): 原图尺寸
+
+        Returns:
+            RawDetections: 原图坐标下、位于区域内的检测结果
+        """
+        x0, y0, x1, y1, mask = self._geometry(*frame_shape[:2])
+        if len(raw.cls) == 0:
+            return raw
+
+        # 落脚点：底边中点（裁剪帧坐标）
+        foot_x = ((raw.xyxy[:, 0] + raw.xyxy[:, 2]) * 0.5).astype(np.int64).clip(0, x1 - x0 - 1)
+        foot_y = (raw.xyxy[:, 3] - 1).astype(np.int64).clip(0, y1 - y0 - 1)
+        keep = mask[foot_y, foot_x]
+
+        xyxy = raw.xyxy[keep] + np.array([x0, y0, x0, y0], dtype=raw.xyxy.dtype)
+        return RawDetections(xyxy, raw.conf[keep], raw.cls[keep])
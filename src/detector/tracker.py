@@ -0,0 +1,264 @@
+# src/detector/tracker.py
+import numpy as np
+from .detection_config import DetectionConfig
+from .yolo_config import DetectorConfig
+
+
+def iou_matrix(boxes_a, boxes_b):
+    """
+    计算两组边界框两两之间的 IoU
+
+    Args:
+        boxes_a (numpy.ndarray): (N, 4) 的 xyxy 边界框
+        boxes_b (numpy.ndarray): (M, 4) 的 xyxy 边界框
+
+    Returns:
+        numpy.ndarray: (N, M) 的 IoU 矩阵
+    """
+    x1 = np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    y1 = np.maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    x2 = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+    y2 = np.minimum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+    inter = (x2 - x1).clip(0) * (y2 - y1).clip(0)
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-7)
+
+
+class IoUTracker:
+    """
+    基于 IoU 关联和匀速运动模型的轻量多目标跟踪器
+
+    关键帧上用完整检测结果更新轨迹（同类别按 IoU 贪心关联，alpha-beta 滤波更新速度和距离），
+    关键帧之间按匀速模型外推边界框和距离，不运行检测器。
+    关键帧间隔根据轨迹预测与新检测结果的偏差自适应调整：偏差大时缩短，偏差小时逐步放宽。
+    """
+
+    def __init__(self, iou_threshold=None, max_misses=None, velocity_gain=None, distance_smoothing=None,
+                 min_interval=None, max_interval=None):
+        """
+        初始化跟踪器
+
+        Args:
+            iou_threshold (float, optional): 轨迹与检测关联的最小 IoU
+            max_misses (int, optional): 轨迹连续多少个关键帧未匹配后删除
+            velocity_gain (float, optional): 速度更新增益（0-1）
+            distance_smoothing (float, optional): 距离平滑系数，新测量值的权重（0-1）
+            min_interval (int, optional): 最小关键帧间隔（处理帧数）
+            max_interval (int, optional): 最大关键帧间隔（处理帧数）
+        """
+        self.iou_threshold = DetectionConfig.TRACKER_IOU_THRESHOLD if iou_threshold is None else iou_threshold
+        self.max_misses = DetectionConfig.TRACKER_MAX_MISSES if max_misses is None else max_misses
+        self.velocity_gain = DetectionConfig.TRACKER_VELOCITY_GAIN if velocity_gain is None else velocity_gain
+        self.distance_smoothing = (DetectionConfig.TRACKER_DISTANCE_SMOOTHING
+                                   if distance_smoothing is None else distance_smoothing)
+        self.min_interval = DetectionConfig.KEYFRAME_MIN_INTERVAL if min_interval is None else min_interval
+        self.max_interval = DetectionConfig.KEYFRAME_MAX_INTERVAL if max_interval is None else max_interval
+
+        # 轨迹状态，按轨迹存放在并行数组中
+        self._boxes = np.zeros((0, 4), dtype=np.float64)  # 最近一次关键帧时的边界框
+        self._velocities = np.zeros((0, 4), dtype=np.float64)  # 边界框速度（像素/帧）
+        self._distances = np.zeros((0,), dtype=np.float64)  # 平滑后的距离
+        self._distance_velocities = np.zeros((0,), dtype=np.float64)  # 距离变化速度（米/帧）
+        self._confidences = np.zeros((0,), dtype=np.float64)
+        self._ids = np.zeros((0,), dtype=np.int64)
+        self._misses = np.zeros((0,), dtype=np.int64)
+        self._classes = []
+        self._next_id = 1
+        self.last_index = None  # 最近一次关键帧的帧序号
+
+        # 关键帧节奏
+        self.keyframe_interval = self.min_interval
+        self.frames_since_keyframe = 0
+        self.last_disagreement = 0.0
+
+        # 统计信息
+        self.keyframes = 0
+        self.propagated_frames = 0
+
+    def is_keyframe(self):
+        """
+        判断下一个处理帧是否需要运行完整检测
+
+        Returns:
+            bool: 是否为关键帧
+        """
+        return self.last_index is None or self.frames_since_keyframe + 1 >= self.keyframe_interval
+
+    def _predicted_boxes(self, frame_index):
+        """按匀速模型外推所有轨迹到指定帧"""
+        dt = max(frame_index - self.last_index, 0) if self.last_index is not None else 0
+        return self._boxes + self._velocities * dt, dt
+
+    def predict(self, frame_index):
+        """
+        在非关键帧上外推当前活跃轨迹
+
+        Args:
+            frame_index (int): 当前帧序号
+
+        Returns:
+            List[Dict]: 外推得到的检测结果（带 track_id），按置信度排序
+        """
+        self.frames_since_keyframe += 1
+        self.propagated_frames += 1
+        if self.last_index is None:
+            return []
+
+        boxes, dt = self._predicted_boxes(frame_index)
+        distances = np.clip(self._distances + self._distance_velocities * dt,
+                            DetectorConfig.MIN_DISTANCE, DetectorConfig.MAX_DISTANCE)
+        # 只输出上一个关键帧上匹配到检测的轨迹
+        active = np.flatnonzero(self._misses == 0)
+        active = active[np.argsort(-self._confidences[active], kind='stable')]
+        return [
+            {
+                'class': self._classes[i],
+                'confidence': float(self._confidences[i]),
+                'bbox': boxes[i].tolist(),
+                'distance': round(float(distances[i]), 2),
+                'track_id': int(self._ids[i])
+            }
+            for i in active
+        ]
+
+    def _associate(self, predicted, det_boxes, det_classes):
+        """同类别按 IoU 从大到小贪心关联，返回 (轨迹索引, 检测索引, IoU) 列表"""
+        if not len(predicted) or not len(det_boxes):
+            return []
+        ious = iou_matrix(predicted, det_boxes)
+        track_classes = np.array(self._classes, dtype=object)
+        ious[track_classes[:, None] != np.array(det_classes, dtype=object)[None, :]] = 0.0
+
+        matches = []
+        candidates = np.argwhere(ious >= self.iou_threshold)
+        order = np.argsort(-ious[candidates[:, 0], candidates[:, 1]], kind='stable')
+        used_tracks, used_dets = set(), set()
+        for t, d in candidates[order]:
+            if t in used_tracks or d in used_dets:
+                continue
+            used_tracks.add(t)
+            used_dets.add(d)
+            matches.append((t, d, ious[t, d]))
+        return matches
+
+    def update(self, detections, frame_index):
+        """
+        用关键帧上的检测结果更新轨迹
+
+        Args:
+            detections (List[Dict]): 检测器输出的检测结果
+            frame_index (int): 当前帧序号
+
+        Returns:
+            List[Dict]: 与输入顺序一致的检测结果，附加 track_id，距离替换为平滑后的值
+        """
+        det_boxes = np.array([det['bbox'] for det in detections], dtype=np.float64).reshape(-1, 4)
+        det_distances = np.array([det['distance'] for det in detections], dtype=np.float64)
+        det_classes = [det['class'] for det in detections]
+
+        predicted, dt = self._predicted_boxes(frame_index)
+        predicted_distances = self._distances + self._distance_velocities * dt
+        matches = self._associate(predicted, det_boxes, det_classes)
+
+        # 偏差：活跃轨迹与新检测之间未被 IoU 覆盖的比例（漏跟、新目标和位置偏移都会增大偏差）
+        num_active = int((self._misses == 0).sum())
+        denominator = max(num_active, len(detections))
+        matched_iou = sum(iou for _, _, iou in matches)
+        self.last_disagreement = float(1.0 - matched_iou / denominator) if denominator else 0.0
+        self._adapt_interval()
+
+        # alpha-beta 滤波：位置直接采用检测结果，速度按残差修正
+        step = max(dt, 1)
+        track_ids = np.zeros(len(detections), dtype=np.int64)
+        smoothed = det_distances.copy()
+        matched_tracks = np.zeros(len(self._ids), dtype=bool)
+        for t, d, _ in matches:
+            residual = det_boxes[d] - predicted[t]
+            self._velocities[t] += self.velocity_gain * residual / step
+            self._boxes[t] = det_boxes[d]
+
+            distance_residual = det_distances[d] - predicted_distances[t]
+            self._distance_velocities[t] += self.velocity_gain * distance_residual / step
+            self._distances[t] = predicted_distances[t] + self.distance_smoothing * distance_residual
+            smoothed[d] = self._distances[t]
+
+            self._confidences[t] = detections[d]['confidence']
+            self._misses[t] = 0
+            matched_tracks[t] = True
+            track_ids[d] = self._ids[t]
+
+        # 未匹配的轨迹外推到当前帧并累计丢失次数，超过上限后删除
+        unmatched = ~matched_tracks
+        self._boxes[unmatched] = predicted[unmatched]
+        self._distances[unmatched] = predicted_distances[unmatched]
+        self._misses[unmatched] += 1
+        self._keep(self._misses <= self.max_misses)
+
+        # 未匹配的检测创建新轨迹
+        matched_dets = {d for _, d, _ in matches}
+        new_dets = [d for d in range(len(detections)) if d not in matched_dets]
+        if new_dets:
+            new_ids = np.arange(self._next_id, self._next_id + len(new_dets))
+            self._next_id += len(new_dets)
+            track_ids[new_dets] = new_ids
+            self._boxes = np.vstack([self._boxes, det_boxes[new_dets]])
+            self._velocities = np.vstack([self._velocities, np.zeros((len(new_dets), 4))])
+            self._distances = np.concatenate([self._distances, det_distances[new_dets]])
+            self._distance_velocities = np.concatenate([self._distance_velocities, np.zeros(len(new_dets))])
+            self._confidences = np.concatenate(
+                [self._confidences, [detections[d]['confidence'] for d in new_dets]]
+            )
+            self._ids = np.concatenate([self._ids, new_ids])
+            self._misses = np.concatenate([self._misses, np.zeros(len(new_dets), dtype=np.int64)])
+            self._classes.extend(det_classes[d] for d in new_dets)
+
+        self.last_index = frame_index
+        self.frames_since_keyframe = 0
+        self.keyframes += 1
+
+        smoothed = np.clip(smoothed, DetectorConfig.MIN_DISTANCE, DetectorConfig.MAX_DISTANCE)
+        return [
+            dict(det, track_id=int(track_id), distance=round(float(distance), 2))
+            for det, track_id, distance in zip(detections, track_ids, smoothed)
+        ]
+
+    def _keep(self, mask):
+        """只保留掩码为True的轨迹"""
+        self._boxes = self._boxes[mask]
+        self._velocities = self._velocities[mask]
+        self._distances = self._distances[mask]
+        self._distance_velocities = self._distance_velocities[mask]
+        self._confidences = self._confidences[mask]
+        self._ids = self._ids[mask]
+        self._misses = self._misses[mask]
+        self._classes = [name for name, keep in zip(self._classes, mask) if keep]
+
+    def _adapt_interval(self):
+        """根据最近一次的偏差调整关键帧间隔"""
+        if self.last_disagreement > DetectionConfig.KEYFRAME_DISAGREEMENT_HIGH:
+            self.keyframe_interval = max(self.min_interval, self.keyframe_interval // 2)
+        elif self.last_disagreement < DetectionConfig.KEYFRAME_DISAGREEMENT_LOW:
+            self.keyframe_interval = min(self.max_interval, self.keyframe_interval + 1)
+
+    def reset(self):
+        """清除所有轨迹，下一帧必定为关键帧"""
+        self._keep(np.zeros(len(self._ids), dtype=bool))
+        self.last_index = None
+        self.frames_since_keyframe = 0
+        self.keyframe_interval = self.min_interval
+
+    def get_stats(self):
+        """
+        获取跟踪统计信息
+
+        Returns:
+            dict: 轨迹数、关键帧数、外推帧数、当前关键帧间隔和最近一次偏差
+        """
+        return {
+            'tracks': len(self._ids),
+            'keyframes': self.keyframes,
+            'propagated_frames': self.propagated_frames,
+            'keyframe_interval': self.keyframe_interval,
+            'last_disagreement': self.last_disagreement
+        }
@@ -1,9 +1,14 @@
 # src/detector/yolo.py
-from ultralytics import YOLO
+import copy
 import numpy as np
 import cv2
 from typing import List, Dict, Union
 from .yolo_config import DetectorConfig
+from .backends import create_backend
+from .roi import RegionOfInterest
+from .adaptive_resolution import AdaptiveResolution
+from .cascade import CascadePolicy
+from .autotune import load_profile
 from src.utils.logger import setup_logger
 import time
 
@@ -20,22 +25,97 @@ class ObjectDetector:
         """
         self.config = config or DetectorConfig()  # 如果未提供配置，则使用默认配置
         self.logger = setup_logger('detector')  # 设置日志记录器
+        # 应用本机的性能档案（由 python -m src.detector.autotune 生成）
+        self.config = load_profile(self.config, self.logger)
+
+        # 创建推理后端（torch 或 onnxruntime），后端统一返回原始检测数组
+        self.backend = create_backend(self.config, self.logger)
+        self.logger.info(
+            f"推理后端: {self.config.BACKEND}, 精度: {self.config.PRECISION}, 推理设备: {self.config.DEVICE}"
+        )
+        self.names = self.backend.names  # 类别ID到类别名称的映射
+
+        # 预先按类别ID建立查找表，后处理时直接用数组索引代替逐框的字符串查找
+        num_classes = max(self.names) + 1 if self.names else 0
+        self.class_names = [self.names.get(i, str(i)) for i in range(num_classes)]
+        self.target_class_mask = np.array(
+            [name in self.config.TARGET_CLASSES for name in self.class_names], dtype=bool
+        )
+        self.class_real_widths = np.array(
+            [self.config.OBJECT_REAL_WIDTHS.get(name, 0.5) for name in self.class_names], dtype=np.float32
+        )
+
+        # 感兴趣区域：推理前裁剪到行走通道
+        self.roi = RegionOfInterest(self.config.ROI_POLYGONS) if self.config.ROI_ENABLED else None
+        # 自适应输入分辨率：按推理延迟选择输入尺寸
+        self.resolution = AdaptiveResolution(config=self.config) if self.config.ADAPTIVE_RESOLUTION else None
+        if self.resolution is not None:
+            # INPUT_WIDTH（含性能档案中调优的值）只决定起始尺寸，之后由自适应分辨率按延迟调整
+            self.logger.info(
+                f"自适应输入分辨率已启用: 尺寸档位 {self.resolution.ladder}，从 INPUT_WIDTH={self.config.INPUT_WIDTH} "
+                f"对应的 {self.resolution.imgsz} 开始，之后按延迟自动调整"
+            )
+
+        # 两级级联：小模型筛选每一帧，大模型按需运行
+        self.screener = None
+        self.cascade = None
+        if self.config.CASCADE_ENABLED:
+            self._init_cascade()
 
+        # 启动时预热，避免首个可见帧承担内存分配等一次性开销
+        if self.config.WARMUP_ITERATIONS > 0:
+            self.warmup(self.config.WARMUP_ITERATIONS)
+
+    def warmup(self, iterations=1):
+        """
+        用空白帧按配置的输入尺寸预热推理（含级联的筛选模型和自适应分辨率的每一档尺寸）
+
+        Args:
+            iterations (int): 每个尺寸的预热次数
+        """
+        start_time = time.time()
+        frame = np.zeros((self.config.INPUT_HEIGHT, self.config.INPUT_WIDTH, 3), dtype=np.uint8)
+        sizes = self.resolution.ladder if self.resolution is not None else [None]
+        backends = [self.backend] + ([self.screener] if self.screener is not None else [])
         try:
-            # 尝试加载本地模型
-            self.model = YOLO(self.config.MODEL_PATH)
-            self.logger.info(f"成功加载模型: {self.config.MODEL_PATH}")
+            for backend in backends:
+                for imgsz in sizes:
+                    for _ in range(iterations):
+                        backend.infer([frame], imgsz)
+            self.logger.info(f"推理预热完成，耗时: {time.time() - start_time:.3f} 秒")
         except Exception as e:
-            # 如果本地加载失败，尝试在线下载模型
-            self.logger.warning(f"尝试加载模型失败: {str(e)}")
-            self.logger.info(f"尝试直接通过 ultralytics 自动下载模型 {self.config.MODEL_NAME}...")
-            try:
-                self.model = YOLO(self.config.MODEL_NAME)  # 自动下载并加载模型
-                self.logger.info(f"成功通过 ultralytics 下载并加载模型: {self.config.MODEL_NAME}")
-            except Exception as ex:
-                # 如果在线下载也失败，则抛出错误
-                self.logger.error(f"无法加载模型: {str(ex)}, 类型: {type(ex).__name__}")
-                raise RuntimeError(f"无法加载模型: {str(ex)}")
+            self.logger.warning(f"推理预热失败: {str(e)}")
+
+    def _init_cascade(self):
+        """加载筛选模型，失败时退回只使用大模型"""
+        screener_config = copy.copy(self.config)
+        screener_config.MODEL_NAME = self.config.SCREENER_MODEL_NAME
+        screener_config.MODEL_PATH = self.config.SCREENER_MODEL_PATH
+        screener_config.ONNX_MODEL_PATH = self.config.SCREENER_MODEL_PATH.with_suffix(".onnx")
+        screener_config.INT8_MODEL_PATH = self.config.SCREENER_MODEL_PATH.with_name(
+            f"{self.config.SCREENER_MODEL_NAME}_int8.onnx"
+        )
+        screener_config.CONFIDENCE_THRESHOLD = self.config.SCREENER_CONFIDENCE_THRESHOLD
+        try:
+            screener = create_backend(screener_config, self.logger)
+        except FileNotFoundError as e:
+            # 筛选模型只从本地文件或模型缓存加载，缺失时不在线下载
+            self.logger.warning(f"筛选模型不可用，不启用级联: {str(e)}")
+            return
+        except Exception as e:
+            self.logger.error(f"加载筛选模型失败，不启用级联: {str(e)}")
+            return
+        if dict(screener.names) != dict(self.names):
+            self.logger.error("筛选模型与大模型的类别不一致，不启用级联")
+            return
+
+        self.screener = screener
+        self.cascade = CascadePolicy(
+            accept_confidence=self.config.CONFIDENCE_THRESHOLD,
+            near_distance=self.config.CASCADE_NEAR_DISTANCE,
+            refresh_interval=self.config.CASCADE_REFRESH_INTERVAL
+        )
+        self.logger.info(f"启用级联检测，筛选模型: {self.config.SCREENER_MODEL_NAME}")
 
     @staticmethod
     def estimate_distance(bbox, focal_length=500, cls_name=None, frame_width=None):
@@ -93,6 +173,40 @@ class ObjectDetector:
         # 返回保留两位小数的距离
         return round(clamped_distance, 2)
 
+    @staticmethod
+    def estimate_distances(bboxes, real_widths, focal_length=500, frame_width=None):
+        """
+        estimate_distance 的向量化版本，一次计算所有边界框的距离。
+
+        Args:
+            bboxes (numpy.ndarray): (N, 4) 的边界框 [x1, y1, x2, y2]。
+            real_widths (numpy.ndarray): (N,) 每个目标的实际宽度（单位：米）。
+            focal_length (float): 基准焦距，默认为500。
+            frame_width (int, optional): 图像帧的宽度，用于焦距调整。
+
+        Returns:
+            numpy.ndarray: (N,) 估算的距离（单位：米），保留两位小数，像素宽度无效时为 inf。
+        """
+        # 计算物体在图像中的宽度（像素）
+        widths_in_pixels = bboxes[:, 2] - bboxes[:, 0]
+
+        # 根据图像宽度调整焦距（假设标准宽度为640像素）
+        adjusted_focal_length = focal_length
+        if frame_width is not None:
+            adjusted_focal_length = focal_length * (frame_width / 640)
+
+        # 使用针孔相机模型计算距离，宽度无效的框距离为 inf
+        valid = widths_in_pixels > 0
+        distances = np.full(widths_in_pixels.shape, np.inf, dtype=np.float64)
+        np.divide(real_widths * adjusted_focal_length, widths_in_pixels, out=distances, where=valid)
+
+        # 近距离和远距离的非线性校正
+        distances *= np.where(distances < 1.0, 1.1, np.where(distances > 5.0, 0.9, 1.0))
+
+        # 确保距离在合理范围内
+        clamped = np.clip(distances, DetectorConfig.MIN_DISTANCE, DetectorConfig.MAX_DISTANCE)
+        return np.where(valid, np.round(clamped, 2), np.inf)
+
     def detect(self, frame: np.ndarray) -> List[Dict[str, Union[str, float, List[float]]]]:
         """
         对输入帧进行目标检测，并估算每个目标的距离。
@@ -103,80 +217,166 @@ class ObjectDetector:
         Returns:
             List[Dict[str, Union[str, float, List[float]]]]: 检测结果列表。
         """
+        # 单帧即批大小为1的批量推理
+        return self.detect_batch([frame])[0]
+
+    def detect_batch(self, frames: List[np.ndarray]) -> List[List[Dict[str, Union[str, float, List[float]]]]]:
+        """
+        对多帧进行一次批量推理，每帧返回各自的检测结果。
+
+        Args:
+            frames: 输入图像帧列表 (BGR格式)，可以来自不同的视频流，尺寸可以不同。
+
+        Returns:
+            List[List[Dict]]: 与输入帧一一对应的检测结果列表。
+        """
+        if not frames:
+            return []
+
         try:
-            # 将单帧复制为批量帧
-            frames = [frame] * self.config.BATCH_SIZE
-            self.logger.info(f"推理设备: {self.config.DEVICE}")
             start_time = time.time()  # 记录推理开始时间
-
-            # 执行推理
-            results = self.model(
-                frames,  # 输入批量帧
-                conf=self.config.CONFIDENCE_THRESHOLD,  # 置信度阈值
-                device=self.config.DEVICE  # 推理设备
-            )
+            imgsz = self.resolution.imgsz if self.resolution is not None else None
+
+            # 启用感兴趣区域时只送入裁剪后的通道区域
+            inputs = [self.roi.crop(frame)[0] for frame in frames] if self.roi is not None else frames
+
+            # 大模型每帧的推理耗时（毫秒），本批没有运行大模型时为 None
+            primary_ms = None
+            if self.cascade is not None:
+                # 筛选模型处理所有帧，只对需要的帧运行大模型
+                raw_results = self._infer(self.screener, inputs, frames, imgsz)
+                escalate = [i for i, (raw, frame) in enumerate(zip(raw_results, frames))
+                            if self._should_escalate(raw, frame)]
+                if escalate:
+                    primary_start = time.perf_counter()
+                    refined = self._infer(self.backend, [inputs[i] for i in escalate],
+                                          [frames[i] for i in escalate], imgsz)
+                    primary_ms = (time.perf_counter() - primary_start) * 1000.0 / len(escalate)
+                    for i, raw in zip(escalate, refined):
+                        raw_results[i] = raw
+            else:
+                primary_start = time.perf_counter()
+                raw_results = self._infer(self.backend, inputs, frames, imgsz)
+                primary_ms = (time.perf_counter() - primary_start) * 1000.0 / len(frames)
             end_time = time.time()  # 记录推理结束时间
-            self.logger.info(f"YOLO 推理耗时: {end_time - start_time:.3f} 秒")
-
-            detections = []  # 存储检测结果
-            for result in results:
-                boxes = result.boxes  # 获取检测框信息
-                for box in boxes:
-                    cls_id = int(box.cls[0])  # 获取类别ID
-                    cls_name = result.names[cls_id]  # 根据ID获取类别名称
-
-                    # 如果检测的类别不在目标类别列表中，则跳过
-                    if cls_name not in self.config.TARGET_CLASSES:
-                        continue
-
-                    confidence = float(box.conf[0])  # 获取置信度
-                    xyxy = box.xyxy[0].tolist()  # 获取边界框坐标并转换为列表
-
-                    # 估算物体距离
-                    distance = self.estimate_distance(
-                        bbox=xyxy,
-                        frame_width=frame.shape[1],  # 图像宽度
-                        cls_name=cls_name  # 物体类别
-                    )
-
-                    # 如果物体距离不在有效范围内，跳过
-                    if not (self.config.MIN_DISTANCE <= distance <= self.config.MAX_DISTANCE):
-                        self.logger.debug(f"物体 '{cls_name}' 被过滤，距离: {distance} 米")
-                        continue
-
-                    # 保存检测结果
-                    detection = {
-                        'class': cls_name,
-                        'confidence': confidence,
-                        'bbox': xyxy,  # [x1, y1, x2, y2]
-                        'distance': distance  # 距离（单位：米）
-                    }
-                    detections.append(detection)
-
-            # 过滤并排序检测结果
-            return sorted(
-                [det for det in detections if det['confidence'] >= self.config.CONFIDENCE_THRESHOLD],
-                key=lambda x: x['confidence'],
-                reverse=True
-            )[:self.config.MAX_DETECTIONS]  # 只保留前N个检测结果
+            self.logger.info(
+                f"YOLO 推理耗时: {end_time - start_time:.3f} 秒, 批大小: {len(frames)}, "
+                f"输入尺寸: {imgsz or self.config.INPUT_WIDTH}"
+            )
+
+            results = [self._postprocess(raw, frame) for raw, frame in zip(raw_results, frames)]
+            if self.resolution is not None:
+                # 根据大模型的单帧延迟（不含批内其他帧和筛选模型）和检测结果调整下一次推理的输入尺寸
+                self.resolution.record_latency(imgsz, primary_ms)
+                for detections, frame in zip(results, frames):
+                    self.resolution.check_detections(detections, frame.shape[1])
+            return results
 
         except Exception as e:
             # 捕获推理过程中的错误并记录
-            self.logger.error(f"检测过程出错: {str(e)}")
+            self.logger.error(f"批量检测过程出错: {str(e)}")
+            return [[] for _ in frames]
+
+    def _infer(self, backend, inputs, frames, imgsz):
+        """用指定后端推理，并把感兴趣区域内的结果映射回原图坐标"""
+        raw_results = backend.infer(inputs, imgsz)
+        if self.roi is not None:
+            raw_results = [self.roi.restore(raw, frame.shape) for raw, frame in zip(raw_results, frames)]
+        return raw_results
+
+    def _should_escalate(self, raw, frame: np.ndarray) -> bool:
+        """根据筛选模型在目标类别上的检测结果判断该帧是否需要运行大模型"""
+        cls = raw.cls
+        target = cls < len(self.class_names)
+        target[target] &= self.target_class_mask[cls[target]]
+        distances = self.estimate_distances(
+            raw.xyxy[target], self.class_real_widths[cls[target]], frame_width=frame.shape[1]
+        )
+        return self.cascade.should_escalate(raw.conf[target], distances) is not None
+
+    def get_cascade_stats(self):
+        """
+        获取级联统计信息（未启用级联时返回 None）
+
+        Returns:
+            dict: 筛选帧数、大模型运行次数（按原因）和大模型跳过比例
+        """
+        return self.cascade.get_stats() if self.cascade is not None else None
+
+    def _postprocess(self, raw, frame: np.ndarray) -> List[Dict[str, Union[str, float, List[float]]]]:
+        """
+        将后端输出的原始检测数组解析为检测结果字典列表，并估算每个目标的距离。
+
+        过滤、距离估算和 top-k 选择都在整个数组上完成，逐框的 Python 操作只剩最终保留的 MAX_DETECTIONS 个结果。
+
+        Args:
+            raw (RawDetections): 单帧的原始检测结果。
+            frame: 对应的输入图像帧，用于获取图像宽度。
+
+        Returns:
+            List[Dict[str, Union[str, float, List[float]]]]: 按置信度排序的检测结果列表。
+        """
+        cls, conf = raw.cls, raw.conf
+
+        # 类别掩码和置信度过滤（超出类别表范围的ID视为非目标类别）
+        known = cls < len(self.class_names)
+        keep = known & (conf >= self.config.CONFIDENCE_THRESHOLD)
+        keep[known] &= self.target_class_mask[cls[known]]
+        candidates = np.flatnonzero(keep)
+        if candidates.size == 0:
             return []
 
-    def draw_detections(self, frame: np.ndarray, detections: List[Dict]) -> np.ndarray:
+        # 一次计算所有候选框的距离，并过滤超出有效范围的目标
+        distances = self.estimate_distances(
+            raw.xyxy[candidates],
+            self.class_real_widths[cls[candidates]],
+            frame_width=frame.shape[1]  # 图像宽度
+        )
+        in_range = (distances >= self.config.MIN_DISTANCE) & (distances <= self.config.MAX_DISTANCE)
+        if not in_range.all():
+            self.logger.debug(f"{int((~in_range).sum())} 个物体因距离超出范围被过滤")
+        candidates, distances = candidates[in_range], distances[in_range]
+
+        # 按置信度只选出前N个，再对这N个排序
+        k = self.config.MAX_DETECTIONS
+        if candidates.size > k:
+            top = np.argpartition(-conf[candidates], k - 1)[:k]
+            candidates, distances = candidates[top], distances[top]
+        order = np.argsort(-conf[candidates], kind='stable')
+        candidates, distances = candidates[order], distances[order]
+
+        # 只为最终保留的检测结果构建字典
+        return [
+            {
+                'class': self.class_names[cls_id],
+                'confidence': confidence,
+                'bbox': bbox,  # [x1, y1, x2, y2]
+                'distance': distance  # 距离（单位：米）
+            }
+            for cls_id, confidence, bbox, distance in zip(
+                cls[candidates].tolist(), conf[candidates].tolist(),
+                raw.xyxy[candidates].tolist(), distances.tolist()
+            )
+        ]
+
+    def draw_detections(self, frame: np.ndarray, detections: List[Dict],
+                        out: np.ndarray = None) -> np.ndarray:
         """
         在图像上绘制检测结果
 
         Args:
             frame: 输入图像帧
             detections: 检测结果列表
+            out: 可选的输出缓冲区，形状与输入帧一致时复用它而不是新分配图像
 
         Returns:
             绘制了检测框的图像帧
         """
-        img = frame.copy()  # 复制输入帧
+        if out is not None and out.shape == frame.shape and out.dtype == frame.dtype:
+            np.copyto(out, frame)  # 复制到复用的输出缓冲区
+            img = out
+        else:
+            img = frame.copy()  # 复制输入帧
         for det in detections:
             # 获取边界框坐标
             x1, y1, x2, y2 = map(int, det['bbox'])
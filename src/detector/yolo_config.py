@@ -1,6 +1,18 @@
 # src/detector/config.py
+import os
 from pathlib import Path
-import torch
+
+
+def _default_device(backend):
+    """自动选择推理设备，仅在使用 torch 后端时导入 torch"""
+    if backend != "torch":
+        return "cpu"
+    try:
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    except ImportError:
+        return "cpu"
+
 
 class DetectorConfig:
     """YOLO检测器配置"""
@@ -10,11 +22,67 @@ class DetectorConfig:
     MODEL_PATH = Path(f"../../models/{MODEL_NAME}.pt")  # 模型文件路径
     CONFIDENCE_THRESHOLD = 0.5  # 置信度阈值
 
+    # 两级级联：小模型筛选每一帧，大模型按需运行
+    CASCADE_ENABLED = True  # 是否启用级联（筛选模型加载失败时自动退回只用大模型）
+    SCREENER_MODEL_NAME = "yolo11n"  # 筛选模型
+    SCREENER_MODEL_PATH = Path(f"../../models/{SCREENER_MODEL_NAME}.pt")  # 筛选模型文件路径
+    SCREENER_CONFIDENCE_THRESHOLD = 0.25  # 筛选模型的置信度阈值（低于 CONFIDENCE_THRESHOLD 的目标触发大模型）
+    CASCADE_NEAR_DISTANCE = 3.0  # 有目标近于该距离时运行大模型（与 TTSConfig.MAX_SPEECH_DISTANCE 一致）
+    CASCADE_REFRESH_INTERVAL = 10  # 每隔多少帧至少运行一次大模型
+
+    # 推理后端
+    BACKEND = "torch"  # "torch"（ultralytics/PyTorch）或 "onnxruntime"（运行时无需导入torch）
+    ONNX_MODEL_PATH = MODEL_PATH.with_suffix(".onnx")  # 导出的 ONNX 模型路径
+    ORT_INTRA_OP_THREADS = max(1, (os.cpu_count() or 2) // 2)  # 算子内线程数（按物理核心数估算）
+    ORT_INTER_OP_THREADS = 1  # 算子间线程数（顺序执行模式下1即可）
+    TORCH_INTRA_OP_THREADS = None  # torch 算子内线程数（None 使用 torch 默认值）
+    TORCH_INTER_OP_THREADS = None  # torch 算子间线程数（None 使用 torch 默认值）
+    NMS_IOU_THRESHOLD = 0.45  # NMS 的 IoU 阈值（onnxruntime 后端和快速推理路径）
+    FAST_PREPROCESS = True  # torch 后端使用预分配缓冲区并直接调用网络，绕过 ultralytics 的通用输入处理
+    USE_SLICED_HEAD = True  # 使用只输出 TARGET_CLASSES 的裁剪检测头（python -m src.detector.head_slicing 构建）
+
+    # 模型缓存与预热
+    USE_ARTIFACT_CACHE = True  # 缓存融合后的 torch 模型 / onnxruntime 优化后的模型，加快启动
+    ARTIFACT_CACHE_DIR = Path("../../models/cache")  # 模型缓存目录
+    WARMUP_ITERATIONS = 2  # 启动时用空白帧预热推理的次数（0 表示不预热）
+
+    # 性能档案：python -m src.detector.autotune 为每台主机生成最优推理设置，启动时自动加载
+    USE_PERF_PROFILE = True  # 是否加载性能档案（启用自适应分辨率时，档案中的 INPUT_WIDTH 只作为起始尺寸）
+    PERF_PROFILE_PATH = ARTIFACT_CACHE_DIR / "perf_profile.json"  # 性能档案路径
+    AUTOTUNE_FRAMES = 40  # 自动调优时每组设置测试的帧数
+
+    # INT8 量化
+    PRECISION = "fp32"  # "fp32" 或 "int8"（int8 使用 onnxruntime 加载量化模型）
+    INT8_MODEL_PATH = MODEL_PATH.with_name(f"{MODEL_NAME}_int8.onnx")  # 量化后的 ONNX 模型路径
+    CALIBRATION_FRAMES = 100  # 从视频中抽取的校准帧数
+    REPORT_FRAMES = 200  # 精度/延迟对比报告使用的评估帧数
+    NEAR_RANGE_DISTANCE = 3.0  # 报告中单独统计召回率的近距离阈值（单位：米）
+
     # 推理设备
-    DEVICE = "cuda" if torch.cuda.is_available() else "cpu"  # 自动选择
+    DEVICE = _default_device(BACKEND)  # 自动选择
     INPUT_WIDTH = 640  # 输入图像宽度
     INPUT_HEIGHT = 640  # 输入图像高度
 
+    # 自适应输入分辨率：按推理延迟在几档输入尺寸之间切换
+    ADAPTIVE_RESOLUTION = True  # 是否启用（关闭时固定使用 INPUT_WIDTH/INPUT_HEIGHT；启用时从 INPUT_WIDTH 开始按延迟调整）
+    IMGSZ_LADDER = [320, 480, 640]  # 可选的输入尺寸（需为32的倍数）
+    LATENCY_BUDGET_MS = 80.0  # 每次推理的延迟预算（毫秒）
+    LATENCY_WINDOW = 30  # 计算p95延迟的滚动窗口大小
+    ADAPTIVE_MIN_SAMPLES = 10  # 切换尺寸后至少记录多少次推理才再次调整
+    STEP_UP_HEADROOM = 0.7  # p95低于预算的该比例时升一档
+    BOOST_FRAMES = 5  # 临时提升一档持续的推理次数
+    BOOST_COOLDOWN_FRAMES = 20  # 两次临时提升之间至少间隔的推理次数
+    FEW_OBJECTS = 1  # 检测到目标但少于该数量时临时提升（1 表示不按目标数量提升）
+    BOOST_ON_EMPTY = False  # 没有检测到目标时是否临时提升
+    UNCERTAIN_CONFIDENCE = 0.6  # 最近目标置信度低于该值时临时提升
+    UNCERTAIN_BOX_PIXELS = 24  # 最近目标在模型输入中的宽度小于该像素数时临时提升
+
+    # 感兴趣区域：只检测行走通道（正前方以及侧边），归一化坐标 (x, y)
+    ROI_ENABLED = True  # 是否在推理前裁剪到感兴趣区域
+    ROI_POLYGONS = [
+        [(0.2, 0.0), (0.8, 0.0), (0.9, 1.0), (0.1, 1.0)],  # 向下逐渐变宽的梯形通道
+    ]
+
     MIN_DISTANCE = 0.25  # 最小检测距离（单位：米）
     MAX_DISTANCE = 10.0  # 最大检测距离（单位：米）
 
@@ -35,5 +103,8 @@ class DetectorConfig:
     }
 
     # 处理配置
-    BATCH_SIZE = 1  # 实时处理用单批次
+    BATCH_SIZE = 1  # 微批调度器的最大批大小（实时单路处理用1）
+    BATCH_MAX_WAIT_MS = 10  # 微批调度器凑批的最长等待时间（毫秒）
+    OFFLINE_BATCH_SIZE = 8  # 离线处理视频文件时的最大批大小
+    OFFLINE_FRAMES_IN_FLIGHT = 8  # 离线处理时每个视频已提交、尚未取回结果的最大帧数
     MAX_DETECTIONS = 20  # 每帧最大检测数量
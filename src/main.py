@@ -2,13 +2,56 @@ import sys
 import time
 import cv2
 import traceback
-from src.camera.threaded_camera import ThreadedVideoCapture
+from src.camera.capture_factory import create_video_capture
+from src.camera.multi_capture import MultiStreamCapture
 from src.controller.detection_controller import DetectionController
+from src.controller.multi_stream_controller import MultiStreamController
 from src.detector.detection_config import DetectionConfig
+from src.ocr.ocr_config import OCRConfig
+from src.ocr.ocr_factory import create_ocr_worker
 from src.utils.resource_manager import initialize_modules, cleanup_resources
 from src.utils.logger import setup_logger
 
 
+def run_multi_stream(cap, controller, has_gui, logger):
+    """
+    多路视频检测循环：收集各路最新帧，批量推理后分发到各路控制器。
+
+    Args:
+        cap (MultiStreamCapture): 多路视频捕获
+        controller (MultiStreamController): 多路检测控制器
+        has_gui (bool): 是否显示窗口
+        logger: 日志记录器
+    """
+    logger.info(f"开始多路检测循环，共 {len(cap.captures)} 路视频源...")
+    batch_count = 0
+
+    while True:
+        slots = cap.read_latest(timeout=DetectionConfig.FRAME_WAIT_TIMEOUT)
+        if not slots:
+            if cap.running:
+                continue
+            logger.info("所有视频源播放结束或读取帧失败")
+            break
+
+        try:
+            batch_count += 1
+            display_frames = controller.process_slots(slots)
+
+            if has_gui:
+                for stream_index, display_frame in display_frames.items():
+                    cv2.imshow(f"{DetectionConfig.WINDOW_NAME} #{stream_index}", display_frame)
+                if cv2.waitKey(1) & 0xFF == 27:
+                    logger.info("用户关闭窗口")
+                    break
+            elif batch_count % 100 == 0:
+                logger.info(f"已处理 {batch_count} 批")
+        finally:
+            # 槽位必须在显示完成后释放
+            for _, slot in slots:
+                slot.release()
+
+
 # 在main.py中改进主函数的退出处理
 
 def main():
@@ -18,13 +61,14 @@ def main():
     logger = setup_logger('main')
     cap = None
     tts_engine = None
+    ocr_worker = None
 
     try:
         # 初始化各模块
         detector, tts_engine, ocr, _ = initialize_modules()
-
-        # 创建检测控制器
-        controller = DetectionController(detector, tts_engine)
+        # OCR 在后台线程或独立进程中识别检测到的公交车/标志牌区域，主循环不等待识别结果
+        if OCRConfig.ENABLED:
+            ocr_worker = create_ocr_worker(ocr)
 
         # 检查OpenCV是否支持GUI
         has_gui = True
@@ -35,9 +79,23 @@ def main():
             logger.warning(f"无法创建显示窗口，将在无GUI模式下运行: {str(e)}")
             has_gui = False
 
-        # 启动线程化视频捕获
+        # 多路视频源：共享一个检测器，各路最新帧合并为一个批次推理
+        sources = DetectionConfig.VIDEO_SOURCES
+        if len(sources) > 1:
+            multi_controller = MultiStreamController(detector, tts_engine, len(sources), ocr_worker)
+            samplers = multi_controller.samplers if DetectionConfig.GRAB_SKIPPED_FRAMES else None
+            cap = MultiStreamCapture(sources, samplers=samplers)
+            run_multi_stream(cap, multi_controller, has_gui, logger)
+            return
+
+        # 创建检测控制器
+        controller = DetectionController(detector, tts_engine, ocr_worker)
+
+        # 启动视频捕获（线程或独立进程，由 CameraConfig.CAPTURE_BACKEND 决定）
         try:
-            cap = ThreadedVideoCapture(DetectionConfig.VIDEO_PATH)
+            # 捕获层共享控制器的采样策略，跳过不处理帧的解码
+            sampler = controller.sampler if DetectionConfig.GRAB_SKIPPED_FRAMES else None
+            cap = create_video_capture(DetectionConfig.VIDEO_PATH, sampler=sampler)
             # 获取视频帧率
             fps = cap.fps
             frame_time = 1.0 / fps
@@ -49,38 +107,51 @@ def main():
         logger.info("开始检测循环...")
         frame_count = 0
         last_process_time = time.time()
+        last_seq = 0  # 上一次处理的帧序号
 
         while True:
-            # 从视频流中读取帧
-            ret, frame = cap.read()
-            if not ret:
+            # 等待比上一次处理更新的帧（环形缓冲区模式下为只读视图，不复制帧数据）
+            slot = cap.read_slot(newer_than=last_seq, timeout=DetectionConfig.FRAME_WAIT_TIMEOUT)
+            if slot is None:
+                if cap.running:
+                    # 等待超时但视频源仍在运行，继续等待
+                    continue
                 logger.info("视频播放结束或读取帧失败")
                 break
+            last_seq = slot.seq
 
-            current_time = time.time()
-            frame_count += 1
+            # 槽位在 with 块结束时释放，显示必须在块内完成
+            with slot:
+                current_time = time.time()
+                frame_count += 1
 
-            # 处理当前帧
-            display_frame = controller.process_frame(frame)
+                # 处理当前帧
+                display_frame = controller.process_frame(slot.frame, frame_index=slot.seq)
 
-            # 显示帧率信息
-            if frame_count % 30 == 0:
-                fps_actual = 30 / (current_time - last_process_time) if current_time != last_process_time else 0
-                logger.info(f"当前处理帧率: {fps_actual:.2f} FPS")
-                last_process_time = current_time
+                # 显示帧率信息
+                if frame_count % 30 == 0:
+                    fps_actual = 30 / (current_time - last_process_time) if current_time != last_process_time else 0
+                    logger.info(f"当前处理帧率: {fps_actual:.2f} FPS")
+                    cascade_stats = detector.get_cascade_stats()
+                    if cascade_stats is not None:
+                        logger.info(f"大模型跳过比例: {cascade_stats['skip_ratio']:.2%}, "
+                                    f"升级原因: {cascade_stats['escalations']}")
+                    if ocr_worker is not None:
+                        logger.info(f"OCR 统计: {ocr_worker.get_stats()}")
+                    last_process_time = current_time
 
-            # 显示处理后的帧（如果支持GUI）
-            if has_gui:
-                cv2.imshow(DetectionConfig.WINDOW_NAME, display_frame)
-                # 检查键盘事件，按下 ESC 键或关闭窗口退出循环
-                key = cv2.waitKey(1) & 0xFF
-                if key == 27 or cv2.getWindowProperty(DetectionConfig.WINDOW_NAME, cv2.WND_PROP_VISIBLE) < 1:
-                    logger.info("用户关闭窗口")
-                    break
-            else:
-                # 在无GUI模式下，每100帧打印一次状态
-                if frame_count % 100 == 0:
-                    logger.info(f"已处理 {frame_count} 帧")
+                # 显示处理后的帧（如果支持GUI）
+                if has_gui:
+                    cv2.imshow(DetectionConfig.WINDOW_NAME, display_frame)
+                    # 检查键盘事件，按下 ESC 键或关闭窗口退出循环
+                    key = cv2.waitKey(1) & 0xFF
+                    if key == 27 or cv2.getWindowProperty(DetectionConfig.WINDOW_NAME, cv2.WND_PROP_VISIBLE) < 1:
+                        logger.info("用户关闭窗口")
+                        break
+                else:
+                    # 在无GUI模式下，每100帧打印一次状态
+                    if frame_count % 100 == 0:
+                        logger.info(f"已处理 {frame_count} 帧")
 
     except KeyboardInterrupt:
         logger.info("检测循环因键盘中断而停止...")
@@ -89,7 +160,7 @@ def main():
     finally:
         # 在finally块中包装cleanup_resources以确保无论如何都会执行，并且不会因异常而中断
         try:
-            cleanup_resources(cap, tts_engine)
+            cleanup_resources(cap, tts_engine, ocr_worker)
         except Exception as e:
             logger.error(f"清理资源时发生致命错误: {str(e)}")
         finally:
@@ -1,5 +1,11 @@
 # src/ocr/__init__.py
 from .ocr import OCR
+from .ocr_cache import OCRResultCache, dhash
 from .ocr_config import OCRConfig
+from .ocr_worker import OCRWorker, crop_for_ocr
+from .ocr_service import OCRService
+from .ocr_factory import create_ocr_worker
+from .preprocessing import PreprocessPipeline
 
-__all__ = ['OCR', 'OCRConfig']
\ No newline at end of file
+__all__ = ['OCR', 'OCRConfig', 'OCRWorker', 'crop_for_ocr', 'PreprocessPipeline',
+           'OCRResultCache', 'dhash', 'OCRService', 'create_ocr_worker']
\ No newline at end of file
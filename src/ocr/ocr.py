@@ -1,23 +1,39 @@
 # src/ocr/ocr.py
 import cv2
-from paddleocr import PaddleOCR
+import numpy as np
+from .ocr_cache import OCRResultCache
+from .ocr_config import OCRConfig
+from .preprocessing import PreprocessPipeline
 from src.utils.logger import setup_logger
 
 
 class OCR:
     """OCR 模块，用于从图像中提取文本信息，使用在线 PaddleOCR"""
 
-    def __init__(self):
+    def __init__(self, preset=None):
         """
         初始化 OCR 模块，使用 PaddleOCR
+
+        Args:
+            preset (str, optional): 预处理预设名称，默认使用 OCRConfig.PREPROCESS_PRESET
         """
         self.logger = setup_logger('ocr')
+        # 预处理流水线（可通过 preprocessor.get_timing_report() 查看各阶段耗时）
+        self.preprocessor = PreprocessPipeline.from_preset(preset)
+        # 识别结果缓存：画面中停留多帧的同一标志牌只识别一次
+        self.cache = OCRResultCache() if OCRConfig.CACHE_ENABLED else None
         self._initialize_ocr_engine()  # 初始化 OCR 引擎
 
     def _initialize_ocr_engine(self):
         """初始化 PaddleOCR 引擎"""
+        # 延迟导入：只使用检测功能时不需要加载 paddle
+        from paddleocr import PaddleOCR
+
         self.logger.info("初始化 PaddleOCR 模式")
-        self.ocr_engine = PaddleOCR(use_gpu=False, show_log=False)
+        self.ocr_engine = PaddleOCR(use_gpu=False, show_log=False,
+                                    use_angle_cls=OCRConfig.LOAD_ANGLE_CLASSIFIER,
+                                    rec_batch_num=OCRConfig.REC_BATCH_NUM,
+                                    cpu_threads=OCRConfig.CPU_THREADS)
 
     def preprocess_image(self, image):
         """
@@ -30,13 +46,7 @@ class OCR:
             numpy.ndarray: 预处理后的图像。
         """
         try:
-            # 转为灰度图
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            # 二值化处理
-            _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            # 去噪（可选）
-            denoised = cv2.fastNlMeansDenoising(binary, None, 30, 7, 21)
-            return denoised
+            return self.preprocessor(image)
         except Exception as e:
             self.logger.error(f"图像预处理失败: {str(e)}")
             return image  # 返回原始图像以防止中断
@@ -54,28 +64,159 @@ class OCR:
         cleaned_lines = [line.strip() for line in text.splitlines() if line.strip()]
         return " ".join(cleaned_lines)
 
-    def extract_text(self, image):
+    def _lookup_cache(self, image, cache_key=None):
+        """
+        查询识别结果缓存
+
+        Args:
+            image (numpy.ndarray): 输入图像
+            cache_key (optional): 与图像哈希组合的缓存附加键
+
+        Returns:
+            tuple: (缓存键, 缓存的文本)；未启用缓存时缓存键为 None，未命中时文本为 None
+        """
+        if self.cache is None:
+            return None, None
+        try:
+            key = self.cache.make_key(image, cache_key)
+            return key, self.cache.get(key)
+        except Exception as e:
+            self.logger.error(f"查询 OCR 缓存失败: {str(e)}")
+            return None, None
+
+    def extract_text(self, image, cache_key=None, cls=None):
         """
         从图像中提取文本
 
         Args:
             image (numpy.ndarray): 输入图像
+            cache_key (optional): 与图像哈希组合的缓存附加键（如跟踪ID）
+            cls (bool, optional): 是否运行方向分类器，默认使用 OCRConfig.USE_ANGLE_CLS
 
         Returns:
             str: 提取的文本
         """
+        key, cached_text = self._lookup_cache(image, cache_key)
+        if cached_text is not None:
+            return cached_text
+
         try:
             preprocessed_image = self.preprocess_image(image)  # 图像预处理
 
-            # 使用 PaddleOCR
-            results = self.ocr_engine.ocr(preprocessed_image, cls=True)
-            text = "\n".join([line[1][0] for line in results[0]]) if results else ""
+            # 使用 PaddleOCR（没有检测到文字时结果为 [None]）
+            cls = OCRConfig.USE_ANGLE_CLS if cls is None else cls
+            results = self.ocr_engine.ocr(preprocessed_image, cls=cls)
+            text = "\n".join([line[1][0] for line in results[0]]) if results and results[0] else ""
 
             # 清理并格式化提取的文本
             cleaned_text = self.clean_text(text)
             self.logger.info(f"OCR 提取文本: {cleaned_text}")
+            if key is not None:
+                self.cache.put(key, cleaned_text)
             return cleaned_text
 
         except Exception as e:
             self.logger.error(f"OCR 提取失败: {str(e)}")
-            return ""
\ No newline at end of file
+            return ""
+
+    def extract_text_batch(self, crops, cache_keys=None, cls=None):
+        """
+        从多个裁剪区域中批量提取文本
+
+        每个区域单独做文字检测，所有区域检测到的文字行合并成一批做方向分类和识别，
+        避免每个区域分别承担一次完整 ocr() 调用的开销。
+
+        Args:
+            crops (List[numpy.ndarray]): 裁剪区域
+            cache_keys (List, optional): 每个区域的缓存附加键（如跟踪ID）
+            cls (bool, optional): 是否运行方向分类器，默认使用 OCRConfig.USE_ANGLE_CLS
+
+        Returns:
+            List[str]: 与输入顺序一致的文本，识别失败的区域为空字符串
+        """
+        cls = OCRConfig.USE_ANGLE_CLS if cls is None else cls
+        cache_keys = cache_keys or [None] * len(crops)
+        texts = [""] * len(crops)
+        keys = [None] * len(crops)
+
+        # 1. 查询缓存，未命中的区域逐个做文字检测并切出文字行
+        lines, owners = [], []
+        for index, (crop, cache_key) in enumerate(zip(crops, cache_keys)):
+            keys[index], cached_text = self._lookup_cache(crop, cache_key)
+            if cached_text is not None:
+                texts[index] = cached_text
+                keys[index] = None  # 命中缓存的区域不再写入
+                continue
+            try:
+                image = self.preprocess_image(crop)
+                if image.ndim == 2:
+                    image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+                boxes, _ = self.ocr_engine.text_detector(image)
+                if boxes is None:
+                    continue
+                for box in self._sort_boxes(boxes):
+                    lines.append(self._crop_text_line(image, box))
+                    owners.append(index)
+            except Exception as e:
+                self.logger.error(f"文字检测失败: {str(e)}")
+                keys[index] = None  # 失败的结果不缓存
+
+        # 2. 所有文字行合并成一批做方向分类和识别
+        recognized = [[] for _ in crops]
+        if lines:
+            try:
+                if cls and getattr(self.ocr_engine, 'use_angle_cls', False):
+                    lines, _, _ = self.ocr_engine.text_classifier(lines)
+                results, _ = self.ocr_engine.text_recognizer(lines)
+                for owner, (text, score) in zip(owners, results):
+                    if score >= self.ocr_engine.drop_score:
+                        recognized[owner].append(text)
+            except Exception as e:
+                self.logger.error(f"批量文字识别失败: {str(e)}")
+                return texts
+
+        # 3. 按区域拼接文字行并写入缓存
+        for index, key in enumerate(keys):
+            if texts[index]:
+                continue
+            texts[index] = self.clean_text("\n".join(recognized[index]))
+            if key is not None:
+                self.cache.put(key, texts[index])
+        self.logger.info(f"OCR 批量提取文本: {texts}（{len(crops)} 个区域，{len(lines)} 行文字）")
+        return texts
+
+    @staticmethod
+    def _sort_boxes(boxes):
+        """把文字框按从上到下、同一行内从左到右排序（与 PaddleOCR 的阅读顺序一致）"""
+        boxes = sorted(boxes, key=lambda box: (box[0][1], box[0][0]))
+        for i in range(len(boxes) - 1):
+            for j in range(i, -1, -1):
+                # 左上角纵坐标相差不到10像素视为同一行
+                if abs(boxes[j + 1][0][1] - boxes[j][0][1]) < 10 and boxes[j + 1][0][0] < boxes[j][0][0]:
+                    boxes[j], boxes[j + 1] = boxes[j + 1], boxes[j]
+                else:
+                    break
+        return boxes
+
+    @staticmethod
+    def _crop_text_line(image, box):
+        """
+        按文字框的四个顶点透视变换切出水平的文字行图像
+
+        Args:
+            image (numpy.ndarray): 图像
+            box (numpy.ndarray): 文字框顶点 (4, 2)，顺序为左上、右上、右下、左下
+
+        Returns:
+            numpy.ndarray: 文字行图像（竖排的窄高区域旋转为横排）
+        """
+        points = np.asarray(box, dtype=np.float32)
+        width = int(max(np.linalg.norm(points[0] - points[1]), np.linalg.norm(points[2] - points[3])))
+        height = int(max(np.linalg.norm(points[0] - points[3]), np.linalg.norm(points[1] - points[2])))
+        target = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+        matrix = cv2.getPerspectiveTransform(points, target)
+        line = cv2.warpPerspective(image, matrix, (width, height),
+                                   borderMode=cv2.BORDER_REPLICATE, flags=cv2.INTER_CUBIC)
+        if line.shape[0] >= line.shape[1] * 1.5:
+            line = np.rot90(line)
+        return line
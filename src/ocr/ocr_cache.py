@@ -0,0 +1,154 @@
+# src/ocr/ocr_cache.py
+import threading
+import time
+from collections import OrderedDict
+import cv2
+from .ocr_config import OCRConfig
+
+
+def dhash(image, hash_size=None):
+    """
+    计算图像的差值哈希（dHash）
+
+    图像先归一化为 (hash_size + 1) x hash_size 的灰度缩略图，再比较水平相邻像素的大小，
+    对缩放、轻微模糊和整体亮度变化不敏感。
+
+    Args:
+        image (numpy.ndarray): 输入图像（BGR 或灰度）
+        hash_size (int, optional): 哈希尺寸，默认使用 OCRConfig.HASH_SIZE
+
+    Returns:
+        int: 哈希值（hash_size * hash_size 位）
+    """
+    hash_size = hash_size or OCRConfig.HASH_SIZE
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    thumb = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (thumb[:, 1:] > thumb[:, :-1]).ravel()
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+
+def hamming_distance(a, b):
+    """两个哈希值的汉明距离"""
+    return bin(a ^ b).count('1')
+
+
+class OCRResultCache:
+    """
+    OCR 识别结果缓存
+
+    以裁剪区域的 dHash（可附加跟踪ID等键）为键的 LRU 缓存，条目超过有效期后失效。
+    空结果（目标刚进入画面、文字模糊等）只使用很短的有效期，以免掩盖之后能识别出的文字。
+    查询时先找完全相同的键，再在同一附加键下找汉明距离足够小的哈希。
+    """
+
+    def __init__(self, max_entries=None, ttl=None, max_distance=None, hash_size=None, empty_ttl=None):
+        """
+        初始化识别结果缓存
+
+        Args:
+            max_entries (int, optional): 最多缓存的结果数，默认使用 OCRConfig.CACHE_MAX_ENTRIES
+            ttl (float, optional): 有效期（秒），默认使用 OCRConfig.CACHE_TTL_SECONDS
+            max_distance (int, optional): 视为同一内容的最大汉明距离，默认使用 OCRConfig.HASH_MAX_DISTANCE
+            hash_size (int, optional): dHash 尺寸，默认使用 OCRConfig.HASH_SIZE
+            empty_ttl (float, optional): 空结果的有效期（秒），默认使用 OCRConfig.EMPTY_CACHE_TTL_SECONDS，
+                0 表示不缓存空结果
+        """
+        self.max_entries = max_entries or OCRConfig.CACHE_MAX_ENTRIES
+        self.ttl = ttl or OCRConfig.CACHE_TTL_SECONDS
+        self.empty_ttl = OCRConfig.EMPTY_CACHE_TTL_SECONDS if empty_ttl is None else empty_ttl
+        self.max_distance = OCRConfig.HASH_MAX_DISTANCE if max_distance is None else max_distance
+        self.hash_size = hash_size or OCRConfig.HASH_SIZE
+        # (附加键, 哈希) -> (文本, 过期时间)，按使用顺序排列
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, image, extra_key=None):
+        """
+        计算缓存键
+
+        Args:
+            image (numpy.ndarray): 裁剪区域
+            extra_key (optional): 附加键（如跟踪ID）
+
+        Returns:
+            tuple: (附加键, 哈希)
+        """
+        return extra_key, dhash(image, self.hash_size)
+
+    def get(self, key):
+        """
+        查询缓存
+
+        Args:
+            key (tuple): make_key() 返回的缓存键
+
+        Returns:
+            str: 缓存的文本，未命中时返回 None
+        """
+        now = time.time()
+        with self._lock:
+            match = key if key in self._entries else None
+            if match is None and self.max_distance > 0:
+                extra_key, value = key
+                for candidate in reversed(self._entries):
+                    if (candidate[0] == extra_key
+                            and hamming_distance(candidate[1], value) <= self.max_distance):
+                        match = candidate
+                        break
+
+            if match is not None:
+                text, expires = self._entries[match]
+                if now <= expires:
+                    self._entries.move_to_end(match)
+                    self.hits += 1
+                    return text
+                del self._entries[match]
+            self.misses += 1
+            return None
+
+    def put(self, key, text):
+        """
+        写入缓存，超出容量时淘汰最久未使用的条目
+
+        Args:
+            key (tuple): make_key() 返回的缓存键
+            text (str): 识别出的文本（空文本使用 empty_ttl）
+        """
+        ttl = self.ttl if text else self.empty_ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (text, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        """
+        获取缓存统计信息
+
+        Returns:
+            dict: 条目数、命中/未命中/淘汰次数和命中率
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
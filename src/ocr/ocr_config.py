@@ -3,4 +3,47 @@ class OCRConfig:
     """OCR 模块配置"""
     # PaddleOCR 配置可以在这里添加
     LANGUAGE = 'ch'  # 默认中文
-    USE_GPU = True  # 默认不使用 GPU
\ No newline at end of file
+    USE_GPU = True  # 默认不使用 GPU
+
+    # 基于检测结果的 OCR：只识别带文字目标的裁剪区域，在后台线程中运行
+    ENABLED = True  # 是否启用检测驱动的 OCR
+    OCR_CLASSES = ['bus', 'stop sign']  # 需要识别文字的检测类别（公交车线路牌、标志牌）
+    QUEUE_MAX_SIZE = 4  # 待识别裁剪区域队列的最大长度，队列满时丢弃新的请求
+    CROP_PADDING = 0.05  # 裁剪区域向外扩展的比例（相对检测框宽高）
+    MIN_CROP_SIZE = 32  # 检测框短边小于该像素数时不识别（文字太小，识别不可靠）
+    MAX_CROP_SIDE = 640  # 裁剪区域长边超过该像素数时缩小后再识别
+    RESUBMIT_SECONDS = 1.0  # 同一目标两次提交识别的最短间隔（秒）
+    RESULT_TTL_SECONDS = 5.0  # 识别结果的有效期（秒），过期后不再附加到检测结果
+
+    # 识别前的图像预处理（python -m src.ocr.preprocessing 在样本裁剪区域上对比各预设）
+    PREPROCESS_PRESET = 'speed'  # 使用的预设，见 PREPROCESS_PRESETS
+    PREPROCESS_PRESETS = {
+        'speed': ['gray', 'resize'],  # 只做灰度化和尺寸归一化
+        'quality': ['gray', 'resize', 'clahe', 'denoise'],  # 增加局部对比度增强和轻量去噪
+        'binary': ['gray', 'resize', 'denoise', 'otsu'],  # 二值化（高对比度的标志牌）
+    }
+    RESIZE_HEIGHT = 320  # 缩放后的图像高度（像素），使文字高度落在识别模型适合的范围内
+    MAX_UPSCALE = 3.0  # 最大放大倍数，避免把很小的裁剪区域放大出大量插值噪声
+    CLAHE_CLIP_LIMIT = 2.0  # CLAHE 对比度限制
+    CLAHE_TILE_GRID = (8, 8)  # CLAHE 网格大小
+    DENOISE_KERNEL = 3  # 中值滤波核大小（代替全图非局部均值去噪）
+
+    # 识别结果缓存：按裁剪区域的感知哈希（dHash）缓存，同一块标志牌只识别一次
+    CACHE_ENABLED = True  # 是否启用识别结果缓存
+    CACHE_MAX_ENTRIES = 128  # 最多缓存的结果数，超出时淘汰最久未使用的
+    CACHE_TTL_SECONDS = 30.0  # 缓存结果的有效期（秒）
+    EMPTY_CACHE_TTL_SECONDS = 2.0  # 空结果的有效期（秒），0 表示不缓存空结果
+    HASH_SIZE = 8  # dHash 尺寸（哈希位数为 HASH_SIZE 的平方）
+    HASH_MAX_DISTANCE = 3  # 汉明距离不超过该值的哈希视为同一内容（0 表示只接受完全相同）
+
+    # PaddleOCR 推理
+    LOAD_ANGLE_CLASSIFIER = True  # 加载方向分类器（之后可按调用选择是否使用）
+    USE_ANGLE_CLS = False  # 默认是否运行方向分类器（公交线路牌、标志牌通常是正向的）
+    REC_BATCH_NUM = 16  # 文字识别的批大小（extract_text_batch 把多个区域的文字行合并成一批）
+    CPU_THREADS = 2  # PaddleOCR 的 CPU 线程数（与检测器共享 CPU，不宜过多）
+
+    # OCR 工作方式
+    WORKER_BACKEND = 'process'  # 'thread': 进程内后台线程; 'process': 独立进程，裁剪区域通过共享内存传递
+    SERVICE_SLOTS = 4  # 进程外 OCR 的共享内存槽位数（同时在途的请求数上限），槽位用完时丢弃新的请求
+    SERVICE_PROCESS_NICE = 5  # OCR 进程的 nice 增量，降低其 CPU 优先级，优先保证检测延迟
+    REQUEST_MAX_AGE_SECONDS = 2.0  # 等待超过该时间的请求不再识别（目标可能已离开画面）
@@ -0,0 +1,26 @@
+# src/ocr/ocr_factory.py
+from .ocr_config import OCRConfig
+from .ocr_worker import OCRWorker
+from .ocr_service import OCRService
+
+
+def create_ocr_worker(ocr=None, backend=None):
+    """
+    根据配置创建 OCR 工作者
+
+    Args:
+        ocr (optional): 进程内 OCR 实例（'thread' 后端使用，未提供时新建）
+        backend (str, optional): 'thread' 或 'process'，默认使用 OCRConfig.WORKER_BACKEND
+
+    Returns:
+        OCRWorker 或 OCRService 实例，二者接口一致（submit / get_text / get_stats / stop）
+    """
+    backend = backend or OCRConfig.WORKER_BACKEND
+    if backend == 'process':
+        return OCRService()
+    if backend != 'thread':
+        raise ValueError(f"未知的 OCR 工作方式: {backend}")
+    if ocr is None:
+        from .ocr import OCR
+        ocr = OCR()
+    return OCRWorker(ocr)
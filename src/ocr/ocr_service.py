@@ -0,0 +1,336 @@
+# src/ocr/ocr_service.py
+import os
+import queue
+import time
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from .ocr_config import OCRConfig
+from src.utils.logger import setup_logger
+
+# 服务进程回传的消息类型
+MSG_READY = 'ready'  # OCR 引擎初始化完成
+MSG_ERROR = 'error'  # OCR 引擎初始化失败，服务进程退出
+MSG_RESULT = 'result'  # 识别结果
+MSG_CANCELLED = 'cancelled'  # 请求已取消或已过期，未识别
+
+
+def _slot_arrays(requests_buf, crops_buf, num_slots, max_side):
+    """在共享内存上构建槽位请求ID数组和裁剪区域数组视图"""
+    slot_requests = np.ndarray((num_slots,), dtype=np.int64, buffer=requests_buf)
+    crops = np.ndarray((num_slots, max_side, max_side, 3), dtype=np.uint8, buffer=crops_buf)
+    return slot_requests, crops
+
+
+def _service_process_main(requests_name, crops_name, num_slots, max_side, request_queue, result_queue):
+    """
+    OCR 服务进程入口：初始化一次 PaddleOCR 引擎，从共享内存槽位读取裁剪区域并识别
+
+    请求协议：
+      1. 主进程把裁剪区域写入空闲槽位，把请求ID写入该槽位的请求ID，再通过请求队列发送请求；
+      2. 服务进程一次取出队列中的全部请求，跳过槽位请求ID已变化（被取消）或等待过久的请求；
+      3. 其余请求合并识别，每个请求都回传一条消息，主进程收到后才释放槽位。
+
+    Args:
+        requests_name (str): 槽位请求ID共享内存名称
+        crops_name (str): 裁剪区域共享内存名称
+        num_slots (int): 槽位数量
+        max_side (int): 槽位的最大边长
+        request_queue: 请求队列，None 表示停止
+        result_queue: 结果队列
+    """
+    from .ocr import OCR
+
+    logger = setup_logger('OCRService')
+    if OCRConfig.SERVICE_PROCESS_NICE and hasattr(os, 'nice'):
+        # 降低 OCR 进程的优先级，CPU 紧张时优先保证检测
+        os.nice(OCRConfig.SERVICE_PROCESS_NICE)
+
+    requests_shm = shared_memory.SharedMemory(name=requests_name)
+    crops_shm = shared_memory.SharedMemory(name=crops_name)
+    slot_requests, crops = _slot_arrays(requests_shm.buf, crops_shm.buf, num_slots, max_side)
+    try:
+        ocr = OCR()
+    except Exception as e:
+        result_queue.put((MSG_ERROR, f"OCR 引擎初始化失败: {str(e)}"))
+        slot_requests = crops = None  # 先释放共享内存上的数组视图，否则 close() 会报 BufferError
+        requests_shm.close()
+        crops_shm.close()
+        return
+    result_queue.put((MSG_READY,))
+    logger.info("OCR 服务进程已启动")
+
+    running = True
+    while running:
+        batch = [request_queue.get()]
+        # 一次取出队列中已有的全部请求
+        while True:
+            try:
+                batch.append(request_queue.get_nowait())
+            except queue.Empty:
+                break
+        if None in batch:
+            running = False
+            batch = [request for request in batch if request is not None]
+
+        active = []
+        now = time.time()
+        for request in batch:
+            request_id, slot, key, shape, submitted = request
+            if slot_requests[slot] != request_id or now - submitted > OCRConfig.REQUEST_MAX_AGE_SECONDS:
+                result_queue.put((MSG_CANCELLED, request_id, slot))
+            else:
+                active.append(request)
+        if not active or not running:
+            for request_id, slot, _, _, _ in active:
+                result_queue.put((MSG_CANCELLED, request_id, slot))
+            continue
+
+        start_time = time.perf_counter()
+        views = [crops[slot, :shape[0], :shape[1]] for _, slot, _, shape, _ in active]
+        keys = [key for _, _, key, _, _ in active]
+        try:
+            if len(active) > 1:
+                texts = ocr.extract_text_batch(views, cache_keys=keys)
+            else:
+                texts = [ocr.extract_text(views[0], cache_key=keys[0])]
+        except Exception as e:
+            logger.error(f"OCR 识别失败: {str(e)}")
+            texts = [""] * len(active)
+        elapsed = (time.perf_counter() - start_time) / len(active)
+        views = None
+
+        for (request_id, slot, _, _, _), text in zip(active, texts):
+            result_queue.put((MSG_RESULT, request_id, slot, text, elapsed))
+
+    slot_requests = crops = None  # 先释放共享内存上的数组视图，否则 close() 会报 BufferError
+    requests_shm.close()
+    crops_shm.close()
+    logger.info("OCR 服务进程已退出")
+
+
+class OCRService:
+    """
+    进程外 OCR 服务
+
+    在独立进程中初始化一次 PaddleOCR 引擎，与检测器分开占用 CPU。裁剪区域写入共享内存槽位，
+    队列中只传递槽位索引和形状，不经过 pickle 传递图像。接口与 OCRWorker 保持一致：
+    submit() 不阻塞，槽位用完（服务忙）、服务未就绪或已退出时直接丢弃请求；
+    同一目标提交新的裁剪区域时取消仍在排队的旧请求。
+    """
+
+    def __init__(self, num_slots=None, max_side=None, result_ttl=None):
+        """
+        初始化并启动 OCR 服务进程（不等待 OCR 引擎初始化完成）
+
+        Args:
+            num_slots (int, optional): 共享内存槽位数，默认使用 OCRConfig.SERVICE_SLOTS
+            max_side (int, optional): 裁剪区域的最大边长，默认使用 OCRConfig.MAX_CROP_SIDE
+            result_ttl (float, optional): 识别结果的有效期（秒），默认使用 OCRConfig.RESULT_TTL_SECONDS
+        """
+        self.logger = setup_logger('OCRService')
+        self.num_slots = num_slots or OCRConfig.SERVICE_SLOTS
+        self.max_side = max_side or OCRConfig.MAX_CROP_SIDE
+        self.result_ttl = result_ttl or OCRConfig.RESULT_TTL_SECONDS
+
+        # 共享内存由主进程创建和释放
+        self._requests_shm = shared_memory.SharedMemory(create=True, size=self.num_slots * 8)
+        self._crops_shm = shared_memory.SharedMemory(
+            create=True, size=self.num_slots * self.max_side * self.max_side * 3)
+        self.slot_requests, self.crops = _slot_arrays(
+            self._requests_shm.buf, self._crops_shm.buf, self.num_slots, self.max_side)
+        self.slot_requests[:] = 0
+
+        ctx = mp.get_context('spawn')
+        self.request_queue = ctx.Queue()
+        self.result_queue = ctx.Queue()
+        self.process = ctx.Process(
+            target=_service_process_main,
+            args=(self._requests_shm.name, self._crops_shm.name, self.num_slots, self.max_side,
+                  self.request_queue, self.result_queue),
+            name="OCRServiceProcess",
+            daemon=True
+        )
+        self.process.start()
+
+        self.ready = False
+        self.failed = False
+        self.stopped = False
+        self._next_request_id = 1
+        self._free_slots = list(range(self.num_slots))
+        self._requests = {}  # 请求ID -> (键, 槽位)
+        self._key_requests = {}  # 键 -> 在途的请求ID
+        self._results = {}  # 键 -> (文本, 完成时间)
+
+        # 统计信息
+        self.submitted = 0
+        self.dropped = 0
+        self.cancelled = 0
+        self.completed = 0
+        self.total_latency = 0.0
+
+    def _collect(self):
+        """取出服务进程回传的全部消息（不阻塞），更新识别结果并释放槽位（服务已停止时不再处理）"""
+        while not self.stopped:
+            try:
+                message = self.result_queue.get_nowait()
+            except (queue.Empty, OSError, ValueError):
+                break
+
+            kind = message[0]
+            if kind == MSG_READY:
+                self.ready = True
+                self.logger.info("OCR 服务已就绪")
+                continue
+            if kind == MSG_ERROR:
+                self.failed = True
+                self.logger.error(message[1])
+                continue
+
+            request_id, slot = message[1], message[2]
+            key, _ = self._requests.pop(request_id, (None, None))
+            if self._key_requests.get(key) == request_id:
+                del self._key_requests[key]
+            if self.slot_requests[slot] == request_id:
+                self.slot_requests[slot] = 0
+            self._free_slots.append(slot)
+
+            if kind == MSG_CANCELLED:
+                self.cancelled += 1
+            elif kind == MSG_RESULT:
+                text, elapsed = message[3], message[4]
+                self.completed += 1
+                self.total_latency += elapsed
+                if key is not None:
+                    now = time.time()
+                    # 顺便清理过期结果，离开画面的目标不会再被查询
+                    self._results = {k: v for k, v in self._results.items() if now - v[1] <= self.result_ttl}
+                    self._results[key] = (text, now)
+
+    @property
+    def available(self):
+        """服务进程是否仍可接受请求"""
+        return not self.stopped and not self.failed and self.process.is_alive()
+
+    def submit(self, key, crop):
+        """
+        提交一个裁剪区域等待识别（不阻塞）
+
+        Args:
+            key: 目标的键（如跟踪ID），识别结果按该键保存
+            crop (numpy.ndarray): 裁剪区域（BGR，长边不超过 max_side）
+
+        Returns:
+            bool: 是否已提交（服务未就绪或不可用、没有空闲槽位或裁剪区域过大时返回 False）
+        """
+        self._collect()
+        if not self.ready or not self.available:
+            # OCR 引擎仍在初始化时不排队，以免启动后集中处理一批过期请求
+            self.dropped += 1
+            return False
+
+        if not self._free_slots:
+            # 服务忙，丢弃请求，检测主循环不等待
+            self.dropped += 1
+            return False
+        height, width = crop.shape[:2]
+        if crop.ndim != 3 or crop.shape[2] != 3 or max(height, width) > self.max_side:
+            self.logger.warning(f"裁剪区域形状不支持: {crop.shape}")
+            self.dropped += 1
+            return False
+
+        # 同一目标的新裁剪区域取代仍在排队的旧请求
+        self.cancel(key)
+
+        slot = self._free_slots.pop()
+        np.copyto(self.crops[slot, :height, :width], crop)
+        request_id = self._next_request_id
+        self._next_request_id += 1
+        self.slot_requests[slot] = request_id
+        self._requests[request_id] = (key, slot)
+        self._key_requests[key] = request_id
+        self.request_queue.put((request_id, slot, key, (height, width), time.time()))
+        self.submitted += 1
+        return True
+
+    def cancel(self, key):
+        """
+        取消目标仍在排队的请求（服务进程会跳过该请求，槽位在收到回执后释放）
+
+        Args:
+            key: 目标的键
+
+        Returns:
+            bool: 是否有请求被取消
+        """
+        request_id = self._key_requests.pop(key, None)
+        if request_id is None or self.stopped:
+            return False
+        _, slot = self._requests[request_id]
+        if self.slot_requests[slot] == request_id:
+            self.slot_requests[slot] = 0
+        return True
+
+    def get_text(self, key):
+        """
+        获取目标最近一次的识别结果
+
+        Args:
+            key: 目标的键
+
+        Returns:
+            str: 识别出的文本；没有结果、结果为空或已过期时返回 None
+        """
+        self._collect()
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        text, finished = entry
+        if time.time() - finished > self.result_ttl:
+            del self._results[key]
+            return None
+        return text or None
+
+    def get_stats(self):
+        """
+        获取 OCR 统计信息
+
+        Returns:
+            dict: 服务状态，提交、丢弃、取消和完成的请求数，在途请求数和每个区域的平均识别耗时（毫秒）
+        """
+        self._collect()
+        return {
+            'ready': self.ready,
+            'available': self.available,
+            'submitted': self.submitted,
+            'dropped': self.dropped,
+            'cancelled': self.cancelled,
+            'completed': self.completed,
+            'in_flight': len(self._requests),
+            'mean_latency_ms': self.total_latency / self.completed * 1000.0 if self.completed else 0.0
+        }
+
+    def stop(self):
+        """停止服务进程并释放共享内存"""
+        if self.stopped:
+            return
+        self.stopped = True
+        self.slot_requests[:] = 0  # 取消全部在途请求
+        try:
+            self.request_queue.put(None)
+        except (OSError, ValueError):
+            pass
+        if self.process.is_alive():
+            self.process.join(timeout=2.0)
+            if self.process.is_alive():
+                self.logger.warning("OCR 服务进程未能按时退出，强制终止")
+                self.process.terminate()
+
+        self.slot_requests = self.crops = None
+        for shm in (self._requests_shm, self._crops_shm):
+            try:
+                shm.close()
+                shm.unlink()
+            except (BufferError, FileNotFoundError):
+                self.logger.warning("共享内存仍被引用或已释放")
+        self.logger.info("OCR 服务已停止")
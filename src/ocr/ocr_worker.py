@@ -0,0 +1,220 @@
+# src/ocr/ocr_worker.py
+import threading
+import queue
+import time
+import cv2
+from .ocr_config import OCRConfig
+from src.utils.logger import setup_logger
+
+
+def crop_for_ocr(frame, bbox, padding=None, min_size=None, max_side=None):
+    """
+    从视频帧中裁剪检测框区域用于 OCR
+
+    返回的是独立的副本（视频帧可能是捕获层环形缓冲区的只读视图，处理完后会被覆盖）。
+
+    Args:
+        frame (numpy.ndarray): 视频帧
+        bbox (List[float]): 检测框 [x1, y1, x2, y2]（原图像素坐标）
+        padding (float, optional): 向外扩展的比例，默认使用 OCRConfig.CROP_PADDING
+        min_size (int, optional): 检测框短边的最小像素数，默认使用 OCRConfig.MIN_CROP_SIZE
+        max_side (int, optional): 裁剪区域长边的最大像素数，默认使用 OCRConfig.MAX_CROP_SIDE
+
+    Returns:
+        numpy.ndarray: 裁剪区域，检测框太小时返回 None
+    """
+    padding = OCRConfig.CROP_PADDING if padding is None else padding
+    min_size = min_size or OCRConfig.MIN_CROP_SIZE
+    max_side = max_side or OCRConfig.MAX_CROP_SIDE
+
+    x1, y1, x2, y2 = bbox
+    width, height = x2 - x1, y2 - y1
+    if min(width, height) < min_size:
+        return None
+
+    frame_height, frame_width = frame.shape[:2]
+    x1 = max(0, int(x1 - width * padding))
+    y1 = max(0, int(y1 - height * padding))
+    x2 = min(frame_width, int(x2 + width * padding))
+    y2 = min(frame_height, int(y2 + height * padding))
+    crop = frame[y1:y2, x1:x2]
+
+    scale = max_side / max(crop.shape[:2])
+    if scale < 1.0:
+        # 缩小时 resize 本身生成新图像，不需要再复制
+        return cv2.resize(crop, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return crop.copy()
+
+
+class OCRWorker:
+    """
+    后台 OCR 工作线程
+
+    主循环通过 submit() 提交裁剪区域后立即返回，不会因为 OCR 阻塞；
+    工作线程从有界队列中取出裁剪区域识别，结果按目标的键保存，主循环用 get_text() 查询。
+    队列已满时直接丢弃新的请求（下一次提交时目标通常仍在画面中）。
+    """
+
+    def __init__(self, ocr, max_queue_size=None, result_ttl=None):
+        """
+        初始化 OCR 工作线程
+
+        Args:
+            ocr: OCR 实例（提供 extract_text 方法）
+            max_queue_size (int, optional): 队列最大长度，默认使用 OCRConfig.QUEUE_MAX_SIZE
+            result_ttl (float, optional): 识别结果的有效期（秒），默认使用 OCRConfig.RESULT_TTL_SECONDS
+        """
+        self.logger = setup_logger('OCRWorker')
+        self.ocr = ocr
+        self.result_ttl = result_ttl or OCRConfig.RESULT_TTL_SECONDS
+        self.queue = queue.Queue(maxsize=max_queue_size or OCRConfig.QUEUE_MAX_SIZE)
+        self.stop_event = threading.Event()
+
+        # 识别结果：键 -> (文本, 完成时间)；排队中的键不重复提交
+        self._lock = threading.Lock()
+        self._results = {}
+        self._pending = set()
+
+        # 统计信息
+        self.submitted = 0
+        self.dropped = 0
+        self.completed = 0
+        self.total_latency = 0.0
+
+        self.worker_thread = threading.Thread(
+            target=self._process_queue,
+            name="OCRWorkerThread",
+            daemon=True
+        )
+        self.worker_thread.start()
+
+    def submit(self, key, crop):
+        """
+        提交一个裁剪区域等待识别（不阻塞）
+
+        Args:
+            key: 目标的键（如跟踪ID），识别结果按该键保存
+            crop (numpy.ndarray): 裁剪区域
+
+        Returns:
+            bool: 是否已加入队列（已停止、同一目标仍在排队或队列已满时返回 False）
+        """
+        if self.stop_event.is_set():
+            return False
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+        try:
+            self.queue.put_nowait((key, crop))
+        except queue.Full:
+            with self._lock:
+                self._pending.discard(key)
+            self.dropped += 1
+            return False
+        self.submitted += 1
+        return True
+
+    def get_text(self, key):
+        """
+        获取目标最近一次的识别结果
+
+        Args:
+            key: 目标的键
+
+        Returns:
+            str: 识别出的文本；没有结果、结果为空或已过期时返回 None
+        """
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is None:
+                return None
+            text, finished = entry
+            if time.time() - finished > self.result_ttl:
+                del self._results[key]
+                return None
+        return text or None
+
+    def _recognize(self, batch):
+        """
+        识别一批裁剪区域；OCR 支持批量识别时多个区域的文字行合并成一批
+
+        Args:
+            batch (List[Tuple]): (键, 裁剪区域) 列表
+
+        Returns:
+            List[str]: 与输入顺序一致的文本
+        """
+        keys = [key for key, _ in batch]
+        crops = [crop for _, crop in batch]
+        try:
+            if len(batch) > 1 and hasattr(self.ocr, 'extract_text_batch'):
+                return self.ocr.extract_text_batch(crops, cache_keys=keys)
+            return [self.ocr.extract_text(crop, cache_key=key) for key, crop in batch]
+        except Exception as e:
+            self.logger.error(f"OCR 识别失败: {str(e)}")
+            return [""] * len(batch)
+
+    def _process_queue(self):
+        """工作线程函数：持续从队列中取出裁剪区域识别，直到 stop_event 被设置"""
+        self.logger.info("OCR 工作线程启动")
+        while not self.stop_event.is_set():
+            try:
+                batch = [self.queue.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            # 一次取出队列中已有的全部请求（如同一帧的公交车和标志牌）
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            start_time = time.perf_counter()
+            texts = self._recognize(batch)
+            self.total_latency += time.perf_counter() - start_time
+            self.completed += len(batch)
+
+            with self._lock:
+                now = time.time()
+                # 顺便清理过期结果，离开画面的目标不会再被查询
+                self._results = {k: v for k, v in self._results.items() if now - v[1] <= self.result_ttl}
+                for (key, _), text in zip(batch, texts):
+                    self._results[key] = (text, now)
+                    self._pending.discard(key)
+            for _ in batch:
+                self.queue.task_done()
+
+        self.logger.info("OCR 工作线程已退出")
+
+    def get_stats(self):
+        """
+        获取 OCR 统计信息
+
+        Returns:
+            dict: 提交、丢弃和完成的请求数，当前队列长度、每个区域的平均识别耗时（毫秒）和识别结果缓存统计
+        """
+        cache = getattr(self.ocr, 'cache', None)
+        return {
+            'submitted': self.submitted,
+            'dropped': self.dropped,
+            'completed': self.completed,
+            'queue_size': self.queue.qsize(),
+            'mean_latency_ms': self.total_latency / self.completed * 1000.0 if self.completed else 0.0,
+            'cache': cache.get_stats() if cache is not None else None
+        }
+
+    def stop(self):
+        """停止工作线程：清空队列并等待线程退出"""
+        self.stop_event.set()
+        while not self.queue.empty():
+            try:
+                self.queue.get_nowait()
+                self.queue.task_done()
+            except queue.Empty:
+                break
+        if self.worker_thread.is_alive():
+            self.worker_thread.join(timeout=2.0)
+            if self.worker_thread.is_alive():
+                self.logger.warning("OCR 工作线程未能在超时时间内退出")
+        self.logger.info("OCR 工作线程已停止")
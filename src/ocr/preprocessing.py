@@ -0,0 +1,233 @@
+# src/ocr/preprocessing.py
+import json
+import os
+import time
+from pathlib import Path
+import cv2
+import numpy as np
+from .ocr_config import OCRConfig
+from src.config import LOGS_DIR
+from src.utils.logger import setup_logger
+
+# 样本裁剪区域支持的图片格式
+IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+class PreprocessPipeline:
+    """
+    可配置的 OCR 预处理流水线
+
+    按顺序执行若干阶段（gray、resize、clahe、otsu、denoise），并累计每个阶段的耗时。
+    阶段只在裁剪区域上运行，去噪使用中值滤波，不再对整幅图像做非局部均值去噪。
+    """
+
+    STAGES = ('gray', 'resize', 'clahe', 'otsu', 'denoise')
+
+    def __init__(self, stages, config=None):
+        """
+        初始化预处理流水线
+
+        Args:
+            stages (List[str]): 按顺序执行的阶段名称
+            config (optional): OCR 配置
+        """
+        unknown = [stage for stage in stages if stage not in self.STAGES]
+        if unknown:
+            raise ValueError(f"未知的预处理阶段: {unknown}，可选: {self.STAGES}")
+        self.config = config or OCRConfig()
+        self.stages = list(stages)
+        self._clahe = cv2.createCLAHE(clipLimit=self.config.CLAHE_CLIP_LIMIT,
+                                      tileGridSize=tuple(self.config.CLAHE_TILE_GRID))
+        self.reset_timings()
+
+    @classmethod
+    def from_preset(cls, preset=None, config=None):
+        """
+        按预设名称创建流水线
+
+        Args:
+            preset (str, optional): 预设名称，默认使用 config.PREPROCESS_PRESET
+            config (optional): OCR 配置
+
+        Returns:
+            PreprocessPipeline: 预处理流水线
+        """
+        config = config or OCRConfig()
+        preset = preset or config.PREPROCESS_PRESET
+        if preset not in config.PREPROCESS_PRESETS:
+            raise ValueError(f"未知的预处理预设: {preset}，可选: {list(config.PREPROCESS_PRESETS)}")
+        return cls(config.PREPROCESS_PRESETS[preset], config)
+
+    def _gray(self, image):
+        """转为灰度图"""
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+
+    def _resize(self, image):
+        """把图像缩放到 RESIZE_HEIGHT 高（放大倍数不超过 MAX_UPSCALE）"""
+        scale = min(self.config.RESIZE_HEIGHT / image.shape[0], self.config.MAX_UPSCALE)
+        if abs(scale - 1.0) < 0.05:
+            return image
+        interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+        return cv2.resize(image, None, fx=scale, fy=scale, interpolation=interpolation)
+
+    def _clahe_stage(self, image):
+        """局部对比度增强（灰度图）"""
+        return self._clahe.apply(self._gray(image))
+
+    def _otsu(self, image):
+        """Otsu 二值化（灰度图）"""
+        _, binary = cv2.threshold(self._gray(image), 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        return binary
+
+    def _denoise(self, image):
+        """中值滤波去噪"""
+        return cv2.medianBlur(image, self.config.DENOISE_KERNEL)
+
+    def __call__(self, image):
+        """
+        按顺序执行各阶段
+
+        Args:
+            image (numpy.ndarray): 输入图像（BGR 或灰度）
+
+        Returns:
+            numpy.ndarray: 预处理后的图像
+        """
+        functions = {
+            'gray': self._gray,
+            'resize': self._resize,
+            'clahe': self._clahe_stage,
+            'otsu': self._otsu,
+            'denoise': self._denoise
+        }
+        for stage in self.stages:
+            start_time = time.perf_counter()
+            image = functions[stage](image)
+            self._timings[stage] += time.perf_counter() - start_time
+        self.calls += 1
+        return image
+
+    def reset_timings(self):
+        """清空累计耗时"""
+        self._timings = {stage: 0.0 for stage in self.stages}
+        self.calls = 0
+
+    def get_timing_report(self):
+        """
+        获取每个阶段的平均耗时
+
+        Returns:
+            dict: 阶段名称到平均耗时（毫秒）的映射，以及合计 'total'
+        """
+        if not self.calls:
+            return {stage: 0.0 for stage in self.stages + ['total']}
+        report = {stage: round(elapsed / self.calls * 1000.0, 3) for stage, elapsed in self._timings.items()}
+        report['total'] = round(sum(self._timings.values()) / self.calls * 1000.0, 3)
+        return report
+
+
+def load_sample_crops(crops_dir):
+    """
+    读取样本裁剪区域
+
+    Args:
+        crops_dir: 图片目录
+
+    Returns:
+        List[Tuple[str, numpy.ndarray]]: (文件名, 图像) 列表，按文件名排序
+    """
+    crops = []
+    for path in sorted(Path(crops_dir).iterdir()):
+        if path.suffix.lower() not in IMAGE_SUFFIXES:
+            continue
+        image = cv2.imread(str(path))
+        if image is not None:
+            crops.append((path.name, image))
+    return crops
+
+
+def benchmark_presets(crops_dir, presets=None, ocr=None, reference='quality', output_path=None):
+    """
+    在样本裁剪区域上对比各预设的识别结果和耗时，并把报告写入 logs 目录
+
+    没有人工标注，以 reference 预设的识别结果为参考统计其他预设的一致率。
+    对比期间关闭 OCR 识别结果缓存，否则之后的预设会直接命中前一个预设的结果。
+
+    Args:
+        crops_dir: 样本裁剪区域目录
+        presets (List[str], optional): 要对比的预设，默认使用 OCRConfig.PREPROCESS_PRESETS 中的全部预设
+        ocr (optional): OCR 实例，默认新建（PaddleOCR 引擎只初始化一次，各预设共用）
+        reference (str): 作为参考的预设
+        output_path (optional): 报告路径，默认写入 logs/ocr_preprocess_report_<时间>.json
+
+    Returns:
+        dict: 对比报告
+    """
+    from .ocr import OCR
+
+    logger = setup_logger('ocr_preprocess')
+    crops = load_sample_crops(crops_dir)
+    if not crops:
+        raise RuntimeError(f"未在 {crops_dir} 中找到样本图片")
+    presets = presets or list(OCRConfig.PREPROCESS_PRESETS)
+    if reference not in presets:
+        presets = [reference] + presets
+    ocr = ocr or OCR()
+
+    texts = {}
+    report = {'crops_dir': str(crops_dir), 'crops': len(crops), 'reference': reference, 'presets': {}}
+    original_preprocessor, original_cache = ocr.preprocessor, getattr(ocr, 'cache', None)
+    ocr.cache = None
+    try:
+        for preset in presets:
+            pipeline = PreprocessPipeline.from_preset(preset)
+            ocr.preprocessor = pipeline
+            latencies = []
+            texts[preset] = []
+            for _, image in crops:
+                start_time = time.perf_counter()
+                texts[preset].append(ocr.extract_text(image))
+                latencies.append((time.perf_counter() - start_time) * 1000.0)
+            values = np.asarray(latencies)
+            report['presets'][preset] = {
+                'stages': pipeline.stages,
+                'preprocess_ms': pipeline.get_timing_report(),
+                'ocr_mean_ms': round(float(values.mean()), 2),
+                'ocr_p95_ms': round(float(np.percentile(values, 95)), 2),
+                'non_empty': sum(1 for text in texts[preset] if text)
+            }
+    finally:
+        ocr.preprocessor, ocr.cache = original_preprocessor, original_cache
+
+    for preset in presets:
+        agree = sum(a == b for a, b in zip(texts[preset], texts[reference]))
+        report['presets'][preset]['agreement'] = round(agree / len(crops), 4)
+    report['texts'] = {name: {preset: texts[preset][i] for preset in presets} for i, (name, _) in enumerate(crops)}
+
+    output_path = Path(output_path or os.path.join(
+        LOGS_DIR, f"ocr_preprocess_report_{time.strftime('%Y%m%d_%H%M%S')}.json"))
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    for preset, stats in report['presets'].items():
+        logger.info(f"{preset}: 预处理 {stats['preprocess_ms']['total']} ms, OCR 平均 {stats['ocr_mean_ms']} ms, "
+                    f"与 {reference} 一致率 {stats['agreement']}")
+    logger.info(f"报告: {output_path}")
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="对比 OCR 预处理预设的识别结果和耗时")
+    parser.add_argument('crops_dir', help="样本裁剪区域目录")
+    parser.add_argument('--presets', default=None, help="预设名称，逗号分隔，默认全部")
+    parser.add_argument('--reference', default='quality', help="作为参考的预设")
+    args = parser.parse_args()
+
+    benchmark_presets(
+        args.crops_dir,
+        presets=args.presets.split(',') if args.presets else None,
+        reference=args.reference
+    )
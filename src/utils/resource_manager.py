@@ -4,6 +4,7 @@ import traceback
 from src.detector.yolo import ObjectDetector
 from src.tts.TTSEngine import TTSEngine
 from src.ocr.ocr import OCR
+from src.ocr.ocr_config import OCRConfig
 from src.utils.logger import setup_logger
 
 
@@ -12,7 +13,7 @@ def initialize_modules():
     初始化检测器、TTS和OCR模块
 
     Returns:
-        tuple: (detector, tts_engine, ocr, logger)
+        tuple: (detector, tts_engine, ocr, logger)，OCR 在独立进程中运行时 ocr 为 None
 
     Raises:
         Exception: 初始化失败时抛出
@@ -30,27 +31,37 @@ def initialize_modules():
         tts_engine = TTSEngine()
         logger.info("TTS 引擎初始化成功")
 
-        # 初始化 OCR 模块
-        logger.info("初始化 OCR 模块...")
-        ocr = OCR()
-        logger.info("OCR 模块初始化成功")
+        # 初始化 OCR 模块（进程外 OCR 由服务进程自行初始化引擎）
+        ocr = None
+        if OCRConfig.ENABLED and OCRConfig.WORKER_BACKEND == 'thread':
+            logger.info("初始化 OCR 模块...")
+            ocr = OCR()
+            logger.info("OCR 模块初始化成功")
 
         return detector, tts_engine, ocr, logger
     except Exception as e:
         logger.error(f"初始化模块时发生错误: {str(e)}\n{traceback.format_exc()}")
         raise
 
-def cleanup_resources(cap=None, tts_engine=None):
+def cleanup_resources(cap=None, tts_engine=None, ocr_worker=None):
     """
     清理所有资源
 
     Args:
         cap: 视频捕获对象
         tts_engine: TTS引擎对象
+        ocr_worker: OCR工作线程或OCR服务
     """
     logger = setup_logger('cleanup')
     logger.info("清理资源...")
 
+    # 停止OCR工作者
+    if ocr_worker is not None:
+        try:
+            ocr_worker.stop()
+        except Exception as e:
+            logger.error(f"停止OCR工作者时发生错误: {str(e)}")
+
     # 首先停止TTS引擎
     if tts_engine is not None:
         try:
@@ -0,0 +1,55 @@
+# tests/test_batch_scheduler.py
+import time
+import cv2
+import numpy as np
+from src.detector.batch_scheduler import process_videos_offline
+
+
+class StubDetector:
+    """只记录批大小的检测器，每批固定耗时"""
+
+    def __init__(self, latency=0.005):
+        self.latency = latency
+        self.batch_sizes = []
+
+    def detect_batch(self, frames):
+        self.batch_sizes.append(len(frames))
+        time.sleep(self.latency)
+        return [[{'class': 'person', 'value': int(frame[0, 0, 0])}] for frame in frames]
+
+
+def _write_video(path, num_frames):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 30, (64, 48))
+    for index in range(num_frames):
+        writer.write(np.full((48, 64, 3), index * 4, dtype=np.uint8))
+    writer.release()
+
+
+def test_offline_processing_batches_frames_across_videos(tmp_path):
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"video{index}.avi"
+        _write_video(path, 40)
+        paths.append(path)
+    detector = StubDetector()
+
+    report = process_videos_offline(paths, detector=detector, output_path=tmp_path / "report.json",
+                                    max_batch_size=8, frames_in_flight=8)
+
+    assert [video['frames'] for video in report['videos']] == [40, 40, 40]
+    assert report['scheduler']['frames'] == 120
+    assert report['scheduler']['avg_batch_size'] > 1
+    assert max(detector.batch_sizes) <= 8
+
+
+def test_single_video_batches_without_waiting_for_deadline(tmp_path):
+    path = tmp_path / "video.avi"
+    _write_video(path, 40)
+
+    report = process_videos_offline([path], detector=StubDetector(latency=0.0),
+                                    output_path=tmp_path / "report.json", max_batch_size=8, frames_in_flight=8)
+
+    # 结果按帧顺序返回
+    values = [frame[0]['value'] for frame in report['videos'][0]['detections']]
+    assert values == sorted(values)
+    assert report['scheduler']['avg_batch_size'] > 1
@@ -0,0 +1,58 @@
+# tests/test_ocr_preprocessing.py
+import cv2
+import numpy as np
+from src.ocr.ocr import OCR
+from src.ocr.ocr_cache import OCRResultCache
+from src.ocr.ocr_config import OCRConfig
+from src.ocr.preprocessing import PreprocessPipeline, benchmark_presets
+from src.utils.logger import setup_logger
+
+
+class StubEngine:
+    """记录调用次数的 PaddleOCR 替身"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def ocr(self, image, cls=False):
+        self.calls += 1
+        return [[[None, (f"TEXT{image.ndim}", 0.9)]]]
+
+
+def _make_ocr():
+    ocr = OCR.__new__(OCR)
+    ocr.logger = setup_logger('test_ocr')
+    ocr.preprocessor = PreprocessPipeline.from_preset('speed')
+    ocr.cache = OCRResultCache()
+    ocr.ocr_engine = StubEngine()
+    return ocr
+
+
+def test_benchmark_runs_every_preset_pipeline(tmp_path, monkeypatch):
+    crops_dir = tmp_path / "crops"
+    crops_dir.mkdir()
+    rng = np.random.default_rng(0)
+    for index in range(3):
+        cv2.imwrite(str(crops_dir / f"crop{index}.png"), rng.integers(0, 255, (60, 120, 3), dtype=np.uint8))
+
+    called = []
+    original_call = PreprocessPipeline.__call__
+
+    def recording_call(self, image):
+        called.append(tuple(self.stages))
+        return original_call(self, image)
+
+    monkeypatch.setattr(PreprocessPipeline, '__call__', recording_call)
+    ocr = _make_ocr()
+    cache = ocr.cache
+    presets = list(OCRConfig.PREPROCESS_PRESETS)
+
+    report = benchmark_presets(crops_dir, presets=presets, ocr=ocr, output_path=tmp_path / "report.json")
+
+    assert ocr.ocr_engine.calls == 3 * len(presets)
+    for preset in presets:
+        assert called.count(tuple(OCRConfig.PREPROCESS_PRESETS[preset])) == 3
+        assert report['presets'][preset]['preprocess_ms']['total'] > 0
+    # 对比结束后恢复缓存，且对比期间没有写入缓存
+    assert ocr.cache is cache
+    assert cache.get_stats()['entries'] == 0